@@ -1,3 +1,27 @@
 from django.contrib import admin
 
+from .models import Genre, Job, Question
+
 # Register your models here.
+
+
+@admin.register(Genre)
+class GenreAdmin(admin.ModelAdmin):
+    list_display = ('genre_id', 'genre_name', 'question_count')
+    search_fields = ('genre_name',)
+
+
+# 저장 시 Question.clean() 으로 정답이 보기 중 하나인지 검증하고 correct_option 을 계산
+@admin.register(Question)
+class QuestionAdmin(admin.ModelAdmin):
+    list_display = ('question_id', 'genre', 'question_text', 'answer', 'correct_option', 'rating')
+    list_filter = ('genre',)
+    search_fields = ('question_text',)
+    readonly_fields = ('correct_option', 'rating', 'rating_attempts')
+
+
+# 재시도를 모두 실패한 작업 확인용 (다시 실행하려면 status 를 queued 로, attempts 를 0 으로)
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'status', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'created_at')
+    list_filter = ('status', 'name')
@@ -0,0 +1,63 @@
+from array import array
+from collections import namedtuple
+
+from .models import Question
+from .versioning import QUESTION_BANK, VersionedIndex
+
+OPTION_KEYS = ('1', '2', '3', '4')
+
+# 인덱스 값: 0 = 없는 문제, 1~4 = 정답 보기 번호, NO_MATCH = 정답이 어느 보기와도 일치하지 않음
+MISSING = 0
+NO_MATCH = 5
+
+# selected: 선택한 보기 번호 (1~4, 미선택이면 None)
+GradedAnswer = namedtuple('GradedAnswer', ['question_id', 'selected', 'is_correct'])
+
+
+# 문제 ID → 정답 보기 번호 인덱스 (question_id 를 위치로 쓰는 1바이트 배열)
+class AnswerKeyIndex(VersionedIndex):
+    version_key = QUESTION_BANK
+
+    def load(self):
+        rows = list(Question.objects.order_by('question_id').values_list('question_id', 'correct_option'))
+        keys = array('B', bytes(rows[-1][0] + 1 if rows else 1))
+        for question_id, correct_option in rows:
+            keys[question_id] = correct_option or NO_MATCH
+        return keys
+
+    def correct_option(self, question_id):
+        keys = self.get()
+        if 0 < question_id < len(keys):
+            return keys[question_id]
+        return MISSING
+
+
+answer_key = AnswerKeyIndex()
+
+
+# 제출된 답안 채점 (DB 조회 없이 인메모리 인덱스로 정수 비교)
+# 인덱스에 없는 문제가 나오면 방금 추가된 문제일 수 있으므로 (다른 프로세스의 변경은
+# 최대 DATA_VERSION_CHECK_SECONDS 늦게 반영됨) 버전을 한 번만 다시 확인하고, 그래도 없으면 건너뜀
+def grade_answers(quiz_results):
+    keys = answer_key.get()
+    refreshed = False
+    graded = []
+    for item in quiz_results:
+        try:
+            question_id = int(item.get('question_id'))
+        except (TypeError, ValueError):
+            continue
+
+        correct = keys[question_id] if 0 < question_id < len(keys) else MISSING
+        if correct == MISSING and not refreshed:
+            keys = answer_key.refresh()
+            refreshed = True
+            correct = keys[question_id] if 0 < question_id < len(keys) else MISSING
+        if correct == MISSING:
+            continue
+
+        selected = str(item.get('user_answer'))
+        selected = int(selected) if selected in OPTION_KEYS else None
+
+        graded.append(GradedAnswer(question_id, selected, selected == correct))
+    return graded
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class MyappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'myapp'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .instrumentation import install_serializer_timing
+
+        install_serializer_timing()
@@ -0,0 +1,231 @@
+"""
+ASGI(uvicorn) 배포용 async 조회 API
+
+settings.ASYNC_READ_VIEWS 가 켜져 있으면 urls.py 에서 아래 뷰가 같은 URL/이름의 sync DRF 뷰를 대신한다.
+(덱, 데일리 상식, 랜덤 해설, 랭킹, 최근 퀴즈 결과)
+DRF 는 async 뷰를 지원하지 않으므로 Django async 뷰 + async ORM 으로 구현하고,
+응답 JSON 과 인증(simplejwt Bearer 토큰) 동작은 sync 뷰와 같게 맞춘다.
+"""
+import functools
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import F
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .conditional import conditional_view, daily_facts_state, daily_random, ranking_state
+from .fast_serializers import aserialize_question_ids, aserialize_quiz_sessions, serialize_ranking_rows
+from .genres import genre_registry
+from .interests import ainterest_genre_ids
+from .models import CustomUser, Question, QuizSession
+from .rankings import RANKING_SCORE_FIELDS, ahead_of
+from .routers import replica_reads
+from .seen import asample_deck
+
+_jwt = JWTAuthentication()
+
+
+# DRF JSONRenderer 와 같은 형식 (한글 그대로, 공백 없음)
+def _json(data, status=200):
+    return JsonResponse(data, safe=False, status=status, json_dumps_params={'ensure_ascii': False, 'separators': (',', ':')})
+
+
+# DRF 예외 처리기와 같은 형식의 오류 응답
+def _error(exc):
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    response = _json(data, status=exc.status_code)
+    if exc.status_code == 401:
+        response['WWW-Authenticate'] = _jwt.authenticate_header(None)
+    return response
+
+
+# JWTAuthentication.authenticate 의 async 버전 (토큰 검증은 CPU 작업, 사용자 조회만 async ORM)
+async def aauthenticate(request):
+    header = _jwt.get_header(request)
+    if header is None:
+        return None
+    raw_token = _jwt.get_raw_token(header)
+    if raw_token is None:
+        return None
+
+    validated_token = _jwt.get_validated_token(raw_token)
+    try:
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise InvalidToken('Token contained no recognizable user identification')
+
+    user = await get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).afirst()
+    if user is None:
+        raise AuthenticationFailed('User not found', code='user_not_found')
+    if not user.is_active:
+        raise AuthenticationFailed('User is inactive', code='user_inactive')
+    return user
+
+
+# required=True 는 IsAuthenticated, False 는 토큰이 있을 때만 검증 (DRF 기본 인증과 동일)
+def jwt_authentication(required=True):
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                user = await aauthenticate(request)
+                if user is None and required:
+                    raise NotAuthenticated()
+            except APIException as exc:
+                return _error(exc)
+            # DRF 와 마찬가지로 토큰이 없으면 익명 사용자 (세션 인증은 쓰지 않음)
+            request.user = user if user is not None else AnonymousUser()
+            return await view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def _question_deck(request, size):
+    genre_id = request.GET.get('genre_id')
+    if not genre_id:
+        return None
+    return await aserialize_question_ids(await asample_deck(request.user, genre_id, size))
+
+
+# 25문제
+@require_GET
+@jwt_authentication(required=False)
+@replica_reads
+async def genre_25_questions(request):
+    deck = await _question_deck(request, 25)
+    if deck is None:
+        return _json({"error": "genre_id is required"}, status=400)
+    return _json(deck)
+
+
+# 50문제
+@require_GET
+@jwt_authentication(required=False)
+@replica_reads
+async def genre_50_questions(request):
+    deck = await _question_deck(request, 50)
+    if deck is None:
+        return _json({"error": "genre_id is required"}, status=400)
+    return _json(deck)
+
+
+# 스피드퀴즈
+@require_GET
+@jwt_authentication(required=False)
+@replica_reads
+async def speed_quiz(request):
+    deck = await _question_deck(request, 100)
+    if deck is None:
+        return _json({"error": "genre_id is required"}, status=400)
+    return _json({
+        "time_options": [60, 180],  # 1분, 3분
+        "questions": deck,
+    })
+
+
+# 데일리 상식 (장르마다 문제를 전부 읽지 않고 개수 → 오프셋 하나만 조회)
+@require_GET
+@replica_reads
+@conditional_view(daily_facts_state)
+async def daily_facts(request):
+    user = await CustomUser.objects.filter(email=request.GET.get('email')).afirst()
+    if user is None:
+        return JsonResponse({'error': 'User not found'}, status=404)
+
+    valid_genres = await ainterest_genre_ids(user)
+    if not valid_genres:
+        return JsonResponse({'daily_facts': []}, status=200)
+
+    rng = daily_random(user.id)
+    selected_genres = rng.sample(valid_genres, min(3, len(valid_genres)))
+    genre_names = (await genre_registry.aget()).names
+
+    facts = []
+    for genre_id in selected_genres:
+        if genre_id not in genre_names:
+            continue
+        questions = Question.objects.filter(genre_id=genre_id).order_by('question_id').values_list('explanation', flat=True)
+        count = await questions.acount()
+        if count:
+            offset = rng.randrange(count)
+            explanation = [e async for e in questions[offset:offset + 1]][0]
+            facts.append({'genre_name': genre_names[genre_id], 'explanation': explanation})
+
+    # ✅ 하루 동안 같은 상식 제공 (다음 날 새로운 상식, ETag 로 재전송 생략)
+    return JsonResponse({'daily_facts': facts}, safe=False, status=200)
+
+
+# ✅ JWT 기반 해설 제공
+@require_GET
+@jwt_authentication()
+@replica_reads
+async def random_explanations(request):
+    genre_ids = await ainterest_genre_ids(request.user)
+    question_ids = [
+        qid async for qid in Question.objects.filter(genre_id__in=genre_ids).values_list('question_id', flat=True)
+    ]
+    picked = random.sample(question_ids, min(3, len(question_ids)))
+    explanations = {
+        qid: explanation
+        async for qid, explanation in Question.objects.filter(question_id__in=picked).values_list('question_id', 'explanation')
+    }
+    return _json({"explanations": [explanations[qid] for qid in picked]})
+
+
+# 최근 퀴즈 결과
+@require_GET
+@jwt_authentication()
+@replica_reads
+async def quiz_sessions(request):
+    sessions = (
+        QuizSession.objects
+        .filter(user=request.user, genre__isnull=False, quiz_type__isnull=False)
+        # ── 오답노트에서 wrong_count=0인 세션만 제거
+        .exclude(quiz_type='wrong_note', wrong_count=0)
+        .order_by('-created_at')[:20]
+    )
+    return _json(await aserialize_quiz_sessions(sessions))
+
+
+# 랭킹
+@require_GET
+@jwt_authentication()
+@replica_reads
+@conditional_view(ranking_state)
+async def ranking(request):
+    mode = request.GET.get('mode', 'speed_1min')  # 기본값은 1분
+    score_field = RANKING_SCORE_FIELDS.get(mode)
+    if score_field is None:
+        return _json({'error': '유효하지 않은 mode입니다. (speed_1min, speed_3min, solve, total 중 선택)'}, status=400)
+
+    user = request.user
+    rows = [
+        row async for row in CustomUser.objects
+        .order_by(F(score_field).desc(nulls_last=True), '-id')
+        .values_list('id', 'username', 'profile_image', score_field)[:100]
+    ]
+    top_rankings = serialize_ranking_rows(rows)
+
+    my_ranking = {}
+    for (user_id, *_), entry in zip(rows, top_rankings):
+        if user_id == user.id:
+            my_ranking = entry
+
+    # 100위 밖 유저
+    if not my_ranking:
+        my_score = getattr(user, score_field)
+        higher_count = await CustomUser.objects.filter(ahead_of(score_field, 'id', my_score, user.id)).acount()
+        my_ranking = {
+            'rank': higher_count + 1,
+            'nickname': user.username,
+            'profile_image': user.profile_image.url if user.profile_image else None,
+            'score': my_score,
+        }
+
+    return _json({'top_rankings': top_rankings, 'my_ranking': my_ranking})
@@ -0,0 +1,138 @@
+"""
+조회 API 의 조건부 GET (ETag / Last-Modified → 304 Not Modified)
+
+응답 본문을 만들어서 해시하지 않고, 데이터가 바뀔 때 올리는 DataVersion 버전 키로 ETag 를 만든다.
+  - 프로필: user_profile:<id>        (CustomUser 저장 시, signals.py)
+  - 문제 상세: question_bank + user_results:<id> (문제 변경 / 퀴즈 제출 시)
+  - 랭킹: ranking                   (점수 갱신 작업, 프로필 변경 시)
+  - 데일리 상식: question_bank + user_profile:<id> + 날짜
+  - 장르 목록: genres              (장르 / 장르별 문제 수 변경 시, genres.py)
+  - 기간별 리더보드: leaderboard    (점수 누적 작업, 기간 마감 시, leaderboards.py)
+If-None-Match 가 맞으면 버전 조회 쿼리 한 번으로 304 를 돌려주고 뷰(직렬화)는 실행하지 않는다.
+버전 키를 올리는 곳을 빠뜨리면 예전 응답이 계속 재사용되므로, 응답에 영향을 주는 쓰기를 추가할 때는 키도 함께 올릴 것.
+"""
+import functools
+import random
+from datetime import datetime, time
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .models import CustomUser
+from .versioning import GENRES, LEADERBOARD, QUESTION_BANK, RANKING, get_versions, user_profile_key, user_results_key
+
+
+# 버전 키들로 (ETag, Last-Modified) 계산
+def version_state(name, keys, *extra, modified_since=None):
+    versions = get_versions(keys)
+    etag = quote_etag('-'.join([name, *(str(version) for version, _ in versions), *(str(e) for e in extra)]))
+    timestamps = [updated_at for _, updated_at in versions if updated_at] + ([modified_since] if modified_since else [])
+    last_modified = max(timestamps) if timestamps else None
+    return etag, last_modified
+
+
+def _not_modified(request, state):
+    if state is None:
+        return None
+    etag, last_modified = state
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+
+
+# 성공 응답에만 검증자를 붙임 (사용자별 응답이라 공유 캐시에는 저장하지 않고, 매번 재검증)
+def _add_validators(response, state):
+    if state is None or response.status_code != 200:
+        return response
+    etag, last_modified = state
+    response.headers.setdefault('ETag', etag)
+    if last_modified and not response.has_header('Last-Modified'):
+        response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+# 조건부 GET 데코레이터
+# state_func(request, *args, **kwargs) → (etag, last_modified) 또는 None(검증 안 함)
+# 함수 뷰: @conditional_view(state_func), 클래스 뷰: @method_decorator(conditional_view(state_func), name='get')
+# async 뷰에서는 state_func 를 스레드에서 실행 (@replica_reads 안쪽에 두면 본문과 같은 DB 에서 버전을 읽음)
+def conditional_view(state_func):
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @functools.wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                state = await sync_to_async(state_func)(request, *args, **kwargs)
+                not_modified = _not_modified(request, state)
+                if not_modified is not None:
+                    return not_modified
+                return _add_validators(await view_func(request, *args, **kwargs), state)
+            return async_wrapper
+
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            state = state_func(request, *args, **kwargs)
+            not_modified = _not_modified(request, state)
+            if not_modified is not None:
+                return not_modified
+            return _add_validators(view_func(request, *args, **kwargs), state)
+        return wrapper
+    return decorator
+
+
+def profile_state(request):
+    return version_state('profile', [user_profile_key(request.user.id)])
+
+
+def question_detail_state(request, question_id):
+    return version_state('question', [QUESTION_BANK, user_results_key(request.user.id)], question_id)
+
+
+def genre_catalog_state(request):
+    return version_state('genres', [GENRES])
+
+
+def ranking_state(request):
+    mode = request.GET.get('mode', 'speed_1min')
+    return version_state('ranking', [RANKING], mode, request.user.id)
+
+
+def around_me_state(request):
+    return version_state(
+        'around-me', [RANKING, LEADERBOARD],
+        request.GET.get('mode', 'speed_1min'), request.GET.get('size', ''), request.user.id, _midnight().date().isoformat(),
+    )
+
+
+def leaderboard_state(request):
+    return version_state(
+        'leaderboard', [LEADERBOARD, RANKING],
+        request.GET.get('period', 'weekly'), request.GET.get('date', ''), request.user.id, _midnight().date().isoformat(),
+    )
+
+
+# 오늘 0시 (USE_TZ=False 이면 서버 시간 기준)
+def _midnight():
+    now = timezone.now()
+    if timezone.is_aware(now):
+        return timezone.make_aware(datetime.combine(timezone.localdate(now), time.min))
+    return datetime.combine(now.date(), time.min)
+
+
+# 데일리 상식은 사용자/날짜별로 고정 → 날짜가 바뀌면 ETag 도 바뀜
+def daily_facts_state(request):
+    user_id = CustomUser.objects.filter(email=request.GET.get('email')).values_list('id', flat=True).first()
+    if user_id is None:
+        return None
+    midnight = _midnight()
+    today = midnight.date()
+    return version_state('daily', [QUESTION_BANK, user_profile_key(user_id)], user_id, today.isoformat(), modified_since=midnight)
+
+
+# 데일리 상식 선택용 난수 (같은 사용자는 하루 동안 같은 상식을 받음)
+def daily_random(user_id):
+    return random.Random(f'{user_id}:{_midnight().date().isoformat()}')
@@ -0,0 +1,8 @@
+# MySQL + 프로세스 내 커넥션 풀 (myapp/db_pool.py)
+from django.db.backends.mysql import base
+
+from myapp.db_pool import PooledConnectionMixin
+
+
+class DatabaseWrapper(PooledConnectionMixin, base.DatabaseWrapper):
+    pass
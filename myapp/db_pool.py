@@ -0,0 +1,180 @@
+"""
+프로세스 내 DB 커넥션 풀
+
+Django 는 스레드(또는 async 컨텍스트)마다 커넥션을 따로 들고 있으므로
+스레드 워커(gthread)나 ASGI 워커에서 CONN_MAX_AGE 만으로는 커넥션 수를 제한할 수 없고,
+ASGI 에서는 요청마다 새 커넥션(RDS 라면 TLS 핸드셰이크 포함)을 열게 된다.
+풀을 쓰면 요청이 끝날 때 커넥션을 닫지 않고 풀에 돌려주고, 다음 요청이 재사용한다.
+
+사용: settings.DB_POOL_SIZE 를 지정하면 MySQL default/replica 가
+myapp.db_backends.mysql_pool 엔진으로 바뀐다. (DATABASES[alias]['POOL'] 참고)
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from django.db import OperationalError
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from .metrics import db_connections_opened_total, db_pool_connections, db_pool_timeouts_total, db_pool_wait_seconds
+
+DEFAULT_POOL_OPTIONS = {
+    'size': 10,       # 프로세스당 최대 커넥션 수
+    'timeout': 10,    # 커넥션을 기다리는 최대 시간 (초), 넘으면 OperationalError
+    'recycle': 3600,  # 커넥션 최대 수명 (초), MySQL wait_timeout 보다 짧게
+    'ping_after': 5,  # 이 시간(초) 이상 놀던 커넥션은 꺼낼 때 ping 으로 상태 확인
+}
+
+
+class ConnectionPool:
+    def __init__(self, alias, size, timeout, recycle, ping_after):
+        self.alias = alias
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+        self.pid = os.getpid()
+        self._idle = deque()  # (커넥션, 생성 시각, 반납 시각)
+        self._born = {}       # id(커넥션) → 생성 시각 (사용 중인 커넥션 포함)
+        self._connecting = 0  # 연결 중인 커넥션 수
+        self._initialized = set()  # 세션 초기화가 끝난 커넥션 id
+        self._cond = threading.Condition()
+
+    @property
+    def total(self):
+        return len(self._born) + self._connecting
+
+    def _report(self):
+        idle = len(self._idle)
+        db_pool_connections.set(idle, alias=self.alias, state='idle')
+        db_pool_connections.set(self.total - idle, alias=self.alias, state='in_use')
+
+    def _discard(self, conn):
+        self._born.pop(id(conn), None)
+        self._initialized.discard(id(conn))
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _take_idle(self):
+        while self._idle:
+            conn, born, returned = self._idle.pop()
+            now = time.monotonic()
+            if now - born > self.recycle or (now - returned > self.ping_after and not _ping(conn)):
+                self._discard(conn)
+                continue
+            return conn
+        return None
+
+    def acquire(self, connect):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        with self._cond:
+            while True:
+                conn = self._take_idle()
+                if conn is not None:
+                    db_pool_wait_seconds.observe(time.monotonic() - started, alias=self.alias)
+                    self._report()
+                    return conn
+                if self.total < self.size:
+                    self._connecting += 1  # 새 커넥션은 락 밖에서 연결 (자리만 예약)
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    db_pool_timeouts_total.inc(alias=self.alias)
+                    raise OperationalError(
+                        f"DB 커넥션 풀({self.alias})에서 {self.timeout}초 안에 커넥션을 얻지 못했습니다. (size={self.size})"
+                    )
+                self._cond.wait(remaining)
+
+        try:
+            conn = connect()
+        except Exception:
+            with self._cond:
+                self._connecting -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._connecting -= 1
+            self._born[id(conn)] = time.monotonic()
+            db_connections_opened_total.inc(alias=self.alias)
+            db_pool_wait_seconds.observe(time.monotonic() - started, alias=self.alias)
+            self._report()
+        return conn
+
+    def release(self, conn, discard=False):
+        with self._cond:
+            born = self._born.get(id(conn))
+            if discard or born is None:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, born, time.monotonic()))
+            self._report()
+            self._cond.notify()
+
+    def is_initialized(self, conn):
+        return id(conn) in self._initialized
+
+    def mark_initialized(self, conn):
+        self._initialized.add(id(conn))
+
+    def close_all(self):
+        with self._cond:
+            while self._idle:
+                self._discard(self._idle.pop()[0])
+            self._report()
+
+
+def _ping(conn):
+    try:
+        conn.ping()
+    except Exception:
+        return False
+    return True
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+# alias 별 풀 (fork 된 워커에서는 부모의 커넥션을 물려받지 않도록 새로 생성)
+def get_pool(alias, settings_dict):
+    pool = _pools.get(alias)
+    if pool is None or pool.pid != os.getpid():
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None or pool.pid != os.getpid():
+                options = {**DEFAULT_POOL_OPTIONS, **settings_dict.get('POOL', {})}
+                pool = _pools[alias] = ConnectionPool(alias, **options)
+    return pool
+
+
+# DatabaseWrapper 에 섞어 쓰는 풀 동작
+# - 연결: 풀에서 꺼냄 / 닫기: 풀에 반납 (트랜잭션 중이거나 오류가 난 커넥션은 버림)
+# - 세션 초기화(SET ...)는 커넥션을 처음 만들 때 한 번만
+class PooledConnectionMixin:
+    def get_new_connection(self, conn_params):
+        pool = get_pool(self.alias, self.settings_dict)
+        return pool.acquire(lambda: super(PooledConnectionMixin, self).get_new_connection(conn_params))
+
+    def init_connection_state(self):
+        pool = get_pool(self.alias, self.settings_dict)
+        if pool.is_initialized(self.connection):
+            BaseDatabaseWrapper.init_connection_state(self)
+            return
+        super().init_connection_state()
+        pool.mark_initialized(self.connection)
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool = get_pool(self.alias, self.settings_dict)
+        discard = self.in_atomic_block or self.errors_occurred
+        if not discard and not self.get_autocommit():
+            try:
+                self.connection.rollback()
+            except Exception:
+                discard = True
+        pool.release(self.connection, discard=discard)
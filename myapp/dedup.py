@@ -0,0 +1,224 @@
+"""
+유사(중복) 문제 탐지 — MinHash + LSH
+
+여러 출처에서 합친 문제은행에는 띄어쓰기/문장부호/조사 정도만 다른 문제가 섞인다.
+모든 쌍을 비교하면 O(n²) 이라 수십만 문제에서는 쓸 수 없으므로
+  1) 문제 텍스트(+정답)를 정규화해서 글자 3-gram 집합으로 만들고 (한국어는 형태소 분석 없이 글자 단위가 잘 맞음)
+  2) one-permutation MinHash 로 NUM_PERM 칸짜리 서명을 만든 뒤 (3-gram 마다 해시 한 번)
+  3) 서명을 BANDS 개 밴드로 나눠 밴드 값이 같은 문제끼리만 후보로 비교 (LSH, 밴드마다 정렬 한 번)
+  4) 후보 쌍은 서명의 일치 비율(자카드 유사도 추정치)이 threshold 이상이면 중복으로 판정
+밴드 하나에 같은 값이 MAX_BUCKET_PAIRS 개보다 많이 몰리면 정렬 순서상 가까운 것끼리만 비교해서
+최악의 경우에도 O(n · MAX_BUCKET_PAIRS) 를 넘지 않는다.
+
+사용처: import_questions (새 문제와 기존/같은 파일 문제 비교), audit_duplicates (문제은행 전체 점검/병합)
+"""
+import zlib
+from array import array
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Question, QuestionStat, QuizResult, ReviewState, WrongAnswer, normalize_answer
+from .seen import invalidate_seen_bitmaps
+
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+MAX_BUCKET_PAIRS = 50
+DEFAULT_THRESHOLD = 0.8
+
+EMPTY = 0xFFFFFFFF
+_BIN_BITS = NUM_PERM.bit_length() - 1
+
+
+# 소문자 + 글자/숫자만 남김 (공백, 문장부호 차이 무시)
+def normalize_text(text):
+    return ''.join(ch for ch in str(text).lower() if ch.isalnum())
+
+
+# 중복 판정에 쓰는 텍스트 (문제가 같아도 정답이 다르면 다른 문제)
+def fingerprint_text(question_text, answer):
+    return f'{normalize_text(question_text)}#{normalize_text(answer)}'
+
+
+# one-permutation MinHash 서명 (3-gram 해시의 하위 비트로 칸을 고르고, 칸마다 최솟값)
+# 빈 칸은 오른쪽 첫 번째 칸의 값을 거리만큼 섞어서 채움 (rotation densification)
+def minhash(text):
+    if len(text) < SHINGLE_SIZE:
+        shingles = {text} if text else set()
+    else:
+        shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+    signature = array('I', [EMPTY]) * NUM_PERM
+    for shingle in shingles:
+        value = zlib.crc32(shingle.encode())
+        slot, value = value & (NUM_PERM - 1), value >> _BIN_BITS
+        if value < signature[slot]:
+            signature[slot] = value
+
+    if not shingles:
+        return signature
+    for slot in range(NUM_PERM):
+        if signature[slot] == EMPTY:
+            distance = 1
+            while signature[(slot + distance) % NUM_PERM] == EMPTY:
+                distance += 1
+            signature[slot] = (signature[(slot + distance) % NUM_PERM] + distance * 0x9E3779B1) & 0x7FFFFFFF
+    return signature
+
+
+# 서명 모음 (문제마다 NUM_PERM 칸을 한 배열에 이어 붙여 저장 → 30만 문제 ≈ 77MB)
+class SignatureTable:
+    def __init__(self):
+        self.keys = []
+        self._signatures = array('I')
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key, text):
+        self.keys.append(key)
+        self._signatures.extend(minhash(text))
+
+    def signature(self, index):
+        return self._signatures[index * NUM_PERM:(index + 1) * NUM_PERM]
+
+    # 자카드 유사도 추정치 (서명 칸 일치 비율)
+    def similarity(self, i, j):
+        a, b = self.signature(i), self.signature(j)
+        return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+    def band_hashes(self, band):
+        start = band * ROWS
+        sigs = self._signatures
+        return [
+            hash(sigs[offset + start:offset + start + ROWS].tobytes())
+            for offset in range(0, len(sigs), NUM_PERM)
+        ]
+
+
+# 유사도가 threshold 이상인 (i, j, 유사도) 쌍 (i < j, 인덱스는 table 에 넣은 순서)
+def find_duplicates(table, threshold=DEFAULT_THRESHOLD):
+    checked = set()
+    pairs = []
+    for band in range(BANDS):
+        entries = sorted((value, index) for index, value in enumerate(table.band_hashes(band)))
+        run_start = 0
+        for position in range(1, len(entries) + 1):
+            if position < len(entries) and entries[position][0] == entries[run_start][0]:
+                continue
+            run = [index for _, index in entries[run_start:position]]
+            for a in range(len(run)):
+                for b in range(a + 1, min(len(run), a + 1 + MAX_BUCKET_PAIRS)):
+                    pair = (run[a], run[b])
+                    if pair in checked:
+                        continue
+                    checked.add(pair)
+                    score = table.similarity(*pair)
+                    if score >= threshold:
+                        pairs.append((pair[0], pair[1], score))
+            run_start = position
+    return pairs
+
+
+# 중복 쌍을 묶음으로 (union-find), 각 묶음은 인덱스 오름차순
+def group_duplicates(size, pairs):
+    parent = list(range(size))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j, _ in pairs:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups = {}
+    for i, j, _ in pairs:
+        for index in (i, j):
+            groups.setdefault(find(index), set()).add(index)
+    return [sorted(members) for _, members in sorted(groups.items())]
+
+
+# 문제은행 서명 적재 (question_id 순)
+def load_question_signatures(table, queryset=None, chunk_size=2000):
+    queryset = Question.objects.all() if queryset is None else queryset
+    rows = queryset.order_by('question_id').values_list('question_id', 'question_text', 'answer')
+    for question_id, question_text, answer in rows.iterator(chunk_size=chunk_size):
+        table.add(question_id, fingerprint_text(question_text, answer))
+    return table
+
+
+# (user, question) 유니크 테이블의 행을 keep_id 로 옮김 (사용자별로 order_by 첫 번째 것 하나만 남김)
+def _move_user_rows(model, keep_id, duplicate_ids, order_by):
+    owners = set(model.objects.filter(question_id=keep_id).values_list('user_id', flat=True))
+    move_ids, drop_ids = [], []
+    for row_id, user_id in model.objects.filter(question_id__in=duplicate_ids).order_by(order_by).values_list('id', 'user_id'):
+        if user_id in owners:
+            drop_ids.append(row_id)
+        else:
+            owners.add(user_id)
+            move_ids.append(row_id)
+    model.objects.filter(id__in=drop_ids).delete()
+    model.objects.filter(id__in=move_ids).update(question_id=keep_id)
+
+
+# 풀이 기록을 keep_id 로 옮김
+# 기록은 선택한 보기 번호만 저장하므로 (보기 순서가 다를 수 있음) 텍스트가 같은 keep_id 의 보기 번호로 바꾸고,
+# 같은 보기가 없으면 선택한 텍스트를 user_answer 에 남김
+def _move_quiz_results(keep_id, duplicate_ids):
+    options = {
+        question_id: (option1, option2, option3, option4)
+        for question_id, option1, option2, option3, option4 in Question.objects
+        .filter(question_id__in=[keep_id, *duplicate_ids])
+        .values_list('question_id', 'option1', 'option2', 'option3', 'option4')
+    }
+    keep_options = {normalize_text(option): number for number, option in enumerate(options.get(keep_id, ()), start=1)}
+
+    for duplicate_id in duplicate_ids:
+        results = QuizResult.objects.filter(question_id=duplicate_id)
+        for number, option in enumerate(options.get(duplicate_id, ()), start=1):
+            mapped = keep_options.get(normalize_text(option))
+            if mapped == number:
+                continue  # 번호가 같으면 아래에서 한 번에 옮김
+            if mapped is None:
+                results.filter(user_option=number).update(question_id=keep_id, user_option=None, user_answer=normalize_answer(option))
+            else:
+                results.filter(user_option=number).update(question_id=keep_id, user_option=mapped)
+        results.update(question_id=keep_id)
+
+
+# 중복 문제를 keep_id 하나로 합침 (풀이 기록/오답 노트/복습 일정/통계를 옮긴 뒤 삭제)
+# 문제 레이팅은 keep_id 의 값을 그대로 씀
+# 푼 문제 비트맵은 옮길 수 없으므로 (삭제로 장르 안 순번이 밀림) 중복 문제 장르의 비트맵 세대를 올려서 무효화
+def merge_duplicate_questions(keep_id, duplicate_ids):
+    duplicate_ids = [question_id for question_id in duplicate_ids if question_id != keep_id]
+    if not duplicate_ids:
+        return 0
+
+    with transaction.atomic():
+        _move_quiz_results(keep_id, duplicate_ids)
+
+        # 오답 노트는 가장 최근에 틀린 것, 복습 일정은 가장 최근에 복습한 것
+        _move_user_rows(WrongAnswer, keep_id, duplicate_ids, '-updated_at')
+        _move_user_rows(ReviewState, keep_id, duplicate_ids, '-last_reviewed_at')
+
+        # 문제 통계 합산
+        totals = QuestionStat.objects.filter(question_id__in=duplicate_ids).values_list('total_attempts', 'correct_attempts')
+        total = sum(t for t, _ in totals)
+        correct = sum(c for _, c in totals)
+        if total:
+            QuestionStat.objects.get_or_create(question_id=keep_id)
+            QuestionStat.objects.filter(question_id=keep_id).update(
+                total_attempts=F('total_attempts') + total,
+                correct_attempts=F('correct_attempts') + correct,
+            )
+
+        invalidate_seen_bitmaps(set(Question.objects.filter(question_id__in=duplicate_ids).values_list('genre_id', flat=True)))
+
+        # 삭제 시그널이 문제은행 버전/장르별 문제 수를 갱신
+        return Question.objects.filter(question_id__in=duplicate_ids).delete()[1].get(Question._meta.label, 0)
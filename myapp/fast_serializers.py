@@ -0,0 +1,159 @@
+"""
+조회가 많은 API 전용 경량 직렬화 함수
+
+DRF ModelSerializer 와 똑같은 JSON 을 만들지만, 객체마다 필드 인스턴스를 거치지 않고
+values() 로 필요한 컬럼만 읽어 dict 를 바로 만든다.
+출력이 기존 serializer 와 동일한지는 tests.py 의 parity 테스트로 확인한다.
+"""
+from .genres import genre_registry
+from .models import CustomUser, Question, QuizResult, normalize_answer
+
+QUESTION_DECK_FIELDS = (
+    'question_id', 'question_text', 'option1', 'option2', 'option3', 'option4',
+    'answer', 'explanation', 'genre_id',
+)
+
+QUIZ_RESULT_FIELDS = (
+    'session_id', 'question_id', 'user_option', 'user_answer', 'correct_answer', 'is_correct',
+    'score', 'submission_time', 'question__question_text', 'question__explanation',
+    'question__answer', 'question__option1', 'question__option2', 'question__option3',
+    'question__option4', 'question__genre_id',
+)
+
+QUIZ_SESSION_FIELDS = (
+    'id', 'created_at', 'genre_id', 'quiz_type', 'total_questions',
+    'correct_count', 'wrong_count', 'total_score',
+)
+
+
+# DRF DateTimeField 기본 출력 (ISO 8601)
+def _iso_datetime(value):
+    if not value:
+        return None
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+# genre_names: 장르 레지스트리의 장르 ID → 이름 (장르 테이블 조인 없음)
+def _serialize_deck_question(row, genre_names):
+    item = {
+        'question_id': row['question_id'],
+        'question_text': row['question_text'],
+        'option1': row['option1'],
+        'option2': row['option2'],
+        'option3': row['option3'],
+        'option4': row['option4'],
+        'answer': row['answer'],
+    }
+    # 장르가 없는 문제는 DRF 와 마찬가지로 genre_name 키를 생략
+    genre_name = genre_names.get(row['genre_id'])
+    if genre_name is not None:
+        item['genre_name'] = genre_name
+    item['accuracy'] = None
+    item['correct_answer'] = row['answer']
+    item['explanation'] = row['explanation']
+    return item
+
+
+# 문제 덱 직렬화 (QuestionSerializer 와 동일한 출력)
+def serialize_question_deck(queryset):
+    genre_names = genre_registry.get().names
+    return [_serialize_deck_question(row, genre_names) for row in queryset.values(*QUESTION_DECK_FIELDS)]
+
+
+# async 뷰용 (async_views.py)
+async def aserialize_question_deck(queryset):
+    genre_names = (await genre_registry.aget()).names
+    return [_serialize_deck_question(row, genre_names) async for row in queryset.values(*QUESTION_DECK_FIELDS)]
+
+
+# 문제 ID 순서대로 덱 직렬화 (무작위/관련도/난이도 순으로 고른 ID, 삭제된 문제는 빠짐)
+def serialize_question_ids(question_ids):
+    questions = {item['question_id']: item for item in serialize_question_deck(Question.objects.filter(question_id__in=question_ids))}
+    return [questions[question_id] for question_id in question_ids if question_id in questions]
+
+
+async def aserialize_question_ids(question_ids):
+    questions = {item['question_id']: item for item in await aserialize_question_deck(Question.objects.filter(question_id__in=question_ids))}
+    return [questions[question_id] for question_id in question_ids if question_id in questions]
+
+
+def _serialize_quiz_result(row, genre_names):
+    if row['user_option']:
+        user_answer = normalize_answer(row[f"question__option{row['user_option']}"])
+    else:
+        user_answer = row['user_answer']
+
+    item = {
+        'question': row['question_id'],
+        'question_text': row['question__question_text'],
+        'user_answer': user_answer,
+        'correct_answer': row['correct_answer'] or row['question__answer'],
+        'is_correct': row['is_correct'],
+        'score': row['score'],
+        'submission_time': _iso_datetime(row['submission_time']),
+        'explanation': row['question__explanation'],
+    }
+    genre_name = genre_names.get(row['question__genre_id'])
+    if genre_name is not None:
+        item['genre_name'] = genre_name
+    return item
+
+
+def _serialize_quiz_session(session, results, genre_names):
+    item = {
+        'id': session['id'],
+        'date': session['created_at'].strftime('%Y-%m-%d %H:%M') if session['created_at'] else None,
+    }
+    genre_name = genre_names.get(session['genre_id'])
+    if genre_name is not None:
+        item['genre'] = genre_name
+    item.update({
+        'quiz_type': session['quiz_type'],
+        'totalQuestions': session['total_questions'],
+        'correctAnswers': session['correct_count'],
+        'wrongAnswers': session['wrong_count'],
+        'totalScore': float(session['total_score']),
+        'quizResults': results,
+    })
+    return item
+
+
+# 퀴즈 세션 목록 직렬화 (QuizSessionSerializer 와 동일한 출력, 쿼리 2번)
+def serialize_quiz_sessions(queryset):
+    sessions = list(queryset.values(*QUIZ_SESSION_FIELDS))
+    genre_names = genre_registry.get().names
+
+    results = {session['id']: [] for session in sessions}
+    for row in QuizResult.objects.filter(session_id__in=list(results)).values(*QUIZ_RESULT_FIELDS):
+        results[row['session_id']].append(_serialize_quiz_result(row, genre_names))
+
+    return [_serialize_quiz_session(session, results[session['id']], genre_names) for session in sessions]
+
+
+# async 뷰용 (async_views.py)
+async def aserialize_quiz_sessions(queryset):
+    sessions = [session async for session in queryset.values(*QUIZ_SESSION_FIELDS)]
+    genre_names = (await genre_registry.aget()).names
+
+    results = {session['id']: [] for session in sessions}
+    async for row in QuizResult.objects.filter(session_id__in=list(results)).values(*QUIZ_RESULT_FIELDS):
+        results[row['session_id']].append(_serialize_quiz_result(row, genre_names))
+
+    return [_serialize_quiz_session(session, results[session['id']], genre_names) for session in sessions]
+
+
+# 랭킹 항목 직렬화 (ImageFieldFile 을 만들지 않고 저장소에서 바로 URL 생성)
+def serialize_ranking_rows(rows, start_rank=1):
+    storage = CustomUser._meta.get_field('profile_image').storage
+    return [
+        {
+            'rank': rank,
+            'nickname': username,
+            'profile_image': storage.url(profile_image) if profile_image else None,
+            'score': score,
+        }
+        for rank, (user_id, username, profile_image, score) in enumerate(rows, start=start_rank)
+    ]
@@ -0,0 +1,84 @@
+"""
+장르 레지스트리, 장르 목록 (genres/ API), 장르별 문제 수
+
+genre_registry 는 장르 ID ↔ 이름을 프로세스 메모리에 들고 있는 인덱스 (genres 버전 키가 바뀌면 다시 적재)
+뷰/직렬화에서 장르 이름이나 존재 여부가 필요하면 Genre 조회나 genre__genre_name 조인 대신 이것을 사용한다.
+
+Genre.question_count 는 문제 수를 미리 세어 둔 값
+  - admin 등에서 문제를 저장/삭제하면 signals.py 가 해당 장르만 다시 셈
+  - bulk_create 로 문제를 넣는 명령(import_questions, generate_dataset, loadtest)은 refresh_question_counts() 를 직접 호출
+장르 목록 응답은 genres 버전 키별로 캐시에 통째로 저장하고, 같은 버전 키로 ETag 를 만든다 (conditional.py).
+"""
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Genre, Question
+from .versioning import GENRES, VersionedIndex, bump_version, get_version
+
+# names: 장르 ID → 이름, ids: 이름 → 장르 ID
+GenreMaps = namedtuple('GenreMaps', ['names', 'ids'])
+
+
+def _genre_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class GenreRegistry(VersionedIndex):
+    version_key = GENRES
+
+    def load(self):
+        names = dict(Genre.objects.values_list('genre_id', 'genre_name'))
+        return GenreMaps(names, {name: genre_id for genre_id, name in names.items()})
+
+    # 장르 이름 (없는 장르면 None, 문자열 ID 도 허용)
+    def name(self, genre_id):
+        return self.get().names.get(_genre_id(genre_id))
+
+    # 장르 ID (없는 이름이면 None)
+    def id_for(self, name):
+        return self.get().ids.get(name)
+
+
+genre_registry = GenreRegistry()
+
+
+# 장르별 문제 수 다시 세기 (genre_ids 가 None 이면 전체)
+def refresh_question_counts(genre_ids=None):
+    counts = (
+        Question.objects
+        .filter(genre=OuterRef('pk'))
+        .order_by()
+        .values('genre')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    genres = Genre.objects.all()
+    if genre_ids is not None:
+        genres = genres.filter(genre_id__in=[genre_id for genre_id in genre_ids if genre_id is not None])
+    genres.update(question_count=Coalesce(Subquery(counts, output_field=IntegerField()), Value(0)))
+    bump_version(GENRES)
+
+
+def catalog_cache_key(version):
+    return f'genre_catalog:v{version}'
+
+
+# 장르 목록 (버전이 바뀌기 전까지는 캐시에서 그대로)
+def genre_catalog(version=None):
+    if version is None:
+        version = get_version(GENRES)
+    key = catalog_cache_key(version)
+    catalog = cache.get(key)
+    if catalog is None:
+        catalog = list(
+            Genre.objects.order_by('genre_id').values('genre_id', 'genre_name', 'question_count')
+        )
+        cache.set(key, catalog, getattr(settings, 'GENRE_CATALOG_CACHE_SECONDS', 86400))
+    return catalog
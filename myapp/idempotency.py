@@ -0,0 +1,115 @@
+"""
+제출 API 멱등성 (Idempotency-Key 헤더)
+
+클라이언트가 제출마다 고유한 키(UUID 등)를 Idempotency-Key 헤더로 보내면
+  - 처음 요청: 키를 processing 으로 기록하고 처리, 응답을 저장 (뷰의 쓰기와 같은 트랜잭션)
+  - 완료된 키로 재시도: 저장된 응답을 그대로 돌려줌 (Idempotent-Replayed: true)
+  - 처리 중인 키로 동시에 재시도: IDEMPOTENCY_WAIT_SECONDS 동안 완료를 기다렸다가 돌려주고,
+    그래도 안 끝나면 409 (Retry-After)
+  - 같은 키로 내용이 다른 요청: 422
+처리 중 예외가 나거나 5xx 응답이면 키를 지워서 다시 시도할 수 있게 한다.
+헤더가 없으면 기존과 똑같이 동작한다.
+"""
+import functools
+import hashlib
+import json
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+POLL_INTERVAL = 0.1
+
+
+def request_fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f'{request.method} {request.path}\n{body}'.encode()).hexdigest()
+
+
+def _replay(record):
+    response = Response(record.response_body, status=record.response_status)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+# 키를 새로 기록하면 None, 이미 있으면 그 키 (만료/방치된 키는 지우고 새로 기록)
+def _claim(user, key, request_hash):
+    now = timezone.now()
+    expired_before = now - timedelta(seconds=getattr(settings, 'IDEMPOTENCY_KEY_TTL', 86400))
+    abandoned_before = now - timedelta(seconds=getattr(settings, 'IDEMPOTENCY_LOCK_TIMEOUT', 60))
+
+    while True:
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.create(user=user, key=key, request_hash=request_hash)
+            return None
+        except IntegrityError:
+            record = IdempotencyKey.objects.filter(user=user, key=key).first()
+            if record is None:
+                continue  # 그 사이 지워짐 → 다시 기록
+            if record.created_at < expired_before or (
+                record.status == IdempotencyKey.PROCESSING and record.updated_at < abandoned_before
+            ):
+                IdempotencyKey.objects.filter(pk=record.pk, updated_at=record.updated_at).delete()
+                continue
+            return record
+
+
+# DRF 뷰의 post 메서드에 적용
+def idempotent(view_method):
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key or not request.user.is_authenticated:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > 255:
+            return Response({"message": f"{HEADER} 는 255자 이하여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        request_hash = request_fingerprint(request)
+        deadline = time.monotonic() + getattr(settings, 'IDEMPOTENCY_WAIT_SECONDS', 5)
+        while True:
+            record = _claim(request.user, key, request_hash)
+            if record is None:
+                break
+            if record.request_hash != request_hash:
+                return Response(
+                    {"message": f"같은 {HEADER} 로 다른 요청을 보낼 수 없습니다."},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            if record.status == IdempotencyKey.COMPLETED:
+                return _replay(record)
+            # 같은 요청이 처리 중 → 끝날 때까지 잠시 대기
+            if time.monotonic() >= deadline:
+                response = Response(
+                    {"message": "같은 요청을 처리 중입니다. 잠시 후 다시 시도해주세요."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+                response['Retry-After'] = '1'
+                return response
+            time.sleep(POLL_INTERVAL)
+
+        try:
+            with transaction.atomic():
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code < 500:
+                    IdempotencyKey.objects.filter(user=request.user, key=key).update(
+                        status=IdempotencyKey.COMPLETED,
+                        response_status=response.status_code,
+                        response_body=response.data,
+                        updated_at=timezone.now(),
+                    )
+        except Exception:
+            IdempotencyKey.objects.filter(user=request.user, key=key).delete()
+            raise
+
+        if response.status_code >= 500:
+            IdempotencyKey.objects.filter(user=request.user, key=key).delete()
+        return response
+    return wrapper
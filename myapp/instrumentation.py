@@ -0,0 +1,97 @@
+import contextvars
+import time
+from contextlib import contextmanager
+
+# 현재 요청(컨텍스트)에서 쿼리를 세고 있는 QueryCounter 들
+# 컨텍스트 변수라서 async 뷰의 ORM 이 실행되는 sync_to_async 스레드에도 전달된다
+_active_counters = contextvars.ContextVar('active_query_counters', default=())
+
+
+# 모든 DB 연결에 한 번만 거는 실행 래퍼 (signals.py 의 connection_created 에서 설치)
+# Django DB 연결은 스레드마다 따로 있으므로, 요청 시작 시 현재 스레드 연결에만 래퍼를 거는 방식으로는
+# ASGI 에서 다른 스레드에서 실행되는 쿼리를 셀 수 없음
+def observe_queries(execute, sql, params, many, context):
+    counters = _active_counters.get()
+    if not counters:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        for counter in counters:
+            counter.count += 1
+            counter.duration += elapsed
+
+
+def install_query_observer(connection):
+    if observe_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(observe_queries)
+
+
+# 실행된 SQL 수와 DB 시간 측정 (DEBUG 의 connection.queries 에 의존하지 않음)
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0  # 초
+
+    # 블록 안에서(같은 컨텍스트의 다른 스레드 포함) 실행된 쿼리를 센다
+    @contextmanager
+    def track(self):
+        token = _active_counters.set(_active_counters.get() + (self,))
+        try:
+            yield self
+        finally:
+            _active_counters.reset(token)
+
+
+# DRF serializer 의 .data (to_representation 실행) 시간 측정, 그 안에서 실행된 쿼리 시간은 제외
+# 요청 단위 타이머는 RequestTimingMiddleware 가 컨텍스트 변수로 걸어 둠 (JSON 렌더링 시간과 합쳐서 serialize 로 보고)
+_active_serialize_timer = contextvars.ContextVar('active_serialize_timer', default=None)
+
+
+class SerializeTimer:
+    def __init__(self):
+        self.duration = 0.0  # 초
+        self._running = False
+
+    @contextmanager
+    def track(self):
+        token = _active_serialize_timer.set(self)
+        try:
+            yield self
+        finally:
+            _active_serialize_timer.reset(token)
+
+
+def _timed_data(prop):
+    getter = prop.fget
+
+    def data(self):
+        timer = _active_serialize_timer.get()
+        # 측정 중이 아니거나, 다른 serializer 의 .data 안에서 불린 경우(중복 측정 방지)는 그대로
+        if timer is None or timer._running:
+            return getter(self)
+        timer._running = True
+        started = time.perf_counter()
+        try:
+            # 지연 평가 쿼리셋이 여기서 실행되면 그 시간은 db 로 이미 잡히므로 빼고 더함
+            with QueryCounter().track() as queries:
+                return getter(self)
+        finally:
+            timer.duration += max(time.perf_counter() - started - queries.duration, 0.0)
+            timer._running = False
+
+    data._timed = True
+    return property(data, doc=prop.__doc__)
+
+
+# Serializer / ListSerializer(many=True) 의 .data 에 한 번만 측정 래퍼 설치 (apps.py 에서 호출)
+def install_serializer_timing():
+    from rest_framework import serializers
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        prop = cls.__dict__['data']
+        if not getattr(prop.fget, '_timed', False):
+            cls.data = _timed_data(prop)
@@ -0,0 +1,49 @@
+"""
+사용자 관심 장르 (UserInterest, 슬롯 1~3)
+
+API 는 예전처럼 interest_1~3 (문자열 장르 ID) 으로 주고받고, 저장은 UserInterest 행으로 한다.
+  - 사용자의 관심 장르: (user) 인덱스 한 번
+  - 장르 X 에 관심 있는 사용자: (genre, user) 인덱스 한 번 (interested_user_ids)
+"""
+from django.db import transaction
+
+from .genres import genre_registry
+from .models import INTEREST_SLOTS, UserInterest, build_user_interests, parse_interest_slots
+from .versioning import bump_version, user_profile_key
+
+
+# 관심 장르 ID 목록 (슬롯 순서)
+def interest_genre_ids(user):
+    return list(UserInterest.objects.filter(user=user).order_by('slot').values_list('genre_id', flat=True))
+
+
+async def ainterest_genre_ids(user):
+    return [genre_id async for genre_id in UserInterest.objects.filter(user=user).order_by('slot').values_list('genre_id', flat=True)]
+
+
+# API 응답용 {'interest_1': '3', 'interest_2': None, ...}
+def interest_fields(user):
+    slots = dict(UserInterest.objects.filter(user=user).values_list('slot', 'genre_id'))
+    return {
+        f'interest_{slot}': str(slots[slot]) if slot in slots else None
+        for slot in INTEREST_SLOTS
+    }
+
+
+# 관심 장르 교체 ([interest_1, interest_2, interest_3] 값, 없는 장르는 무시)
+def set_interests(user, values):
+    slots = {
+        slot: genre_id
+        for slot, genre_id in parse_interest_slots(values).items()
+        if genre_registry.name(genre_id) is not None
+    }
+    with transaction.atomic():
+        UserInterest.objects.filter(user=user).delete()
+        UserInterest.objects.bulk_create(build_user_interests(user.pk, slots))
+        bump_version(user_profile_key(user.pk))
+    return slots
+
+
+# 장르에 관심 있는 사용자 ID (추천/알림 대상 선정 등)
+def interested_user_ids(genre_id):
+    return UserInterest.objects.filter(genre_id=genre_id).values_list('user_id', flat=True).distinct()
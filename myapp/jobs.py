@@ -0,0 +1,137 @@
+"""
+DB 기반 백그라운드 작업 큐
+
+제출 API 는 핵심 결과(세션/문항 결과/오답 노트)만 저장하고 바로 응답하고,
+나머지 집계 작업(문제 통계, 유저 점수 등)은 enqueue() 로 Job 행을 남긴다.
+manage.py run_jobs 워커가 SELECT ... FOR UPDATE SKIP LOCKED 로 작업을 가져가 실행한다.
+  - 작업 함수 실행과 Job 삭제는 한 트랜잭션 → 성공한 작업은 정확히 한 번 반영
+  - 실패하면 지수 백오프로 재시도, max_attempts 를 넘으면 status='failed' 로 남김 (admin 에서 확인)
+  - 워커가 죽어서 running 으로 남은 작업은 JOB_LOCK_TIMEOUT 뒤에 다른 워커가 다시 가져감
+    (원래 워커가 뒤늦게 같은 작업을 실행하려 하면 행이 이미 없거나 남의 것이므로 건너뜀)
+settings.JOB_QUEUE_EAGER 가 켜져 있으면 큐를 거치지 않고 커밋 직후 바로 실행 (로컬 개발/테스트용)
+기본값은 꺼져 있으므로 배포 환경에서는 run_jobs 워커를 반드시 함께 띄워야 한다.
+워커가 없으면 작업이 쌓이기만 하고 점수/랭킹/통계가 전혀 갱신되지 않는다.
+
+작업 추가:
+    @job('do_something')
+    def do_something(user_id):
+        ...
+
+    enqueue('do_something', user_id=1)
+"""
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .metrics import job_duration_seconds, jobs_total
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+# 작업 함수 등록
+def job(name, max_attempts=5):
+    def decorator(func):
+        _registry[name] = (func, max_attempts)
+        return func
+    return decorator
+
+
+def get_handler(name):
+    # 작업 함수 모듈을 불러와서 등록되게 함
+    from . import tasks  # noqa: F401
+    return _registry.get(name)
+
+
+# 작업 추가 (현재 트랜잭션이 커밋된 뒤에 보이게 됨)
+def enqueue(name, **payload):
+    handler = get_handler(name)
+    if handler is None:
+        raise ValueError(f"등록되지 않은 작업입니다: {name}")
+    func, max_attempts = handler
+
+    if getattr(settings, 'JOB_QUEUE_EAGER', False):
+        transaction.on_commit(lambda: func(**payload))
+        return None
+    return Job.objects.create(name=name, payload=payload, max_attempts=max_attempts)
+
+
+# 실행할 작업을 가져와 running 으로 표시 (다른 워커가 잡고 있는 행은 건너뜀)
+def claim(worker_id, batch_size=10):
+    now = timezone.now()
+    stale = now - timedelta(seconds=getattr(settings, 'JOB_LOCK_TIMEOUT', 300))
+    with transaction.atomic():
+        ids = list(
+            Job.objects
+            .select_for_update(skip_locked=True)
+            .filter(Q(status=Job.QUEUED, run_at__lte=now) | Q(status=Job.RUNNING, locked_at__lt=stale))
+            .order_by('run_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        Job.objects.filter(id__in=ids).update(
+            status=Job.RUNNING, locked_at=now, locked_by=worker_id, attempts=F('attempts') + 1,
+        )
+    return list(Job.objects.filter(id__in=ids).order_by('run_at'))
+
+
+# 재시도 대기 시간: JOB_RETRY_BASE_SECONDS * 2^(시도 횟수-1), 최대 1시간
+def retry_delay(attempts):
+    base = getattr(settings, 'JOB_RETRY_BASE_SECONDS', 10)
+    return min(base * 2 ** (attempts - 1), 3600)
+
+
+def run_job(job_row):
+    handler = get_handler(job_row.name)
+    started = time.perf_counter()
+    try:
+        if handler is None:
+            raise LookupError(f"등록되지 않은 작업입니다: {job_row.name}")
+        with transaction.atomic():
+            # 작업 행을 잠그고 아직 내 것인지 확인한다. 묶음 뒤쪽에서 기다리다 JOB_LOCK_TIMEOUT 이 지나
+            # 다른 워커가 다시 가져가 이미 끝냈으면(행 삭제) 또는 실행 중이면(잠금 해제 후 삭제됨) 건너뜀
+            # (실행 중인 작업은 이 트랜잭션이 행을 잠그고 있어 claim 의 SKIP LOCKED 로도 다시 가져가지 않는다)
+            owned = (
+                Job.objects.select_for_update()
+                .filter(pk=job_row.pk, locked_by=job_row.locked_by, attempts=job_row.attempts)
+                .exists()
+            )
+            if owned:
+                handler[0](**job_row.payload)
+                Job.objects.filter(pk=job_row.pk).delete()
+    except Exception:
+        error = traceback.format_exc()
+        if job_row.attempts >= job_row.max_attempts:
+            result = 'failed'
+            Job.objects.filter(pk=job_row.pk).update(status=Job.FAILED, last_error=error, locked_at=None)
+            logger.error("작업 실패 (재시도 종료) %s #%s: %s", job_row.name, job_row.pk, error)
+        else:
+            result = 'retry'
+            Job.objects.filter(pk=job_row.pk).update(
+                status=Job.QUEUED, last_error=error, locked_at=None,
+                run_at=timezone.now() + timedelta(seconds=retry_delay(job_row.attempts)),
+            )
+            logger.warning("작업 실패 (재시도 예정) %s #%s (%d/%d)", job_row.name, job_row.pk, job_row.attempts, job_row.max_attempts)
+    else:
+        result = 'done' if owned else 'skipped'
+
+    jobs_total.inc(job=job_row.name, result=result)
+    job_duration_seconds.observe(time.perf_counter() - started, job=job_row.name)
+    return result
+
+
+# 작업을 한 묶음 가져와 실행하고 처리한 개수 반환
+def work_once(worker_id, batch_size=10):
+    jobs = claim(worker_id, batch_size)
+    for job_row in jobs:
+        run_job(job_row)
+    return len(jobs)
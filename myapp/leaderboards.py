@@ -0,0 +1,222 @@
+"""
+기간별 리더보드 (일간 / 주간 / 시즌=분기)
+
+퀴즈 세션이 저장될 때마다 update_leaderboards 작업이 세 기간의 LeaderboardScore 를 F() 로 누적한다
+(QuizSession 을 다시 집계하지 않음, 세션 종료 날짜 기준이라 작업이 늦게 돌아도 기간이 바뀌지 않음).
+진행 중인 기간은 (period, window_start, score, user) 인덱스를 거꾸로 읽어서 순위를 매기고,
+마감된 기간은 close_leaderboards 명령이 최종 순위를 LeaderboardSnapshot 으로 얼려 두고 누적 행은 지운다.
+  - 얼린 뒤에 늦게 도착한 점수 작업은 그 기간을 건너뜀 (최종 순위는 바뀌지 않고, 아무도 읽지 않는 행도 남기지 않음)
+  - 스냅샷은 바뀌지 않으므로 상위 목록을 캐시에 기간별로 영구 저장 (마감 후 조회 비용 없음, 닉네임도 마감 시점 기준)
+  - 순위 변동(rank_change) = 직전 기간 최종 순위 - 현재 순위 (양수 = 상승, 직전 기간에 없었으면 None)
+같은 점수는 user_id 가 큰 쪽이 앞 순위 (랭킹과 같은 순서, myapp/rankings.py).
+"""
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .fast_serializers import serialize_ranking_rows
+from .models import LeaderboardScore, LeaderboardSnapshot
+from .rankings import rank_of, ranking_order
+from .versioning import LEADERBOARD, bump_version
+
+PERIODS = ('daily', 'weekly', 'season')
+TOP_SIZE = 100
+SNAPSHOT_BATCH_SIZE = 1000
+
+ENTRY_FIELDS = ('user_id', 'user__username', 'user__profile_image', 'score')
+
+
+def today():
+    now = timezone.now()
+    return timezone.localdate(now) if timezone.is_aware(now) else now.date()
+
+
+# 날짜가 속한 기간의 첫날 (주간은 월요일, 시즌은 분기 첫날)
+def window_start(period, day):
+    if period == 'daily':
+        return day
+    if period == 'weekly':
+        return day - timedelta(days=day.weekday())
+    if period == 'season':
+        return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+    raise ValueError(f"알 수 없는 리더보드 기간입니다: {period}")
+
+
+# 기간 마지막 날
+def window_end(period, start):
+    if period == 'season':
+        month = start.month + 3
+        return date(start.year + (month - 1) // 12, (month - 1) % 12 + 1, 1) - timedelta(days=1)
+    return start + timedelta(days=1 if period == 'daily' else 7) - timedelta(days=1)
+
+
+def previous_window(period, start):
+    return window_start(period, start - timedelta(days=1))
+
+
+# for_update: 트랜잭션 안에서 스냅샷 범위를 잠그고 확인 (확인과 쓰기 사이에 다른 쪽이 얼리거나 누적하지 못하게)
+def is_frozen(period, start, for_update=False):
+    snapshots = LeaderboardSnapshot.objects.filter(period=period, window_start=start)
+    if for_update:
+        snapshots = snapshots.select_for_update()
+    return snapshots.exists()
+
+
+# 세션 점수 누적 (played_on: 세션 종료 날짜)
+# 끝난 기간만 얼렸는지 확인 (진행 중인 기간은 얼릴 수 없으므로 제때 도는 작업은 추가 조회 없음)
+# 확인과 누적은 한 트랜잭션 → freeze_window 가 스냅샷을 만드는 사이에 늦은 점수가 끼어들지 않음
+def record_score(user_id, score_delta, played_on):
+    current = today()
+    windows = [(period, window_start(period, played_on)) for period in PERIODS]
+    with transaction.atomic():
+        windows = [
+            (period, start) for period, start in windows
+            if window_end(period, start) >= current or not is_frozen(period, start, for_update=True)
+        ]
+        if not windows:
+            return
+        LeaderboardScore.objects.bulk_create(
+            [LeaderboardScore(period=period, window_start=start, user_id=user_id) for period, start in windows],
+            ignore_conflicts=True,
+        )
+        condition = Q()
+        for period, start in windows:
+            condition |= Q(period=period, window_start=start)
+        LeaderboardScore.objects.filter(condition, user_id=user_id).update(
+            score=F('score') + float(score_delta),
+            sessions=F('sessions') + 1,
+        )
+        bump_version(LEADERBOARD)
+
+
+def _previous_ranks(period, start, user_ids=None):
+    snapshots = LeaderboardSnapshot.objects.filter(period=period, window_start=previous_window(period, start))
+    if user_ids is not None:
+        snapshots = snapshots.filter(user_id__in=user_ids)
+    return dict(snapshots.values_list('user_id', 'rank'))
+
+
+def _rank_change(previous_rank, rank):
+    return None if previous_rank is None else previous_rank - rank
+
+
+# 마감된 기간의 최종 순위를 스냅샷으로 저장하고 누적 행 삭제
+# 이미 얼린 기간이면 남아 있는 누적 행만 지우고 0 (그대로 두면 close_windows 가 매번 다시 찾음)
+def freeze_window(period, start):
+    scores = LeaderboardScore.objects.filter(period=period, window_start=start)
+    with transaction.atomic():
+        if is_frozen(period, start, for_update=True):
+            scores.delete()
+            return 0
+
+        previous = _previous_ranks(period, start)
+        # 잠그면서 읽어야 트랜잭션 시작 전 스냅샷이 아닌 최신 누적 값으로 순위를 매김
+        rows = (
+            scores.select_for_update()
+            .order_by(*ranking_order('score', 'user_id')).values_list('user_id', 'score')
+        )
+        frozen = 0
+        batch = []
+        for rank, (user_id, score) in enumerate(rows.iterator(chunk_size=SNAPSHOT_BATCH_SIZE), start=1):
+            batch.append(LeaderboardSnapshot(
+                period=period, window_start=start, rank=rank, user_id=user_id, score=score,
+                rank_change=_rank_change(previous.get(user_id), rank),
+            ))
+            if len(batch) >= SNAPSHOT_BATCH_SIZE:
+                LeaderboardSnapshot.objects.bulk_create(batch)
+                frozen += len(batch)
+                batch = []
+        LeaderboardSnapshot.objects.bulk_create(batch)
+        frozen += len(batch)
+        scores.delete()
+        bump_version(LEADERBOARD)
+    return frozen
+
+
+# 마감됐지만 아직 얼리지 않은 기간을 오래된 것부터 얼림 → [(period, window_start, 순위 수), ...]
+def close_windows(day=None):
+    day = day or today()
+    closed = []
+    for period in PERIODS:
+        starts = (
+            LeaderboardScore.objects.filter(period=period, window_start__lt=window_start(period, day))
+            .order_by('window_start').values_list('window_start', flat=True).distinct()
+        )
+        for start in list(starts):
+            closed.append((period, start, freeze_window(period, start)))
+    return closed
+
+
+def _entries(rows, ranks_and_changes):
+    entries = serialize_ranking_rows([row[:4] for row in rows])
+    for entry, (rank, rank_change) in zip(entries, ranks_and_changes):
+        entry['rank'] = rank
+        entry['rank_change'] = rank_change
+    return entries
+
+
+def snapshot_cache_key(period, start):
+    return f'leaderboard:{period}:{start.isoformat()}'
+
+
+# 얼린 기간 상위 목록 (바뀌지 않으므로 캐시 만료 없음)
+def _snapshot_top(period, start):
+    key = snapshot_cache_key(period, start)
+    entries = cache.get(key)
+    if entries is None:
+        rows = list(
+            LeaderboardSnapshot.objects.filter(period=period, window_start=start)
+            .order_by('rank').values_list(*ENTRY_FIELDS, 'rank', 'rank_change')[:TOP_SIZE]
+        )
+        entries = _entries(rows, [row[4:] for row in rows])
+        if entries:
+            cache.set(key, entries, None)
+    return entries
+
+
+def _snapshot_mine(period, start, user):
+    row = (
+        LeaderboardSnapshot.objects.filter(period=period, window_start=start, user=user)
+        .values_list(*ENTRY_FIELDS, 'rank', 'rank_change').first()
+    )
+    return _entries([row], [row[4:]])[0] if row else {}
+
+
+def _live_top(period, start):
+    rows = list(
+        live_scores(period, start).order_by(*ranking_order('score', 'user_id')).values_list(*ENTRY_FIELDS)[:TOP_SIZE]
+    )
+    previous = _previous_ranks(period, start, [row[0] for row in rows])
+    return _entries(rows, [(rank, _rank_change(previous.get(row[0]), rank)) for rank, row in enumerate(rows, start=1)])
+
+
+def live_scores(period, start):
+    return LeaderboardScore.objects.filter(period=period, window_start=start)
+
+
+def _live_mine(period, start, user):
+    row = LeaderboardScore.objects.filter(period=period, window_start=start, user=user).values_list(*ENTRY_FIELDS).first()
+    if row is None:
+        return {}
+    rank = rank_of(live_scores(period, start), 'score', 'user_id', row[3], user.id)
+    return _entries([row], [(rank, _rank_change(_previous_ranks(period, start, [user.id]).get(user.id), rank))])[0]
+
+
+# 리더보드 응답 (day 가 속한 기간)
+def leaderboard(period, day, user):
+    start = window_start(period, day)
+    if is_frozen(period, start):
+        top, mine = _snapshot_top(period, start), _snapshot_mine(period, start, user)
+    else:
+        top, mine = _live_top(period, start), _live_mine(period, start, user)
+    return {
+        'period': period,
+        'window_start': start.isoformat(),
+        'window_end': window_end(period, start).isoformat(),
+        'closed': window_end(period, start) < today(),
+        'top_rankings': top,
+        'my_ranking': mine,
+    }
@@ -0,0 +1,236 @@
+"""
+API 부하 테스트 도구 (manage.py loadtest 에서 사용)
+
+가상 사용자마다 스레드 하나가 실제 앱 흐름을 반복한다.
+  app:   로그인 → 문제 덱 조회 → 퀴즈 제출 → 랭킹 → 최근 퀴즈 결과
+  reads: (로그인 1번) → 문제 덱 → 데일리 상식 → 랜덤 해설 → 랭킹 → 최근 퀴즈 결과
+         (조회 API 만, WSGI sync 뷰와 ASGI async 뷰 처리량 비교용)
+
+- 기본은 Django 테스트 클라이언트로 프로세스 안에서 요청 (요청당 쿼리 수 측정 가능)
+  SQLite 는 쓰기가 한 번에 하나뿐이라 WAL + busy timeout + IMMEDIATE 트랜잭션으로 쓰기를 줄 세운다
+  (동시 사용자 여러 명도 오류 없이 돌지만 제출 처리량은 SQLite 쓰기 한 줄이 상한, 실제 수치는 MySQL 에서 측정)
+- base_url 을 주면 실행 중인 서버(gunicorn/uvicorn)에 실제 HTTP 요청
+"""
+import json
+import math
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from django.db import connections
+from django.test import Client
+
+from .instrumentation import QueryCounter
+
+LOADTEST_PASSWORD = 'loadtest-password'
+SCENARIOS = ('app', 'reads')
+SQLITE_BUSY_TIMEOUT = 30  # 다른 스레드의 쓰기가 끝나기를 기다리는 시간 (초)
+
+# RequestTimingMiddleware 의 Server-Timing 헤더에서 쿼리 수 추출
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def loadtest_email(number):
+    return f'loadtest_{number}@example.com'
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)  # nearest-rank
+    return ordered[index]
+
+
+# 프로세스 안에서 요청 (쿼리 수 측정)
+class InProcessTransport:
+    def __init__(self):
+        self.client = Client()
+
+    def request(self, method, path, data=None, token=None):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        counter = QueryCounter()
+        with counter.track():
+            if method == 'GET':
+                response = self.client.get(path, **headers)
+            else:
+                response = self.client.post(path, data=json.dumps(data), content_type='application/json', **headers)
+        body = json.loads(response.content) if response.content else None
+        return response.status_code, body, counter.count
+
+    def close(self):
+        connections.close_all()
+
+
+def queries_from_server_timing(header):
+    match = SERVER_TIMING_QUERIES.search(header or '')
+    return int(match.group(1)) if match else None
+
+
+# 실행 중인 서버에 HTTP 요청 (쿼리 수는 Server-Timing 헤더가 있을 때만 기록)
+class HttpTransport:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, data=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        payload = json.dumps(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=payload, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                status, content, timing = response.status, response.read(), response.headers.get('Server-Timing')
+        except urllib.error.HTTPError as exc:
+            status, content, timing = exc.code, exc.read(), exc.headers.get('Server-Timing')
+        try:
+            body = json.loads(content) if content else None
+        except ValueError:
+            body = None
+        return status, body, queries_from_server_timing(timing)
+
+    def close(self):
+        pass
+
+
+# 프로세스 안 부하 테스트용 SQLite 설정 (스레드별 새 커넥션부터 적용)
+#   - busy timeout: 잠겨 있으면 바로 'database is locked' 대신 기다림
+#   - transaction_mode IMMEDIATE: 트랜잭션 시작 시 쓰기 잠금을 잡아서 읽기→쓰기 잠금 승격 교착을 없앰
+#   - WAL: 쓰는 동안에도 다른 스레드가 읽을 수 있음 (DB 파일에 저장되는 설정)
+def configure_sqlite_for_threads():
+    for alias in connections:
+        settings_dict = connections.settings[alias]
+        if settings_dict['ENGINE'] != 'django.db.backends.sqlite3':
+            continue
+        options = settings_dict.setdefault('OPTIONS', {})
+        options.setdefault('timeout', SQLITE_BUSY_TIMEOUT)
+        options.setdefault('transaction_mode', 'IMMEDIATE')
+        connections[alias].close()
+        with connections[alias].cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode=WAL')
+        connections[alias].close()
+
+
+class LoadTest:
+    def __init__(self, users, iterations, genre_id, base_url=None, think_time=0.0, seed=None, scenario='app'):
+        self.users = users
+        self.iterations = iterations
+        self.genre_id = genre_id
+        self.base_url = base_url
+        self.think_time = think_time
+        self.seed = seed
+        self.scenario = scenario
+        self.lock = threading.Lock()
+        self.samples = {}  # endpoint → [(초, 쿼리 수, 성공 여부)]
+
+    def make_transport(self):
+        return HttpTransport(self.base_url) if self.base_url else InProcessTransport()
+
+    def record(self, endpoint, elapsed, queries, ok):
+        with self.lock:
+            self.samples.setdefault(endpoint, []).append((elapsed, queries, ok))
+
+    def call(self, transport, endpoint, method, path, data=None, token=None, expect=(200,)):
+        started = time.perf_counter()
+        try:
+            status, body, queries = transport.request(method, path, data, token)
+        except Exception:
+            status, body, queries = None, None, None
+        self.record(endpoint, time.perf_counter() - started, queries, status in expect)
+        if self.think_time:
+            time.sleep(self.think_time)
+        return body if status in expect else None
+
+    def login(self, transport, number):
+        login = self.call(transport, 'login', 'POST', '/login/', {
+            'email': loadtest_email(number), 'password': LOADTEST_PASSWORD,
+        })
+        return login['access'] if login else None
+
+    # 가상 사용자 한 명의 흐름
+    def run_user(self, number):
+        rng = random.Random(None if self.seed is None else self.seed + number)
+        transport = self.make_transport()
+        try:
+            if self.scenario == 'reads':
+                self.run_reads(transport, number, rng)
+                return
+
+            for _ in range(self.iterations):
+                token = self.login(transport, number)
+                if not token:
+                    continue
+
+                deck = self.call(transport, 'genre_25_questions', 'GET', f'/questions/genre/25/?genre_id={self.genre_id}', token=token)
+                if deck:
+                    self.call(transport, 'quiz_submit', 'POST', '/quiz/submit/', {
+                        'genre_id': self.genre_id,
+                        'quiz_type': 'test25',
+                        'quiz_results': [
+                            {'question_id': q['question_id'], 'user_answer': rng.randint(1, 4)} for q in deck
+                        ],
+                    }, token=token, expect=(201,))
+
+                self.call(transport, 'ranking', 'GET', f"/quiz/ranking/?mode={rng.choice(['total', 'solve', 'speed_1min'])}", token=token)
+                self.call(transport, 'quiz_session', 'GET', '/quiz/sessions/', token=token)
+        finally:
+            transport.close()
+
+    # 조회 API 만 반복 (로그인은 처음 한 번)
+    def run_reads(self, transport, number, rng):
+        token = self.login(transport, number)
+        if not token:
+            return
+        for _ in range(self.iterations):
+            self.call(transport, 'genre_25_questions', 'GET', f'/questions/genre/25/?genre_id={self.genre_id}', token=token)
+            self.call(transport, 'daily-facts', 'GET', f'/daily-facts/?email={loadtest_email(number)}')
+            self.call(transport, 'random_explanations', 'GET', '/questions/random_explanations/', token=token)
+            self.call(transport, 'ranking', 'GET', f"/quiz/ranking/?mode={rng.choice(['total', 'solve', 'speed_1min'])}", token=token)
+            self.call(transport, 'quiz_session', 'GET', '/quiz/sessions/', token=token)
+
+    def run(self):
+        if not self.base_url:
+            configure_sqlite_for_threads()
+        threads = [threading.Thread(target=self.run_user, args=(n,)) for n in range(self.users)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.report(time.perf_counter() - started)
+
+    def report(self, wall_time):
+        endpoints = {}
+        for endpoint, samples in sorted(self.samples.items()):
+            latencies = [elapsed * 1000 for elapsed, _, _ in samples]
+            queries = [q for _, q, _ in samples if q is not None]
+            endpoints[endpoint] = {
+                'requests': len(samples),
+                'errors': sum(1 for _, _, ok in samples if not ok),
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'p99_ms': percentile(latencies, 99),
+                'mean_ms': sum(latencies) / len(latencies),
+                'throughput_rps': len(samples) / wall_time if wall_time else None,
+                'queries_per_request': sum(queries) / len(queries) if queries else None,
+            }
+
+        total = sum(row['requests'] for row in endpoints.values())
+        return {
+            'meta': {
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'transport': 'http' if self.base_url else 'in-process',
+                'base_url': self.base_url,
+                'scenario': self.scenario,
+                'users': self.users,
+                'iterations': self.iterations,
+                'genre_id': self.genre_id,
+                'wall_time_s': wall_time,
+                'total_requests': total,
+                'throughput_rps': total / wall_time if wall_time else None,
+            },
+            'endpoints': endpoints,
+        }
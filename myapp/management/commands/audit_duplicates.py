@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from myapp.dedup import (
+    DEFAULT_THRESHOLD, SignatureTable, find_duplicates, group_duplicates, load_question_signatures,
+    merge_duplicate_questions,
+)
+from myapp.models import Question
+
+
+class Command(BaseCommand):
+    help = '문제은행에서 유사(중복) 문제 묶음을 찾습니다. --merge 를 주면 묶음마다 가장 오래된 문제 하나로 합칩니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help='유사 문제로 판정할 유사도 (0~1, 정규화한 문제+정답의 3-gram 자카드 유사도 추정치)')
+        parser.add_argument('--genre-id', type=int, help='이 장르의 문제만 검사')
+        parser.add_argument('--show', type=int, default=20, help='출력할 묶음 수')
+        parser.add_argument('--merge', action='store_true',
+                            help='풀이 기록/오답 노트/통계를 가장 작은 question_id 로 옮기고 나머지 삭제')
+
+    def handle(self, *args, **options):
+        queryset = Question.objects.all()
+        if options['genre_id']:
+            queryset = queryset.filter(genre_id=options['genre_id'])
+
+        started = time.perf_counter()
+        table = load_question_signatures(SignatureTable(), queryset)
+        loaded = time.perf_counter()
+        pairs = find_duplicates(table, options['threshold'])
+        groups = [[table.keys[index] for index in group] for group in group_duplicates(len(table), pairs)]
+        self.stdout.write(
+            f"문제 {len(table)}개, 유사 쌍 {len(pairs)}개, 묶음 {len(groups)}개 "
+            f"(서명 {loaded - started:.1f}s, 비교 {time.perf_counter() - loaded:.1f}s)"
+        )
+
+        texts = dict(
+            Question.objects.filter(question_id__in=[qid for group in groups[:options['show']] for qid in group])
+            .values_list('question_id', 'question_text')
+        )
+        for group in groups[:options['show']]:
+            self.stdout.write(f"- 유지 {group[0]}: {texts.get(group[0], '')[:40]}")
+            for question_id in group[1:]:
+                self.stdout.write(f"    중복 {question_id}: {texts.get(question_id, '')[:40]}")
+
+        if not options['merge']:
+            return
+
+        merged = 0
+        for group in groups:
+            merged += merge_duplicate_questions(group[0], group[1:])
+        self.stdout.write(self.style.SUCCESS(f"중복 문제 {merged}개를 합쳤습니다."))
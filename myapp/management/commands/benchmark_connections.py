@@ -0,0 +1,91 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+from django.test import Client
+
+from myapp.db_pool import PooledConnectionMixin
+from myapp.loadtest import percentile
+from myapp.models import Genre
+
+
+class Command(BaseCommand):
+    help = '요청마다 새 DB 커넥션을 열 때와 커넥션을 재사용할 때(지속 커넥션/풀)의 요청 지연시간을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='모드별 요청 수')
+        parser.add_argument('--path', type=str, help='요청할 경로 (기본: 첫 장르의 25문제 덱)')
+        parser.add_argument('--output', type=str, help='결과를 저장할 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not path:
+            genre_id = Genre.objects.order_by('genre_id').values_list('genre_id', flat=True).first()
+            if genre_id is None:
+                raise CommandError('장르가 없습니다. --path 를 지정하거나 데이터를 먼저 넣어주세요.')
+            path = f'/questions/genre/25/?genre_id={genre_id}'
+
+        connection = connections[DEFAULT_DB_ALIAS]
+        original_max_age = connection.settings_dict['CONN_MAX_AGE']
+        # 풀 엔진이면 CONN_MAX_AGE=0 일 때 요청이 끝나면 풀에 반납 → 재사용
+        reuse_mode = 'pool' if isinstance(connection, PooledConnectionMixin) else 'per_request'
+
+        report = {'path': path, 'engine': connection.settings_dict['ENGINE'], 'modes': {}}
+        try:
+            for mode, max_age in ((reuse_mode, 0), ('persistent', 600)):
+                report['modes'][mode] = self.measure(path, max_age, options['requests'])
+        finally:
+            connection.settings_dict['CONN_MAX_AGE'] = original_max_age
+            connection.close()
+
+        for mode, row in report['modes'].items():
+            self.stdout.write(
+                f"{mode:12s} p50 {row['p50_ms']:7.2f}ms  p95 {row['p95_ms']:7.2f}ms  "
+                f"mean {row['mean_ms']:7.2f}ms  connect {row['connect_ms']:6.2f}ms x{row['connects']}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"결과 저장: {options['output']}"))
+
+    def measure(self, path, max_age, requests):
+        connection = connections[DEFAULT_DB_ALIAS]
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+
+        # connect() 호출 횟수/시간 측정 (풀에서 꺼내는 경우도 포함)
+        stats = {'connects': 0, 'connect_time': 0.0}
+        original_connect = connection.connect
+
+        def timed_connect():
+            started = time.perf_counter()
+            original_connect()
+            stats['connects'] += 1
+            stats['connect_time'] += time.perf_counter() - started
+
+        client = Client()
+        latencies = []
+        connection.connect = timed_connect
+        try:
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = client.get(path)
+                # 테스트 클라이언트는 request_finished 에서 커넥션을 정리하지 않으므로 서버처럼 직접 호출
+                close_old_connections()
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    raise CommandError(f'{path} → {response.status_code}')
+        finally:
+            del connection.connect
+
+        return {
+            'conn_max_age': max_age,
+            'requests': requests,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'mean_ms': sum(latencies) / len(latencies),
+            'connects': stats['connects'],
+            'connect_ms': stats['connect_time'] * 1000 / max(stats['connects'], 1),
+        }
@@ -0,0 +1,100 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.renderers import JSONRenderer
+
+from myapp.fast_serializers import serialize_question_deck, serialize_quiz_sessions
+from myapp.models import CustomUser, Genre, Question, QuizResult, QuizSession
+from myapp.serializers import QuestionSerializer, QuizSessionSerializer
+
+
+class Command(BaseCommand):
+    help = 'DRF serializer 와 경량 serializer 의 직렬화 속도를 비교합니다. (임시 데이터는 롤백됨)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=100, help='덱 문제 수')
+        parser.add_argument('--sessions', type=int, default=20, help='세션 수')
+        parser.add_argument('--results-per-session', type=int, default=25, help='세션당 결과 수')
+        parser.add_argument('--repeat', type=int, default=50, help='반복 횟수')
+        parser.add_argument('--output', type=str, help='결과를 저장할 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            report = self.run(options)
+            transaction.set_rollback(True)  # 임시 데이터 삭제
+
+        for name, row in report.items():
+            self.stdout.write(
+                f"{name:10s} DRF {row['drf_ms']:8.2f}ms  fast {row['fast_ms']:8.2f}ms  "
+                f"x{row['speedup']:.1f}  (queries {row['drf_queries']} → {row['fast_queries']})"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"결과 저장: {options['output']}"))
+
+    def run(self, options):
+        genre = Genre.objects.create(genre_name='__benchmark__')
+        Question.objects.bulk_create([
+            Question(
+                genre=genre, question_text=f'벤치마크 문제 {i}', option1='하나', option2='둘',
+                option3='셋', option4='넷', answer='둘', correct_option=2, explanation='해설 ' * 20,
+            )
+            for i in range(max(options['items'], options['results_per_session']))
+        ])
+        question_ids = list(Question.objects.filter(genre=genre).values_list('question_id', flat=True))
+        user = CustomUser.objects.create_user('__benchmark__', 'benchmark@example.com', None)
+
+        for _ in range(options['sessions']):
+            session = QuizSession.objects.create(
+                user=user, genre=genre, quiz_type='test25', total_questions=options['results_per_session'],
+                correct_count=0, wrong_count=0, total_score=0,
+            )
+            QuizResult.objects.bulk_create([
+                QuizResult(session=session, question_id=qid, user_option=i % 4 + 1, is_correct=i % 4 == 1, score=0)
+                for i, qid in enumerate(question_ids[:options['results_per_session']])
+            ])
+
+        deck = Question.objects.filter(genre=genre).order_by('question_id')[:options['items']]
+        sessions = QuizSession.objects.filter(user=user).order_by('-created_at')
+
+        def drf_deck():
+            return QuestionSerializer(deck, many=True).data
+
+        def drf_sessions():
+            queryset = sessions.select_related('genre').prefetch_related(
+                'quizresult_set__question', 'quizresult_set__question__genre'
+            )
+            return QuizSessionSerializer(queryset, many=True).data
+
+        return {
+            'deck': self.compare(drf_deck, lambda: serialize_question_deck(deck), options['repeat']),
+            'sessions': self.compare(drf_sessions, lambda: serialize_quiz_sessions(sessions), options['repeat']),
+        }
+
+    def compare(self, drf, fast, repeat):
+        drf_ms, drf_queries, drf_body = self.measure(drf, repeat)
+        fast_ms, fast_queries, fast_body = self.measure(fast, repeat)
+        if drf_body != fast_body:
+            self.stderr.write(self.style.ERROR('경고: DRF 와 경량 serializer 출력이 다릅니다.'))
+        return {
+            'drf_ms': drf_ms,
+            'fast_ms': fast_ms,
+            'speedup': drf_ms / fast_ms if fast_ms else 0.0,
+            'drf_queries': drf_queries,
+            'fast_queries': fast_queries,
+        }
+
+    def measure(self, func, repeat):
+        queries = []
+        with connection.execute_wrapper(lambda execute, *args: queries.append(1) or execute(*args)):
+            body = JSONRenderer().render(func())
+            query_count = len(queries)
+            started = time.perf_counter()
+            for _ in range(repeat):
+                JSONRenderer().render(func())
+            elapsed = (time.perf_counter() - started) * 1000 / repeat
+        return elapsed, query_count, body
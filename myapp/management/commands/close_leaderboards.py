@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from myapp.leaderboards import close_windows
+
+
+class Command(BaseCommand):
+    help = '마감된 일간/주간/시즌 리더보드의 최종 순위를 스냅샷으로 저장합니다. (cron 등으로 매일 0시 이후 실행)'
+
+    def handle(self, *args, **options):
+        closed = close_windows()
+        for period, start, count in closed:
+            self.stdout.write(f'{period} {start}: {count}명')
+        self.stdout.write(self.style.SUCCESS(f'리더보드 {len(closed)}개 기간 마감'))
@@ -0,0 +1,318 @@
+import math
+import multiprocessing
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Case, Count, IntegerField, Max, Q, Sum, When
+from django.utils import timezone
+
+from myapp.genres import refresh_question_counts
+from myapp.models import (
+    CustomUser, Genre, Question, QuestionStat, QuizResult, QuizSession, UserInterest, build_user_interests,
+)
+from myapp.versioning import QUESTION_BANK, bump_version
+
+SYNTHETIC_PASSWORD = 'synthetic-password'
+
+# 퀴즈 유형 비율
+QUIZ_TYPES = [('test25', 0.5), ('test50', 0.2), ('speed', 0.25), ('wrong_note', 0.05)]
+
+
+# 사용자 실력 / 문제 난이도 (시드가 같으면 모든 프로세스에서 같은 값)
+def make_skills(seed, count, salt):
+    rng = random.Random(f'{seed}:{salt}')
+    return [rng.gauss(0.0, 1.0) for _ in range(count)]
+
+
+# 문제 순번별 정답 보기 번호 (프로세스마다 다시 계산해도 같은 값)
+def correct_option_for(seed, index):
+    return (index * 2654435761 + seed) % 4 + 1
+
+
+# 모델 인스턴스를 만들지 않고 값 튜플을 바로 INSERT (auto_now_add 도 거치지 않음)
+# executemany 는 드라이버가 여러 행 INSERT 로 묶어주므로 bulk_create 보다 빠름
+def raw_bulk_insert(model, field_names, rows, batch_size):
+    fields = [model._meta.get_field(name) for name in field_names]
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+    sql = f"INSERT INTO {table} ({columns}) VALUES ({', '.join(['%s'] * len(fields))})"
+    with connection.cursor() as cursor:
+        for i in range(0, len(rows), batch_size):
+            cursor.executemany(sql, rows[i:i + batch_size])
+
+
+SESSION_COLUMNS = (
+    'id', 'user', 'genre', 'quiz_type', 'created_at', 'start_time', 'end_time',
+    'total_questions', 'correct_count', 'wrong_count', 'total_score',
+)
+RESULT_COLUMNS = (
+    'id', 'session', 'question', 'user_option', 'user_answer', 'correct_answer',
+    'is_correct', 'score', 'submission_time',
+)
+
+
+# 문제 생성 (장르는 question 순번 % 장르 수 로 정해짐)
+def generate_questions(plan, start, stop):
+    rng = random.Random(f"{plan['seed']}:questions:{start}")
+    genre_ids = plan['genre_ids']
+    questions = []
+    for index in range(start, stop):
+        correct_option = correct_option_for(plan['seed'], index)
+        options = [f'보기 {index}-{n}' for n in range(1, 5)]
+        questions.append(Question(
+            question_id=plan['question_start'] + index,
+            genre_id=genre_ids[index % len(genre_ids)],
+            question_text=f'합성 문제 {index}: ' + '가나다라마바사아자차카타파하'[rng.randint(0, 13):] * rng.randint(1, 4),
+            option1=options[0], option2=options[1], option3=options[2], option4=options[3],
+            answer=options[correct_option - 1],
+            correct_option=correct_option,
+            explanation=f'합성 해설 {index}',
+        ))
+    Question.objects.bulk_create(questions, batch_size=plan['batch_size'])
+    return stop - start
+
+
+def generate_users(plan, start, stop):
+    rng = random.Random(f"{plan['seed']}:users:{start}")
+    genre_ids = plan['genre_ids']
+    users = []
+    interests = []
+    for index in range(start, stop):
+        user_id = plan['user_start'] + index
+        picked = rng.sample(genre_ids, min(3, len(genre_ids)))
+        users.append(CustomUser(
+            id=user_id,
+            username=f'syn{user_id}',
+            email=f'syn{user_id}@synthetic.test',
+            password=plan['password'],
+        ))
+        interests.extend(build_user_interests(user_id, dict(enumerate(picked, start=1))))
+    CustomUser.objects.bulk_create(users, batch_size=plan['batch_size'])
+    UserInterest.objects.bulk_create(interests, batch_size=plan['batch_size'])
+    return stop - start
+
+
+# 세션 + 결과 생성
+# 활동량은 거듭제곱 분포 (앞쪽 사용자일수록 많이 플레이), 정답 확률은 sigmoid(실력 - 난이도)
+def generate_sessions(plan, start, stop):
+    rng = random.Random(f"{plan['seed']}:sessions:{start}")
+    skills = make_skills(plan['seed'], plan['users'], 'skill')
+    difficulties = make_skills(plan['seed'], plan['questions'], 'difficulty')
+    genre_ids = plan['genre_ids']
+    per_session = plan['results_per_session']
+    now = plan['now']
+    types, weights = zip(*QUIZ_TYPES)
+
+    sessions = []
+    results = []
+    for index in range(start, stop):
+        user_index = min(plan['users'] - 1, int(plan['users'] * rng.random() ** plan['activity_skew']))
+        genre_slot = rng.randrange(len(genre_ids))
+        quiz_type = rng.choices(types, weights)[0]
+        created_at = now - timedelta(seconds=rng.randrange(plan['days'] * 86400))
+        ended_at = created_at + timedelta(seconds=rng.randint(60, 600))
+        created_value = connection.ops.adapt_datetimefield_value(created_at)
+        session_id = plan['session_start'] + index
+
+        # 해당 장르의 문제 순번: genre_slot, genre_slot + 장르 수, ...
+        genre_size = (plan['questions'] - genre_slot + len(genre_ids) - 1) // len(genre_ids)
+        picks = rng.sample(range(genre_size), min(per_session, genre_size))
+
+        correct = 0
+        for offset, pick in enumerate(picks):
+            question_index = genre_slot + pick * len(genre_ids)
+            answer = correct_option_for(plan['seed'], question_index)
+            chance = 1 / (1 + math.exp(difficulties[question_index] - skills[user_index]))
+            if rng.random() < 0.03:
+                user_option = None  # 시간 초과 등으로 보기를 고르지 않은 경우
+            elif rng.random() < chance:
+                user_option = answer
+            else:
+                user_option = rng.choice([n for n in (1, 2, 3, 4) if n != answer])
+            is_correct = user_option == answer
+            correct += is_correct
+            results.append((
+                plan['result_start'] + index * per_session + offset, session_id,
+                plan['question_start'] + question_index, user_option, '', '',
+                is_correct, 4 if is_correct else 0, created_value,
+            ))
+
+        sessions.append((
+            session_id, plan['user_start'] + user_index, genre_ids[genre_slot], quiz_type,
+            created_value, created_value, connection.ops.adapt_datetimefield_value(ended_at),
+            len(picks), correct, len(picks) - correct, correct * 4,
+        ))
+
+    with transaction.atomic():
+        raw_bulk_insert(QuizSession, SESSION_COLUMNS, sessions, plan['batch_size'])
+        raw_bulk_insert(QuizResult, RESULT_COLUMNS, results, plan['batch_size'])
+    return stop - start
+
+
+PHASES = {
+    'questions': generate_questions,
+    'users': generate_users,
+    'sessions': generate_sessions,
+}
+
+
+def run_chunk(args):
+    phase, plan, start, stop = args
+    try:
+        return PHASES[phase](plan, start, stop)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = '부하/성능 테스트용 대규모 합성 데이터 (사용자, 장르, 문제, 세션, 결과)를 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='생성할 사용자 수')
+        parser.add_argument('--genres', type=int, default=10, help='생성할 장르 수')
+        parser.add_argument('--questions', type=int, default=5000, help='생성할 문제 수')
+        parser.add_argument('--sessions', type=int, default=10000, help='생성할 퀴즈 세션 수')
+        parser.add_argument('--results-per-session', type=int, default=25, help='세션당 결과 수')
+        parser.add_argument('--days', type=int, default=90, help='세션 생성 시간을 분포시킬 기간 (일)')
+        parser.add_argument('--activity-skew', type=float, default=2.0, help='사용자 활동량 편중 정도 (1 = 균등)')
+        parser.add_argument('--seed', type=int, default=42, help='난수 시드 (같으면 같은 데이터)')
+        parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count(), help='병렬 프로세스 수')
+        parser.add_argument('--batch-size', type=int, default=5000, help='bulk insert 배치 크기')
+        parser.add_argument('--chunk-size', type=int, default=50000, help='프로세스당 한 번에 처리할 행 수 (세션은 결과 행 기준)')
+        parser.add_argument('--skip-derived', action='store_true', help='문제 통계/사용자 점수 집계를 건너뜀')
+
+    def handle(self, *args, **options):
+        if options['genres'] < 1 or options['questions'] < options['genres']:
+            raise CommandError('장르는 1개 이상, 문제 수는 장르 수 이상이어야 합니다.')
+
+        processes = options['processes']
+        if connection.vendor == 'sqlite' and processes > 1:
+            self.stdout.write(self.style.WARNING('SQLite 는 동시 쓰기를 지원하지 않아 단일 프로세스로 실행합니다.'))
+            processes = 1
+
+        plan = self.make_plan(options)
+        started = time.perf_counter()
+
+        self.run_phase('questions', plan, options['questions'], options, processes)
+        bump_version(QUESTION_BANK)
+        refresh_question_counts(plan['genre_ids'])
+        self.run_phase('users', plan, options['users'], options, processes)
+        self.run_phase('sessions', plan, options['sessions'], options, processes)
+        self.reset_sequences()
+
+        if not options['skip_derived']:
+            self.rebuild_derived(plan)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"완료: 사용자 {options['users']}명, 문제 {options['questions']}개, 세션 {options['sessions']}개, "
+            f"결과 {options['sessions'] * options['results_per_session']}개 ({time.perf_counter() - started:.1f}s)"
+        ))
+
+    # 모든 프로세스가 공유할 생성 계획 (ID 범위를 미리 정해 두어 프로세스끼리 겹치지 않음)
+    def make_plan(self, options):
+        genre_ids = []
+        for i in range(options['genres']):
+            genre, _ = Genre.objects.get_or_create(genre_name=f'합성 장르 {i + 1}')
+            genre_ids.append(genre.genre_id)
+
+        def next_id(model, field):
+            return (model.objects.aggregate(m=Max(field))['m'] or 0) + 1
+
+        return {
+            'seed': options['seed'],
+            'genre_ids': genre_ids,
+            'users': options['users'],
+            'questions': options['questions'],
+            'results_per_session': options['results_per_session'],
+            'days': options['days'],
+            'activity_skew': options['activity_skew'],
+            'batch_size': options['batch_size'],
+            'password': make_password(SYNTHETIC_PASSWORD),
+            'now': timezone.now(),
+            'question_start': next_id(Question, 'question_id'),
+            'user_start': next_id(CustomUser, 'id'),
+            'session_start': next_id(QuizSession, 'id'),
+            'result_start': next_id(QuizResult, 'id'),
+        }
+
+    def run_phase(self, phase, plan, total, options, processes):
+        chunk = options['chunk_size']
+        if phase == 'sessions':
+            chunk = max(1, chunk // plan['results_per_session'])  # 결과 행 기준으로 메모리 사용량 제한
+        tasks = [(phase, plan, start, min(start + chunk, total)) for start in range(0, total, chunk)]
+        started = time.perf_counter()
+
+        if processes > 1 and len(tasks) > 1:
+            connections.close_all()  # fork 전에 연결을 닫아 자식과 공유하지 않게 함
+            with multiprocessing.get_context('fork').Pool(processes) as pool:
+                done = 0
+                for count in pool.imap_unordered(run_chunk, tasks):
+                    done += count
+                    self.stdout.write(f"  {phase}: {done}/{total}", ending='\r')
+        else:
+            done = 0
+            for task in tasks:
+                done += PHASES[phase](*task[1:])
+                self.stdout.write(f"  {phase}: {done}/{total}", ending='\r')
+
+        self.stdout.write(f"\r  {phase}: {total}개 생성 ({time.perf_counter() - started:.1f}s)")
+
+    # ID 를 직접 지정해 넣었으므로 시퀀스를 쓰는 DB(PostgreSQL 등)는 시퀀스를 맞춰줌
+    def reset_sequences(self):
+        statements = connection.ops.sequence_reset_sql(no_style(), [Question, CustomUser, QuizSession, QuizResult])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    # 문제 통계와 사용자 점수를 생성된 결과로부터 한 번에 집계
+    def rebuild_derived(self, plan):
+        started = time.perf_counter()
+
+        stats = (
+            QuizResult.objects
+            .filter(session_id__gte=plan['session_start'], user_option__isnull=False)
+            .values('question_id')
+            .annotate(total=Count('id'), correct=Sum(Case(When(is_correct=True, then=1), default=0, output_field=IntegerField())))
+        )
+        existing = QuestionStat.objects.in_bulk(field_name='question_id')
+        new_stats, changed = [], []
+        for row in stats.iterator():
+            stat = existing.get(row['question_id'])
+            if stat is None:
+                new_stats.append(QuestionStat(question_id=row['question_id'], total_attempts=row['total'], correct_attempts=row['correct']))
+            else:
+                stat.total_attempts += row['total']
+                stat.correct_attempts += row['correct']
+                changed.append(stat)
+        QuestionStat.objects.bulk_create(new_stats, batch_size=plan['batch_size'])
+        QuestionStat.objects.bulk_update(changed, ['total_attempts', 'correct_attempts'], batch_size=plan['batch_size'])
+
+        scores = (
+            QuizSession.objects
+            .filter(id__gte=plan['session_start'])
+            .values('user_id')
+            .annotate(
+                total=Sum('total_score'),
+                solve=Max('total_score', filter=Q(quiz_type__in=['test25', 'test50'])),
+                speed=Max('total_score', filter=Q(quiz_type='speed')),
+            )
+        )
+        users = []
+        for row in scores.iterator():
+            user = CustomUser(id=row['user_id'], score=float(row['total'] or 0), solve_score=row['solve'] or 0)
+            # 스피드 기록은 1분/3분에 번갈아 배정
+            if row['user_id'] % 2:
+                user.speed_score_1min, user.speed_score_3min = row['speed'] or 0, 0
+            else:
+                user.speed_score_1min, user.speed_score_3min = 0, row['speed'] or 0
+            users.append(user)
+        CustomUser.objects.bulk_update(
+            users, ['score', 'solve_score', 'speed_score_1min', 'speed_score_3min'], batch_size=plan['batch_size'],
+        )
+
+        self.stdout.write(f"  통계/점수 집계 ({time.perf_counter() - started:.1f}s)")
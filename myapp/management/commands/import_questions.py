@@ -1,24 +1,32 @@
 import json
 from django.core.management.base import BaseCommand
-from myapp.models import Question, Genre
+from myapp.models import Question, Genre, resolve_correct_option
+from myapp.dedup import DEFAULT_THRESHOLD, SignatureTable, find_duplicates, fingerprint_text, load_question_signatures
+from myapp.genres import refresh_question_counts
+from myapp.versioning import QUESTION_BANK, bump_version
 
 class Command(BaseCommand):
     help = 'JSON 파일에서 상식 문제를 가져와 DB에 저장합니다.'
 
     def add_arguments(self, parser):
         parser.add_argument('json_path', type=str, help='JSON 파일 경로')
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 삽입할 문제 수')
+        parser.add_argument('--dedup-threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help='유사 문제로 판정할 유사도 (0~1, 정규화한 문제+정답의 3-gram 자카드 유사도 추정치)')
+        parser.add_argument('--keep-duplicates', action='store_true', help='유사 문제도 경고만 하고 삽입')
+        parser.add_argument('--skip-dedup', action='store_true', help='유사 문제 검사 생략')
 
     def handle(self, *args, **options):
         path = options['json_path']
         inserted_count = 0
         skipped_count = 0
+        genre_ids = set(Genre.objects.values_list('genre_id', flat=True))
+        questions = []
 
         with open(path, encoding='utf-8') as jsonfile:
             data = json.load(jsonfile)
             for row in data:
-                try:
-                    genre = Genre.objects.get(genre_id=row['genre_id'])
-                except Genre.DoesNotExist:
+                if row['genre_id'] not in genre_ids:
                     self.stdout.write(
                         self.style.WARNING(
                             f"[SKIP] genre_id {row['genre_id']}를 찾을 수 없습니다. 문제: '{row['question_text'][:30]}...'"
@@ -27,18 +35,68 @@ class Command(BaseCommand):
                     skipped_count += 1
                     continue
 
+                # 정답 보기 번호 계산 (정답이 보기 중에 없으면 건너뜀)
+                option_texts = (row['option1'], row['option2'], row['option3'], row['option4'])
+                correct_option = resolve_correct_option(option_texts, row['answer'])
+                if correct_option is None:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"[SKIP] 정답 '{row['answer']}'이(가) 보기 중에 없습니다. 문제: '{row['question_text'][:30]}...'"
+                        )
+                    )
+                    skipped_count += 1
+                    continue
+
                 # 새 질문 삽입
-                Question.objects.create(
-                    genre=genre,
+                questions.append(Question(
+                    genre_id=row['genre_id'],
                     question_text=row['question_text'],
                     option1=row['option1'],
                     option2=row['option2'],
                     option3=row['option3'],
                     option4=row['option4'],
                     answer=row['answer'],
+                    correct_option=correct_option,
                     explanation=row['explanation'],
-                )
+                ))
                 inserted_count += 1
 
+        if questions and not options['skip_dedup']:
+            duplicates = self.find_duplicates(questions, options['dedup_threshold'])
+            if not options['keep_duplicates']:
+                questions = [question for index, question in enumerate(questions) if index not in duplicates]
+                inserted_count -= len(duplicates)
+                skipped_count += len(duplicates)
+
+        Question.objects.bulk_create(questions, batch_size=options['batch_size'])
+
+        # bulk_create 는 시그널을 보내지 않으므로 문제은행 버전과 장르별 문제 수를 직접 갱신
+        if questions:
+            bump_version(QUESTION_BANK)
+            refresh_question_counts({question.genre_id for question in questions})
+
         self.stdout.write(self.style.SUCCESS(
-            f"{inserted_count}개 문제를 성공적으로 삽입했습니다. (건너뛴 항목: {skipped_count}개)"))
\ No newline at end of file
+            f"{inserted_count}개 문제를 성공적으로 삽입했습니다. (건너뛴 항목: {skipped_count}개)"))
+
+    # 기존 문제은행 + 이번 파일에서 앞에 나온 문제와 유사한 새 문제 → {새 문제 인덱스: (비슷한 문제, 유사도)}
+    def find_duplicates(self, questions, threshold):
+        table = load_question_signatures(SignatureTable())
+        new_start = len(table)
+        for index, question in enumerate(questions):
+            table.add(('new', index), fingerprint_text(question.question_text, question.answer))
+
+        duplicates = {}
+        for i, j, score in find_duplicates(table, threshold):
+            if j < new_start or j - new_start in duplicates:
+                continue
+            duplicates[j - new_start] = (table.keys[i], score)
+
+        for index, (match, score) in sorted(duplicates.items()):
+            if isinstance(match, tuple):
+                match = f"이 파일의 '{questions[match[1]].question_text[:30]}...'"
+            else:
+                match = f"question_id {match}"
+            self.stdout.write(self.style.WARNING(
+                f"[DUP] '{questions[index].question_text[:30]}...' ≈ {match} (유사도 {score:.2f})"
+            ))
+        return duplicates
@@ -0,0 +1,119 @@
+import json
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.genres import refresh_question_counts
+from myapp.loadtest import LOADTEST_PASSWORD, SCENARIOS, LoadTest, loadtest_email
+from myapp.models import CustomUser, Genre, Question, UserInterest
+from myapp.versioning import QUESTION_BANK, bump_version
+
+
+class Command(BaseCommand):
+    help = (
+        '로그인 → 덱 → 제출 → 랭킹 → 최근 결과 흐름으로 부하 테스트를 실행하고 엔드포인트별 지연시간을 기록합니다. '
+        'WSGI/ASGI 비교: 각 서버에 --scenario reads --base-url 로 실행하고 --output/--compare 로 비교. '
+        'SQLite 에서 프로세스 안으로 실행하면 쓰기(제출)가 스레드 사이에 한 줄로 처리되므로 '
+        '동시 사용자 수를 늘려도 제출 처리량은 늘지 않음 (동시성 측정은 MySQL 또는 --base-url 로)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='동시 가상 사용자 수 (SQLite 프로세스 안 실행은 쓰기가 직렬화됨)')
+        parser.add_argument('--iterations', type=int, default=10, help='사용자당 흐름 반복 횟수')
+        parser.add_argument('--genre-id', type=int, help='덱/제출에 사용할 장르 ID (없으면 부하 테스트용 장르 사용)')
+        parser.add_argument('--base-url', type=str, help='실행 중인 서버 주소 (없으면 프로세스 안에서 요청)')
+        parser.add_argument('--scenario', choices=SCENARIOS, default='app', help='app: 전체 흐름, reads: 조회 API 만')
+        parser.add_argument('--think-time', type=float, default=0.0, help='요청 사이 대기 시간 (초)')
+        parser.add_argument('--seed', type=int, help='답안 선택 난수 시드')
+        parser.add_argument('--setup', action='store_true', help='부하 테스트용 사용자/장르/문제를 먼저 생성')
+        parser.add_argument('--output', type=str, help='결과(baseline)를 저장할 JSON 파일 경로')
+        parser.add_argument('--compare', type=str, help='비교할 이전 baseline JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        if options['setup']:
+            self.setup(options['users'])
+
+        genre_id = options['genre_id'] or Genre.objects.filter(genre_name='__loadtest__').values_list('genre_id', flat=True).first()
+        if genre_id is None:
+            raise CommandError('--genre-id 를 지정하거나 --setup 으로 부하 테스트용 데이터를 먼저 만들어주세요.')
+
+        report = LoadTest(
+            users=options['users'],
+            iterations=options['iterations'],
+            genre_id=genre_id,
+            base_url=options['base_url'],
+            think_time=options['think_time'],
+            seed=options['seed'],
+            scenario=options['scenario'],
+        ).run()
+
+        self.print_report(report)
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                self.print_comparison(json.load(f), report)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"baseline 저장: {options['output']}"))
+
+    # 부하 테스트용 사용자/장르/문제 생성 (이미 있으면 재사용)
+    def setup(self, users):
+        genre, _ = Genre.objects.get_or_create(genre_name='__loadtest__')
+        if not Question.objects.filter(genre=genre).exists():
+            Question.objects.bulk_create([
+                Question(
+                    genre=genre, question_text=f'부하 테스트 문제 {i}', option1='하나', option2='둘',
+                    option3='셋', option4='넷', answer='둘', correct_option=2, explanation=f'부하 테스트 해설 {i}',
+                )
+                for i in range(200)
+            ])
+            bump_version(QUESTION_BANK)
+            refresh_question_counts([genre.genre_id])
+
+        password = make_password(LOADTEST_PASSWORD)
+        existing = set(CustomUser.objects.filter(email__startswith='loadtest_').values_list('email', flat=True))
+        CustomUser.objects.bulk_create([
+            CustomUser(username=f'loadtest_{n}', email=loadtest_email(n), password=password)
+            for n in range(users)
+            if loadtest_email(n) not in existing
+        ])
+        # 관심 장르: 부하 테스트 장르 (이미 있는 사용자는 유지)
+        user_ids = CustomUser.objects.filter(email__startswith='loadtest_', interests__isnull=True).values_list('id', flat=True)
+        UserInterest.objects.bulk_create([UserInterest(user_id=user_id, genre=genre, slot=1) for user_id in user_ids])
+        self.stdout.write(self.style.SUCCESS(f"부하 테스트 데이터 준비 완료 (장르 ID {genre.genre_id}, 사용자 {users}명)"))
+
+    def print_report(self, report):
+        meta = report['meta']
+        self.stdout.write(
+            f"[{meta['transport']}] 사용자 {meta['users']}명 x {meta['iterations']}회, "
+            f"{meta['total_requests']}건 / {meta['wall_time_s']:.2f}s = {meta['throughput_rps']:.1f} req/s"
+        )
+        self.stdout.write(f"{'endpoint':22s} {'req':>6s} {'err':>5s} {'p50':>9s} {'p95':>9s} {'p99':>9s} {'rps':>8s} {'q/req':>7s}")
+        for name, row in report['endpoints'].items():
+            queries = f"{row['queries_per_request']:.1f}" if row['queries_per_request'] is not None else '-'
+            self.stdout.write(
+                f"{name:22s} {row['requests']:6d} {row['errors']:5d} {row['p50_ms']:7.1f}ms "
+                f"{row['p95_ms']:7.1f}ms {row['p99_ms']:7.1f}ms {row['throughput_rps']:8.1f} {queries:>7s}"
+            )
+
+    def print_comparison(self, baseline, report):
+        self.stdout.write('\nbaseline 대비 변화 (p95, 쿼리 수)')
+        old_meta, meta = baseline.get('meta', {}), report['meta']
+        if old_meta.get('throughput_rps') and meta['throughput_rps']:
+            self.stdout.write(
+                f"{'throughput':22s} {old_meta['throughput_rps']:.1f} → {meta['throughput_rps']:.1f} req/s "
+                f"({(meta['throughput_rps'] / old_meta['throughput_rps'] - 1) * 100:+.1f}%)"
+            )
+        for name, row in report['endpoints'].items():
+            old = baseline.get('endpoints', {}).get(name)
+            if not old:
+                self.stdout.write(f"{name:22s} (baseline 없음)")
+                continue
+            change = (row['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100 if old['p95_ms'] else 0.0
+            queries = ''
+            if row['queries_per_request'] is not None and old.get('queries_per_request') is not None:
+                queries = f"  q/req {old['queries_per_request']:.1f} → {row['queries_per_request']:.1f}"
+            style = self.style.ERROR if change > 10 else self.style.SUCCESS
+            self.stdout.write(style(f"{name:22s} p95 {old['p95_ms']:.1f}ms → {row['p95_ms']:.1f}ms ({change:+.1f}%){queries}"))
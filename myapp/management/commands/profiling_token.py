@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.models import CustomUser
+from myapp.profiling import make_profiling_token
+
+
+class Command(BaseCommand):
+    help = '스태프 계정용 요청 프로파일링 토큰을 발급합니다. (X-Profile-Token 헤더 또는 ?_profile= 로 사용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('email', type=str, help='스태프 계정 이메일')
+
+    def handle(self, *args, **options):
+        try:
+            user = CustomUser.objects.get(email=options['email'])
+        except CustomUser.DoesNotExist:
+            raise CommandError('해당 이메일의 사용자가 없습니다.')
+        if not user.is_staff:
+            raise CommandError('스태프 계정만 프로파일링 토큰을 발급받을 수 있습니다.')
+
+        self.stdout.write(make_profiling_token(user))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from myapp.search import missing_search_triggers, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        '문제 전문 검색 인덱스를 다시 만듭니다. SQLite 는 트리거를 다시 만들고 FTS 테이블을 원본에서 재구축하고, '
+        'MySQL FULLTEXT 인덱스는 DB 가 유지하므로 할 일이 없습니다. (migrate 후에는 빠진 트리거를 자동으로 복구)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='대상 DB 별칭')
+        parser.add_argument('--check', action='store_true', help='재구축하지 않고 트리거가 빠졌는지만 확인 (빠졌으면 실패)')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        missing = missing_search_triggers(connection)
+        if missing is None:
+            raise CommandError('전문 검색 테이블이 없습니다. migrate 를 먼저 실행하세요.')
+        if options['check']:
+            if missing:
+                raise CommandError(f"빠진 전문 검색 트리거: {', '.join(missing)} (--check 없이 실행하면 복구)")
+            self.stdout.write(self.style.SUCCESS('전문 검색 트리거 정상'))
+            return
+
+        if rebuild_search_index(connection):
+            self.stdout.write(self.style.SUCCESS(f'{connection.vendor} 전문 검색 인덱스 재구축 완료'))
+        else:
+            self.stdout.write(f'{connection.vendor} 는 재구축할 전문 검색 인덱스가 없습니다.')
@@ -0,0 +1,40 @@
+import os
+import signal
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from myapp.jobs import work_once
+
+
+class Command(BaseCommand):
+    help = '백그라운드 작업 큐 워커를 실행합니다. (SIGTERM/SIGINT 를 받으면 처리 중인 묶음을 끝내고 종료)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=20, help='한 번에 가져올 작업 수')
+        parser.add_argument('--sleep', type=float, default=1.0, help='큐가 비었을 때 대기 시간 (초)')
+        parser.add_argument('--once', action='store_true', help='대기 중인 작업을 모두 처리하고 종료')
+
+    def handle(self, *args, **options):
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        self.stdout.write(f'작업 워커 시작 ({worker_id})')
+        processed = 0
+        while not self.stopping:
+            close_old_connections()
+            count = work_once(worker_id, options['batch_size'])
+            processed += count
+            if not count:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f'작업 워커 종료 (처리 {processed}건)'))
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,348 @@
+"""
+프로세스 내 메트릭 레지스트리 (Prometheus text format 으로 /metrics 에 노출)
+
+gunicorn 처럼 워커가 여러 개일 때는 settings.METRICS_DIR 을 지정한다.
+각 워커가 자기 값을 METRICS_DIR/metrics-<pid>.json 에 주기적으로 기록하고,
+/metrics 요청을 받은 워커가 디렉터리의 모든 파일을 합산해서 응답한다.
+워커가 처음 기록할 때 죽은 워커의 파일(같은 pid 를 물려받은 이전 워커의 파일 포함)은
+카운터/히스토그램만 metrics-archive.json 에 합치고 지운다 (재시작해도 누적 값이 줄거나 덮어써지지 않음).
+(배포 시 gunicorn 시작 전에 METRICS_DIR 을 비워줄 것)
+"""
+import atexit
+import fcntl
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _labels_key(labels):
+    return json.dumps(sorted(labels.items()), ensure_ascii=False)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.samples = {}
+        registry.register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 라벨은 {self.labelnames} 이어야 합니다. (받은 값: {tuple(labels)})")
+        return _labels_key(labels)
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.samples[key] = self.samples.get(key, 0) + amount
+        self.registry.changed()
+
+
+# 게이지는 살아 있는 프로세스 값만 합산
+class Gauge(Metric):
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.samples[key] = value
+        self.registry.changed()
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.samples[key] = self.samples.get(key, 0) + amount
+        self.registry.changed()
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(registry, name, documentation, labelnames)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            sample = self.samples.get(key)
+            if sample is None:
+                sample = self.samples[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    sample['buckets'][i] += 1
+                    break
+            sample['sum'] += value
+            sample['count'] += 1
+        self.registry.changed()
+
+
+ARCHIVE_FILENAME = 'metrics-archive.json'
+
+
+# 파일별 메트릭을 merged 에 합산 (게이지는 include_gauges 일 때만)
+def _merge_metrics(merged, metrics, include_gauges=True):
+    for name, metric in metrics.items():
+        if metric['type'] == 'gauge' and not include_gauges:
+            continue
+        target = merged.setdefault(name, {**metric, 'samples': {}})
+        for key, value in metric['samples'].items():
+            current = target['samples'].get(key)
+            if metric['type'] == 'histogram':
+                if current is None:
+                    target['samples'][key] = dict(value, buckets=list(value['buckets']))
+                else:
+                    current['buckets'] = [a + b for a, b in zip(current['buckets'], value['buckets'])]
+                    current['sum'] += value['sum']
+                    current['count'] += value['count']
+            else:
+                target['samples'][key] = (current or 0) + value
+    return merged
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.metrics = {}
+        self._flushed_at = 0.0
+        self._dirty = False
+        self._started_pid = None  # 이 pid 로 죽은 워커 파일 정리를 마쳤는지 (fork 된 워커는 다시 정리)
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return Counter(self, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return Gauge(self, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        return Histogram(self, name, documentation, labelnames, buckets)
+
+    @property
+    def directory(self):
+        return getattr(settings, 'METRICS_DIR', None)
+
+    # 값이 바뀌면 METRICS_FLUSH_SECONDS 마다 최대 한 번 파일에 기록
+    def changed(self):
+        self._dirty = True
+        if self.directory and time.monotonic() - self._flushed_at >= getattr(settings, 'METRICS_FLUSH_SECONDS', 5):
+            self.flush()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: {
+                    'type': metric.type,
+                    'help': metric.documentation,
+                    'buckets': list(getattr(metric, 'buckets', ())),
+                    'samples': json.loads(json.dumps(metric.samples)),
+                }
+                for name, metric in self.metrics.items()
+            }
+
+    # METRICS_DIR 잠금 (정리는 배타, 합산은 공유 → 정리 도중의 파일을 두 번 세지 않음)
+    @contextmanager
+    def _directory_lock(self, exclusive):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _worker_files(self):
+        for filename in sorted(os.listdir(self.directory)):
+            if filename.startswith('metrics-') and filename.endswith('.json') and filename != ARCHIVE_FILENAME:
+                yield os.path.join(self.directory, filename)
+
+    # 워커 시작 시: 죽은 워커와 내 pid 로 남아 있는 (이전 워커의) 파일을 보관 파일에 합치고 삭제
+    def archive_dead_workers(self):
+        pid = os.getpid()
+        with self._directory_lock(exclusive=True):
+            archive_path = os.path.join(self.directory, ARCHIVE_FILENAME)
+            archive = (_read_json(archive_path) or {}).get('metrics', {})
+            dead = []
+            for path in self._worker_files():
+                data = _read_json(path)
+                if data is None:
+                    continue
+                if data.get('pid') == pid or not _pid_alive(data.get('pid')):
+                    _merge_metrics(archive, data['metrics'], include_gauges=False)
+                    dead.append(path)
+            if dead:
+                _write_json(archive_path, {'pid': None, 'metrics': archive})
+                for path in dead:
+                    os.remove(path)
+        self._started_pid = pid
+
+    def flush(self):
+        directory = self.directory
+        if not directory or not self._dirty:
+            return
+        with self._flush_lock:
+            if self._started_pid != os.getpid():
+                self.archive_dead_workers()
+            self._dirty = False
+            self._flushed_at = time.monotonic()
+            _write_json(os.path.join(directory, f'metrics-{os.getpid()}.json'), {'pid': os.getpid(), 'metrics': self.snapshot()})
+
+    # 모든 워커의 값을 합산 (METRICS_DIR 이 없으면 현재 프로세스 값만)
+    def collect(self):
+        if not self.directory:
+            return self.snapshot()
+
+        self.flush()
+        merged = {}
+        with self._directory_lock(exclusive=False):
+            archive = _read_json(os.path.join(self.directory, ARCHIVE_FILENAME))
+            if archive is not None:
+                _merge_metrics(merged, archive['metrics'], include_gauges=False)
+            for path in self._worker_files():
+                data = _read_json(path)
+                if data is not None:
+                    _merge_metrics(merged, data['metrics'], include_gauges=_pid_alive(data.get('pid')))
+
+        # 아직 아무 값도 기록되지 않은 메트릭도 HELP/TYPE 은 노출
+        for name, metric in self.snapshot().items():
+            merged.setdefault(name, {**metric, 'samples': {}})
+        return merged
+
+    def render(self):
+        lines = []
+        for name, metric in sorted(self.collect().items()):
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            for key, value in sorted(metric['samples'].items()):
+                labels = [tuple(pair) for pair in json.loads(key)]
+                if metric['type'] == 'histogram':
+                    cumulative = 0
+                    for bound, count in zip(metric['buckets'], value['buckets']):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels + [('le', _format_value(bound))])} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels + [('le', '+Inf')])} {value['count']}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value['sum'])}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {value['count']}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _pid_alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except (OSError, TypeError):
+        return False
+    return True
+
+
+registry = Registry()
+atexit.register(registry.flush)
+
+http_requests_total = registry.counter(
+    'http_requests_total', 'HTTP 요청 수', ['view', 'method', 'status'],
+)
+http_request_duration_seconds = registry.histogram(
+    'http_request_duration_seconds', 'HTTP 요청 처리 시간 (초)', ['view'],
+)
+db_queries_per_request = registry.histogram(
+    'db_queries_per_request', '요청당 SQL 쿼리 수', ['view'], buckets=DEFAULT_QUERY_BUCKETS,
+)
+cache_requests_total = registry.counter(
+    'cache_requests_total', '캐시/인메모리 인덱스 조회 수 (hit/miss)', ['cache', 'result'],
+)
+
+db_connections_opened_total = registry.counter(
+    'db_connections_opened_total', '새로 연 DB 커넥션 수 (지속 커넥션/풀이 동작하면 거의 늘지 않음)', ['alias'],
+)
+db_pool_connections = registry.gauge(
+    'db_pool_connections', 'DB 커넥션 풀 커넥션 수', ['alias', 'state'],
+)
+db_pool_wait_seconds = registry.histogram(
+    'db_pool_wait_seconds', 'DB 커넥션 풀에서 커넥션을 얻기까지 걸린 시간 (초)', ['alias'],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+db_pool_timeouts_total = registry.counter(
+    'db_pool_timeouts_total', 'DB 커넥션 풀 대기 시간 초과 수', ['alias'],
+)
+
+jobs_total = registry.counter(
+    'jobs_total', '처리한 백그라운드 작업 수', ['job', 'result'],
+)
+job_duration_seconds = registry.histogram(
+    'job_duration_seconds', '백그라운드 작업 처리 시간 (초)', ['job'],
+)
+
+
+# URL 이름 기준으로 집계 (매칭되지 않은 경로는 하나로 묶어 라벨 수가 늘지 않게 함)
+def view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.url_name or match.view_name or 'unnamed'
+
+
+def observe_request(request, response, duration, query_count):
+    view = view_label(request)
+    http_requests_total.inc(view=view, method=request.method, status=str(response.status_code))
+    http_request_duration_seconds.observe(duration, view=view)
+    db_queries_per_request.observe(query_count, view=view)
+
+
+def record_cache(cache, hit):
+    cache_requests_total.inc(cache=cache, result='hit' if hit else 'miss')
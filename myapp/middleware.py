@@ -0,0 +1,96 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .instrumentation import QueryCounter, SerializeTimer
+from .metrics import observe_request
+
+performance_logger = logging.getLogger('myapp.performance')
+
+
+# 요청별 SQL 수/시간, 직렬화 시간(DRF serializer .data + 응답 JSON 렌더링), 전체 시간 측정
+# - settings.SERVER_TIMING_HEADER 가 켜져 있거나 스태프 요청이면 Server-Timing 헤더로 내려줌
+#   (브라우저 개발자도구, loadtest --base-url 에서 확인 가능, 기본은 꺼짐 - 내부 처리 시간을 외부에 노출하지 않음)
+# - 쿼리 수/응답 시간 예산을 넘는 요청은 myapp.performance 로거에 경고 기록
+# - URL 이름별 요청 수/지연시간/쿼리 수를 메트릭 레지스트리에 기록 (/metrics)
+# - DEBUG 의 connection.queries 를 쓰지 않으므로 오래 떠 있는 워커에서도 메모리가 늘지 않음
+# - WSGI/ASGI 모두 지원 (ASGI 에서 async 뷰가 스레드로 밀려나지 않도록)
+class RequestTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        counter = QueryCounter()
+        serialize_timer = SerializeTimer()
+        request._render_time = 0.0
+        started = time.perf_counter()
+
+        with counter.track(), serialize_timer.track():
+            response = self.get_response(request)
+
+        return self.finish(request, response, counter, serialize_timer, started)
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        serialize_timer = SerializeTimer()
+        request._render_time = 0.0
+        started = time.perf_counter()
+
+        with counter.track(), serialize_timer.track():
+            response = await self.get_response(request)
+
+        return self.finish(request, response, counter, serialize_timer, started)
+
+    def finish(self, request, response, counter, serialize_timer, started):
+        total = time.perf_counter() - started
+        db_time = counter.duration
+        render_time = request._render_time + serialize_timer.duration
+        app_time = max(total - db_time - render_time, 0.0)
+
+        if self.show_server_timing(request):
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={db_time * 1000:.1f};desc="{counter.count} queries"',
+                f'serialize;dur={render_time * 1000:.1f}',
+                f'app;dur={app_time * 1000:.1f}',
+                f'total;dur={total * 1000:.1f}',
+            ])
+
+        query_budget = getattr(settings, 'REQUEST_QUERY_BUDGET', 50)
+        time_budget_ms = getattr(settings, 'REQUEST_TIME_BUDGET_MS', 500)
+        if counter.count > query_budget or total * 1000 > time_budget_ms:
+            performance_logger.warning(
+                "느린 요청 %s %s → %s: 전체 %.1fms, DB %.1fms (%d queries), 직렬화 %.1fms",
+                request.method, request.path, response.status_code,
+                total * 1000, db_time * 1000, counter.count, render_time * 1000,
+            )
+
+        observe_request(request, response, total, counter.count)
+        request.query_count = counter.count
+        return response
+
+    @staticmethod
+    def show_server_timing(request):
+        if getattr(settings, 'SERVER_TIMING_HEADER', False):
+            return True
+        user = getattr(request, 'user', None)  # DRF/async 뷰의 JWT 인증 결과도 여기에 설정됨
+        return bool(user is not None and getattr(user, 'is_staff', False))
+
+    # DRF Response 등 렌더링 전 응답: 렌더링(JSON 직렬화)에 걸린 시간 측정
+    def process_template_response(self, request, response):
+        render_started = time.perf_counter()
+
+        def finish_render(rendered):
+            request._render_time += time.perf_counter() - render_started
+
+        response.add_post_render_callback(finish_render)
+        return response
@@ -0,0 +1,55 @@
+# Generated by Django 5.2 on 2026-10-20 00:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_wrong_answers(apps, schema_editor):
+    # 기존 퀴즈 기록에서 문제별 마지막 채점 결과가 오답인 것만 오답 노트에 채운다
+    QuizResult = apps.get_model('myapp', 'QuizResult')
+    WrongAnswer = apps.get_model('myapp', 'WrongAnswer')
+
+    latest = {}
+    rows = (
+        QuizResult.objects
+        .filter(session__isnull=False)
+        .order_by('submission_time', 'id')
+        .values_list('session__user_id', 'question_id', 'is_correct')
+    )
+    for user_id, question_id, is_correct in rows.iterator():
+        latest[(user_id, question_id)] = is_correct
+
+    WrongAnswer.objects.bulk_create(
+        [
+            WrongAnswer(user_id=user_id, question_id=question_id)
+            for (user_id, question_id), is_correct in latest.items()
+            if not is_correct
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0015_alter_questionstat_correct_attempts_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WrongAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='wrong_answers', to='myapp.question')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='wrong_answers', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-updated_at'], name='wrong_answer_user_recent')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'question'), name='uniq_wrong_answer_user_question')],
+            },
+        ),
+        migrations.RunPython(backfill_wrong_answers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2 on 2026-10-20 00:54
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def backfill_correct_option(apps, schema_editor):
+    # 기존 문제의 정답 보기 번호 계산 (정답이 보기와 일치하지 않으면 NULL 유지)
+    Question = apps.get_model('myapp', 'Question')
+
+    def normalize(text):
+        return str(text).strip().lower()
+
+    batch = []
+    for question in Question.objects.only('option1', 'option2', 'option3', 'option4', 'answer').iterator():
+        options = [question.option1, question.option2, question.option3, question.option4]
+        answer = normalize(question.answer)
+        for number, option in enumerate(options, start=1):
+            if normalize(option) == answer:
+                question.correct_option = number
+                batch.append(question)
+                break
+
+        if len(batch) >= 1000:
+            Question.objects.bulk_update(batch, ['correct_option'])
+            batch = []
+
+    Question.objects.bulk_update(batch, ['correct_option'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0017_dataversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='correct_option',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(4)]),
+        ),
+        migrations.AddField(
+            model_name='quizresult',
+            name='user_option',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='quizresult',
+            name='correct_answer',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='quizresult',
+            name='user_answer',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.RunPython(backfill_correct_option, migrations.RunPython.noop),
+    ]
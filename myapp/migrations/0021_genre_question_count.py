@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-20 01:26
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_question_count(apps, schema_editor):
+    # 기존 장르의 문제 수 계산
+    Genre = apps.get_model('myapp', 'Genre')
+    Question = apps.get_model('myapp', 'Question')
+
+    counts = dict(
+        Question.objects.filter(genre__isnull=False).order_by().values_list('genre').annotate(count=Count('pk'))
+    )
+    for genre_id, count in counts.items():
+        Genre.objects.filter(genre_id=genre_id).update(question_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0020_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='genre',
+            name='question_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_question_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2 on 2026-10-20 01:29
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_user_interests(apps, schema_editor):
+    # interest_1~3 (문자열 장르 ID) → UserInterest 슬롯 1~3 (숫자가 아니거나 없는 장르는 버림)
+    CustomUser = apps.get_model('myapp', 'CustomUser')
+    Genre = apps.get_model('myapp', 'Genre')
+    UserInterest = apps.get_model('myapp', 'UserInterest')
+
+    genre_ids = set(Genre.objects.values_list('genre_id', flat=True))
+    rows = []
+    users = CustomUser.objects.values_list('id', 'interest_1', 'interest_2', 'interest_3').order_by('id')
+    for user_id, *interests in users.iterator(chunk_size=BATCH_SIZE):
+        for slot, value in enumerate(interests, start=1):
+            value = (value or '').strip()
+            if value.isdigit() and int(value) in genre_ids:
+                rows.append(UserInterest(user_id=user_id, genre_id=int(value), slot=slot))
+        if len(rows) >= BATCH_SIZE:
+            UserInterest.objects.bulk_create(rows)
+            rows = []
+    UserInterest.objects.bulk_create(rows)
+
+
+def restore_interest_columns(apps, schema_editor):
+    CustomUser = apps.get_model('myapp', 'CustomUser')
+    UserInterest = apps.get_model('myapp', 'UserInterest')
+
+    for interest in UserInterest.objects.order_by('user_id', 'slot').iterator(chunk_size=BATCH_SIZE):
+        CustomUser.objects.filter(pk=interest.user_id).update(**{f'interest_{interest.slot}': str(interest.genre_id)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0021_genre_question_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserInterest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slot', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(3)])),
+                ('genre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interested_users', to='myapp.genre')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interests', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['genre', 'user'], name='user_interest_genre_user')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'slot'), name='uniq_user_interest_slot')],
+            },
+        ),
+        migrations.RunPython(backfill_user_interests, restore_interest_columns),
+        migrations.RemoveField(
+            model_name='customuser',
+            name='interest_1',
+        ),
+        migrations.RemoveField(
+            model_name='customuser',
+            name='interest_2',
+        ),
+        migrations.RemoveField(
+            model_name='customuser',
+            name='interest_3',
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations
+
+# 문제/해설 전문 검색 인덱스 (myapp/search.py)
+# Django 모델로 표현할 수 없어서 DB 별 SQL 로 만든다 (그 외 DB 는 건너뜀)
+
+MYSQL_FORWARD = [
+    "ALTER TABLE myapp_question ADD FULLTEXT INDEX question_fulltext (question_text, explanation) WITH PARSER ngram",
+]
+MYSQL_BACKWARD = [
+    "ALTER TABLE myapp_question DROP INDEX question_fulltext",
+]
+
+# 외부 콘텐츠 FTS5 테이블 + 트리거 (원본 테이블이 바뀌면 자동 반영, bulk INSERT 포함)
+SQLITE_FORWARD = [
+    """CREATE VIRTUAL TABLE myapp_question_fts USING fts5(
+        question_text, explanation, content='myapp_question', content_rowid='question_id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER myapp_question_fts_ai AFTER INSERT ON myapp_question BEGIN
+        INSERT INTO myapp_question_fts(rowid, question_text, explanation)
+        VALUES (new.question_id, new.question_text, new.explanation);
+    END""",
+    """CREATE TRIGGER myapp_question_fts_ad AFTER DELETE ON myapp_question BEGIN
+        INSERT INTO myapp_question_fts(myapp_question_fts, rowid, question_text, explanation)
+        VALUES ('delete', old.question_id, old.question_text, old.explanation);
+    END""",
+    """CREATE TRIGGER myapp_question_fts_au AFTER UPDATE OF question_text, explanation ON myapp_question BEGIN
+        INSERT INTO myapp_question_fts(myapp_question_fts, rowid, question_text, explanation)
+        VALUES ('delete', old.question_id, old.question_text, old.explanation);
+        INSERT INTO myapp_question_fts(rowid, question_text, explanation)
+        VALUES (new.question_id, new.question_text, new.explanation);
+    END""",
+    "INSERT INTO myapp_question_fts(myapp_question_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS myapp_question_fts_au",
+    "DROP TRIGGER IF EXISTS myapp_question_fts_ad",
+    "DROP TRIGGER IF EXISTS myapp_question_fts_ai",
+    "DROP TABLE IF EXISTS myapp_question_fts",
+]
+
+
+def run_statements(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0022_userinterest'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_statements({'mysql': MYSQL_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            run_statements({'mysql': MYSQL_BACKWARD, 'sqlite': SQLITE_BACKWARD}),
+        ),
+    ]
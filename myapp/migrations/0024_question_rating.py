@@ -0,0 +1,73 @@
+# Generated by Django 5.2 on 2026-10-20 01:38
+
+import math
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def seed_question_ratings(apps, schema_editor):
+    # 기존 정답률로 초기 난이도 추정 (평균 사용자 1500 이 맞힐 확률 = 정답률, 풀이 기록이 적으면 1500 근처)
+    Question = apps.get_model('myapp', 'Question')
+    QuestionStat = apps.get_model('myapp', 'QuestionStat')
+
+    batch = []
+    stats = QuestionStat.objects.filter(total_attempts__gt=0).values_list('question_id', 'total_attempts', 'correct_attempts')
+    for question_id, total, correct in stats.iterator(chunk_size=BATCH_SIZE):
+        rating = 1500.0 + 400.0 * math.log10((total - correct + 1) / (correct + 1))
+        batch.append(Question(question_id=question_id, rating=min(max(rating, 800.0), 2200.0), rating_attempts=total))
+        if len(batch) >= BATCH_SIZE:
+            Question.objects.bulk_update(batch, ['rating', 'rating_attempts'])
+            batch = []
+    Question.objects.bulk_update(batch, ['rating', 'rating_attempts'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0023_question_fulltext'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserGenreRating',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.FloatField(default=1500.0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='rating',
+            field=models.FloatField(default=1500.0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='rating_attempts',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(seed_question_ratings, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['genre', 'rating'], name='question_genre_rating'),
+        ),
+        migrations.AddField(
+            model_name='usergenrerating',
+            name='genre',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_ratings', to='myapp.genre'),
+        ),
+        migrations.AddField(
+            model_name='usergenrerating',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='genre_ratings', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='usergenrerating',
+            constraint=models.UniqueConstraint(fields=('user', 'genre'), name='uniq_user_genre_rating'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2 on 2026-10-20 01:39
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_review_states(apps, schema_editor):
+    # 현재 오답 노트의 문제는 마지막으로 틀린 다음 날 복습
+    WrongAnswer = apps.get_model('myapp', 'WrongAnswer')
+    ReviewState = apps.get_model('myapp', 'ReviewState')
+
+    batch = []
+    rows = WrongAnswer.objects.order_by('id').values_list('user_id', 'question_id', 'updated_at')
+    for user_id, question_id, updated_at in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(ReviewState(
+            user_id=user_id, question_id=question_id,
+            due_at=updated_at + timedelta(days=1), last_reviewed_at=updated_at,
+        ))
+        if len(batch) >= BATCH_SIZE:
+            ReviewState.objects.bulk_create(batch)
+            batch = []
+    ReviewState.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0024_question_rating'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('repetitions', models.PositiveIntegerField(default=0)),
+                ('interval_days', models.PositiveIntegerField(default=1)),
+                ('ease', models.FloatField(default=2.5)),
+                ('due_at', models.DateTimeField()),
+                ('last_reviewed_at', models.DateTimeField()),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_states', to='myapp.question')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_states', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'due_at'], name='review_state_user_due')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'question'), name='uniq_review_state_user_question')],
+            },
+        ),
+        migrations.RunPython(backfill_review_states, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2 on 2026-10-20 01:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0026_seenquestions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('daily', '일간'), ('weekly', '주간'), ('season', '시즌(분기)')], max_length=10)),
+                ('window_start', models.DateField()),
+                ('score', models.FloatField(default=0.0)),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_scores', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', 'window_start', '-score', 'user'], name='leaderboard_score_rank')],
+                'constraints': [models.UniqueConstraint(fields=('period', 'window_start', 'user'), name='uniq_leaderboard_score')],
+            },
+        ),
+        migrations.CreateModel(
+            name='LeaderboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('daily', '일간'), ('weekly', '주간'), ('season', '시즌(분기)')], max_length=10)),
+                ('window_start', models.DateField()),
+                ('rank', models.PositiveIntegerField()),
+                ('score', models.FloatField()),
+                ('rank_change', models.IntegerField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', 'window_start', 'rank'], name='leaderboard_snapshot_rank')],
+                'constraints': [models.UniqueConstraint(fields=('period', 'window_start', 'user'), name='uniq_leaderboard_snapshot')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-20 01:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0027_leaderboards'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='score',
+            field=models.FloatField(db_index=True, default=0.0),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='solve_score',
+            field=models.IntegerField(db_index=True, default=0),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='speed_score_1min',
+            field=models.IntegerField(db_index=True, default=0),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='speed_score_3min',
+            field=models.IntegerField(db_index=True, default=0),
+        ),
+    ]
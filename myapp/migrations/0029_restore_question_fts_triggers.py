@@ -0,0 +1,45 @@
+from django.db import migrations
+
+# 0024 에서 Question 에 필드를 추가하면서 SQLite 는 myapp_question 을 새로 만들었고
+# 그때 0023 의 전문 검색 트리거(myapp_question_fts_ai/_ad/_au)가 함께 지워졌다
+# → 트리거를 다시 만들고 그 사이 바뀐 문제를 반영하도록 FTS 를 재구축 (MySQL 은 할 일 없음)
+# 마이그레이션은 만들 때의 정의로 고정되어야 하므로 myapp.search 를 import 하지 않고 SQL 을 그대로 둔다
+
+SQLITE_FORWARD = [
+    "DROP TRIGGER IF EXISTS myapp_question_fts_ai",
+    """CREATE TRIGGER myapp_question_fts_ai AFTER INSERT ON myapp_question BEGIN
+        INSERT INTO myapp_question_fts(rowid, question_text, explanation)
+        VALUES (new.question_id, new.question_text, new.explanation);
+    END""",
+    "DROP TRIGGER IF EXISTS myapp_question_fts_ad",
+    """CREATE TRIGGER myapp_question_fts_ad AFTER DELETE ON myapp_question BEGIN
+        INSERT INTO myapp_question_fts(myapp_question_fts, rowid, question_text, explanation)
+        VALUES ('delete', old.question_id, old.question_text, old.explanation);
+    END""",
+    "DROP TRIGGER IF EXISTS myapp_question_fts_au",
+    """CREATE TRIGGER myapp_question_fts_au AFTER UPDATE OF question_text, explanation ON myapp_question BEGIN
+        INSERT INTO myapp_question_fts(myapp_question_fts, rowid, question_text, explanation)
+        VALUES ('delete', old.question_id, old.question_text, old.explanation);
+        INSERT INTO myapp_question_fts(rowid, question_text, explanation)
+        VALUES (new.question_id, new.question_text, new.explanation);
+    END""",
+    "INSERT INTO myapp_question_fts(myapp_question_fts) VALUES ('rebuild')",
+]
+
+
+def restore_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in SQLITE_FORWARD:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0028_ranking_score_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(restore_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-20 01:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0029_restore_question_fts_triggers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='genre',
+            name='seen_epoch',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='seenquestions',
+            name='epoch',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2 on 2026-10-20 01:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('myapp', '0030_seen_epoch'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='leaderboardscore',
+            name='leaderboard_score_rank',
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='solve_score',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='speed_score_1min',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='speed_score_3min',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['score', 'id'], name='user_score_rank'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['speed_score_1min', 'id'], name='user_speed_1min_rank'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['speed_score_3min', 'id'], name='user_speed_3min_rank'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['solve_score', 'id'], name='user_solve_score_rank'),
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardscore',
+            index=models.Index(fields=['period', 'window_start', 'score', 'user'], name='leaderboard_score_rank'),
+        ),
+    ]
@@ -1,10 +1,13 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager, Group, Permission
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.utils import timezone
 from datetime import timedelta
 
 # 사용자 관리자
 class CustomUserManager(BaseUserManager):
+    # interest_1~3: 관심 장르 ID (UserInterest 슬롯 1~3 으로 저장, 없는 장르는 무시)
     def create_user(self, username, email, password=None, interest_1=None, interest_2=None, interest_3=None, **extra_fields):
         if not email:
             raise ValueError("The Email field must be set")
@@ -12,13 +15,18 @@ class CustomUserManager(BaseUserManager):
         user = self.model(
             username=username,
             email=email,
-            interest_1=interest_1,
-            interest_2=interest_2,
-            interest_3=interest_3,
             **extra_fields
         )
         user.set_password(password)
         user.save(using=self._db)
+
+        # 장르 존재 확인은 인메모리 장르 레지스트리로 (genres.py 가 이 모듈을 import 하므로 여기서 불러옴)
+        from .genres import genre_registry
+
+        slots = parse_interest_slots([interest_1, interest_2, interest_3])
+        UserInterest.objects.using(self._db).bulk_create(build_user_interests(user.pk, {
+            slot: genre_id for slot, genre_id in slots.items() if genre_registry.name(genre_id) is not None
+        }))
         return user
 
     def create_superuser(self, username, email, password=None, **extra_fields):
@@ -30,16 +38,13 @@ class CustomUserManager(BaseUserManager):
 class CustomUser(AbstractUser):
     email = models.EmailField(unique=True)
     username = models.CharField(max_length=20, unique=True)
-    score = models.FloatField(default=0.0) 
+    # 랭킹 점수 (인덱스 (점수, id) 를 거꾸로 읽은 순서 = 랭킹 순서, myapp/rankings.py)
+    score = models.FloatField(default=0.0)
     profile_image = models.ImageField(upload_to='profiles/', null=True, blank=True)
     speed_score_1min = models.IntegerField(default=0)
     speed_score_3min = models.IntegerField(default=0)
     solve_score = models.IntegerField(default=0)
 
-    interest_1 = models.CharField(max_length=100, blank=True, null=True)
-    interest_2 = models.CharField(max_length=100, blank=True, null=True)
-    interest_3 = models.CharField(max_length=100, blank=True, null=True)
-
     groups = models.ManyToManyField(Group, related_name="customuser_groups", blank=True)
     user_permissions = models.ManyToManyField(Permission, related_name="customuser_permissions", blank=True)
 
@@ -48,6 +53,14 @@ class CustomUser(AbstractUser):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['score', 'id'], name='user_score_rank'),
+            models.Index(fields=['speed_score_1min', 'id'], name='user_speed_1min_rank'),
+            models.Index(fields=['speed_score_3min', 'id'], name='user_speed_3min_rank'),
+            models.Index(fields=['solve_score', 'id'], name='user_solve_score_rank'),
+        ]
+
     def __str__(self):
         return self.email
 
@@ -64,10 +77,64 @@ class CustomUser(AbstractUser):
 class Genre(models.Model):
     genre_id = models.AutoField(primary_key=True)
     genre_name = models.CharField(max_length=100, unique=True)
+    # 장르의 문제 수 (genres.refresh_question_counts 로 갱신)
+    question_count = models.PositiveIntegerField(default=0, editable=False)
+    # 푼 문제 비트맵 세대 (문제 삭제/장르 변경으로 비트 위치가 밀리면 증가 → 이전 세대 비트맵은 무시, myapp/seen.py)
+    seen_epoch = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.genre_name
-    
+
+
+# 사용자 관심 장르 (슬롯 1~3, API 의 interest_1~3)
+# 장르별 인덱스로 "장르 X 에 관심 있는 사용자" 를 바로 찾을 수 있음 (myapp/interests.py)
+class UserInterest(models.Model):
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='interests')
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE, related_name='interested_users')
+    slot = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(3)])
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'slot'], name='uniq_user_interest_slot'),
+        ]
+        indexes = [
+            models.Index(fields=['genre', 'user'], name='user_interest_genre_user'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.slot}: {self.genre_id}"
+
+
+INTEREST_SLOTS = (1, 2, 3)
+
+
+# [interest_1, interest_2, interest_3] 값 → {슬롯: 장르 ID} (숫자가 아닌 값/빈 값은 제외)
+def parse_interest_slots(values):
+    slots = {}
+    for slot, value in zip(INTEREST_SLOTS, values):
+        value = str(value).strip() if value is not None else ''
+        if value.isdigit():
+            slots[slot] = int(value)
+    return slots
+
+
+def build_user_interests(user_id, slots):
+    return [UserInterest(user_id=user_id, genre_id=genre_id, slot=slot) for slot, genre_id in sorted(slots.items())]
+
+# 채점용 보기/정답 텍스트 정규화
+def normalize_answer(text):
+    return str(text).strip().lower()
+
+
+# 보기 텍스트 중 정답과 일치하는 보기 번호 (1~4), 없으면 None
+def resolve_correct_option(options, answer):
+    normalized = normalize_answer(answer)
+    for number, option in enumerate(options, start=1):
+        if normalize_answer(option) == normalized:
+            return number
+    return None
+
+
 # 문제/상식 모델
 class Question(models.Model):
     question_id = models.AutoField(primary_key=True)
@@ -78,11 +145,40 @@ class Question(models.Model):
     option3 = models.CharField(max_length=255)
     option4 = models.CharField(max_length=255)
     answer = models.CharField(max_length=255)
+    # 정답 보기 번호 (1~4), 저장 시 answer 와 보기 텍스트로 계산
+    correct_option = models.PositiveSmallIntegerField(
+        null=True, blank=True, editable=False,
+        validators=[MinValueValidator(1), MaxValueValidator(4)],
+    )
     explanation = models.TextField()
+    # 난이도 Elo 레이팅 (myapp/ratings.py, 채점 작업이 F() 로 갱신)
+    rating = models.FloatField(default=1500.0, editable=False)
+    rating_attempts = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['genre', 'rating'], name='question_genre_rating'),
+        ]
 
     def __str__(self):
         return f"[{self.genre.genre_name}] {self.question_text[:30]}..."
 
+    @property
+    def options(self):
+        return (self.option1, self.option2, self.option3, self.option4)
+
+    def clean(self):
+        super().clean()
+        if resolve_correct_option(self.options, self.answer) is None:
+            raise ValidationError({'answer': "정답이 보기 1~4 중 하나와 일치해야 합니다."})
+
+    def save(self, *args, **kwargs):
+        self.correct_option = resolve_correct_option(self.options, self.answer)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'correct_option' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'correct_option']
+        super().save(*args, **kwargs)
+
 # 퀴즈 세션 모델
 class QuizSession(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='quiz_sessions')
@@ -102,8 +198,11 @@ class QuizSession(models.Model):
 class QuizResult(models.Model):
     session = models.ForeignKey(QuizSession, on_delete=models.CASCADE, null=True)
     question = models.ForeignKey('myapp.Question', on_delete=models.CASCADE)
-    user_answer = models.CharField(max_length=255)
-    correct_answer = models.CharField(max_length=255)
+    # 선택한 보기 번호 (1~4, 미선택이면 NULL)
+    # 예전 기록은 user_answer / correct_answer 에 텍스트가 저장되어 있고 새 기록은 비어 있음
+    user_option = models.PositiveSmallIntegerField(null=True, blank=True)
+    user_answer = models.CharField(max_length=255, blank=True, default='')
+    correct_answer = models.CharField(max_length=255, blank=True, default='')
     is_correct = models.BooleanField(db_index=True)
     score = models.IntegerField()
     submission_time = models.DateTimeField(auto_now_add=True)  # 답안 제출 시간
@@ -111,6 +210,17 @@ class QuizResult(models.Model):
     def __str__(self):
         return f"{self.session.user.username} - Q{self.question.question_id} - {'O' if self.is_correct else 'X'}"
 
+    # 선택한 보기 텍스트 (정규화된 값, 미선택이면 '')
+    @property
+    def user_answer_text(self):
+        if self.user_option:
+            return normalize_answer(self.question.options[self.user_option - 1])
+        return self.user_answer
+
+    @property
+    def correct_answer_text(self):
+        return self.correct_answer or self.question.answer
+
 # 정답률에 따른 문제 추천 모델
 class QuestionStat(models.Model):
     question = models.OneToOneField(Question, on_delete=models.CASCADE, related_name='stats')
@@ -121,4 +231,205 @@ class QuestionStat(models.Model):
     def accuracy_rate(self):
         if self.total_attempts == 0:
             return 0.0
-        return round((self.correct_attempts / self.total_attempts) * 100, 1)
\ No newline at end of file
+        return round((self.correct_attempts / self.total_attempts) * 100, 1)
+
+# 오답 노트 모델 (유저별 현재 틀린 문제 집합)
+# 채점할 때마다 틀리면 추가, 다시 맞히면 제거된다
+class WrongAnswer(models.Model):
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='wrong_answers')
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='wrong_answers')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # 마지막으로 틀린 시간
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'question'], name='uniq_wrong_answer_user_question'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-updated_at'], name='wrong_answer_user_recent'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - Q{self.question_id}"
+
+
+# 복습 일정 (SM-2, myapp/reviews.py)
+# 틀린 문제마다 생기고 채점할 때마다 간격/난이도 계수/다음 복습 시각을 갱신 → wrong-note/due/ 는 (user, due_at) 범위 조회
+class ReviewState(models.Model):
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='review_states')
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='review_states')
+    repetitions = models.PositiveIntegerField(default=0)  # 연속으로 맞힌 횟수
+    interval_days = models.PositiveIntegerField(default=1)
+    ease = models.FloatField(default=2.5)
+    due_at = models.DateTimeField()
+    last_reviewed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'question'], name='uniq_review_state_user_question'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'due_at'], name='review_state_user_due'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - Q{self.question_id} (due {self.due_at:%Y-%m-%d})"
+
+
+# 사용자가 장르에서 이미 푼 문제 비트맵 (비트 위치 = 장르 안에서 문제 ID 순번, myapp/seen.py)
+class SeenQuestions(models.Model):
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='seen_questions')
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE, related_name='+')
+    bits = models.BinaryField(default=b'')
+    epoch = models.PositiveIntegerField(default=0)  # 기록할 때의 Genre.seen_epoch
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'genre'], name='uniq_seen_questions_user_genre'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.genre_id} ({len(self.bits)} bytes)"
+
+
+# 사용자의 장르별 Elo 레이팅 (myapp/ratings.py, 적응형 덱은 이 값 근처의 문제를 고른다)
+class UserGenreRating(models.Model):
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='genre_ratings')
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE, related_name='user_ratings')
+    rating = models.FloatField(default=1500.0)
+    attempts = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'genre'], name='uniq_user_genre_rating'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.genre_id}: {self.rating:.0f}"
+
+
+# 기간별 리더보드 (myapp/leaderboards.py)
+LEADERBOARD_PERIODS = [
+    ('daily', '일간'),
+    ('weekly', '주간'),
+    ('season', '시즌(분기)'),
+]
+
+
+# 진행 중인 기간의 사용자 점수 (퀴즈 제출마다 작업이 F() 로 누적)
+class LeaderboardScore(models.Model):
+    period = models.CharField(max_length=10, choices=LEADERBOARD_PERIODS)
+    window_start = models.DateField()
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='leaderboard_scores')
+    score = models.FloatField(default=0.0)
+    sessions = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'window_start', 'user'], name='uniq_leaderboard_score'),
+        ]
+        indexes = [
+            models.Index(fields=['period', 'window_start', 'score', 'user'], name='leaderboard_score_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.period} {self.window_start} - {self.user_id}: {self.score}"
+
+
+# 마감된 기간의 최종 순위 (마감 후에는 바뀌지 않음, close_leaderboards 명령이 생성)
+# rank_change: 직전 기간 순위 - 이번 순위 (양수 = 상승, 직전 기간에 없었으면 NULL)
+class LeaderboardSnapshot(models.Model):
+    period = models.CharField(max_length=10, choices=LEADERBOARD_PERIODS)
+    window_start = models.DateField()
+    rank = models.PositiveIntegerField()
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='leaderboard_snapshots')
+    score = models.FloatField()
+    rank_change = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'window_start', 'user'], name='uniq_leaderboard_snapshot'),
+        ]
+        indexes = [
+            models.Index(fields=['period', 'window_start', 'rank'], name='leaderboard_snapshot_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.period} {self.window_start} #{self.rank} - {self.user_id}"
+
+
+# 데이터 버전 카운터 (인메모리 인덱스/캐시 무효화용)
+# key 예시: "question_bank" → 문제은행이 바뀔 때마다 version 이 1씩 증가
+class DataVersion(models.Model):
+    key = models.CharField(max_length=100, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key} v{self.version}"
+
+
+# 백그라운드 작업 큐 (myapp/jobs.py, manage.py run_jobs 워커가 처리)
+# 성공한 작업은 삭제되고, 재시도를 모두 실패한 작업은 status='failed' 로 남는다
+class Job(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, '대기'),
+        (RUNNING, '실행 중'),
+        (FAILED, '실패'),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)  # 이 시간 이후에 실행 (재시도 대기)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True, default='')
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+# 제출 API 멱등성 키 (myapp/idempotency.py)
+# 클라이언트가 타임아웃으로 같은 제출을 재시도해도 처음 응답을 그대로 돌려줌
+class IdempotencyKey(models.Model):
+    PROCESSING = 'processing'
+    COMPLETED = 'completed'
+    STATUS_CHOICES = [
+        (PROCESSING, '처리 중'),
+        (COMPLETED, '완료'),
+    ]
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)  # 같은 키로 다른 요청을 보내는 실수 방지
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PROCESSING)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='uniq_idempotency_user_key'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at'], name='idempotency_created_at'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key} ({self.status})"
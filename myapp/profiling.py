@@ -0,0 +1,146 @@
+"""
+스태프 전용 요청 단위 CPU 프로파일링
+
+서명된 토큰을 X-Profile-Token 헤더나 ?_profile= 파라미터로 보내면
+해당 요청을 프로파일러 아래에서 실행하고 결과를 settings.PROFILING_DIR 에 저장한다.
+  - cprofile: 결정적 프로파일 (.prof, pstats/snakeviz 로 열람)
+  - sample:   샘플링 프로파일 (.collapsed, flamegraph.pl/speedscope 로 열람)
+토큰은 manage.py profiling_token <email> 로 발급한다.
+PROFILING_DIR 이 없으면 미들웨어 자체가 등록되지 않는다.
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+
+TOKEN_SALT = 'myapp.profiling'
+PROFILE_MODES = ('cprofile', 'sample')
+
+
+def make_profiling_token(user):
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(str(user.pk))
+
+
+# 토큰이 유효하고 활성 스태프 계정이면 사용자 반환
+def user_from_token(token):
+    try:
+        user_id = signing.TimestampSigner(salt=TOKEN_SALT).unsign(
+            token, max_age=getattr(settings, 'PROFILING_TOKEN_MAX_AGE', 3600),
+        )
+    except signing.BadSignature:
+        return None
+    return get_user_model().objects.filter(pk=user_id, is_staff=True, is_active=True).first()
+
+
+# 대상 스레드의 호출 스택을 주기적으로 기록하는 샘플링 프로파일러
+class StackSampler:
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}:{code.co_firstlineno}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+# mode 에 맞는 프로파일러로 블록을 실행하고 결과를 path 에 저장
+@contextmanager
+def profiled(mode, path):
+    if mode == 'sample':
+        interval = getattr(settings, 'PROFILING_SAMPLE_INTERVAL', 0.001)
+        with StackSampler(threading.get_ident(), interval) as sampler:
+            yield
+        sampler.write(path)
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+        profiler.dump_stats(path)
+
+
+# ASGI 에서는 이벤트 루프 스레드를 프로파일링하므로 같은 시간대의 다른 요청도 섞여 들어갈 수 있음
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.directory = getattr(settings, 'PROFILING_DIR', None)
+        if not self.directory:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = self.token(request)
+        if not token or user_from_token(token) is None:
+            return self.get_response(request)
+
+        mode, filename = self.target(request)
+        with profiled(mode, os.path.join(self.directory, filename)):
+            response = self.get_response(request)
+        response['X-Profile-Id'] = filename
+        return response
+
+    async def __acall__(self, request):
+        token = self.token(request)
+        if not token or await sync_to_async(user_from_token)(token) is None:
+            return await self.get_response(request)
+
+        mode, filename = self.target(request)
+        with profiled(mode, os.path.join(self.directory, filename)):
+            response = await self.get_response(request)
+        response['X-Profile-Id'] = filename
+        return response
+
+    def token(self, request):
+        return request.headers.get('X-Profile-Token') or request.GET.get('_profile')
+
+    # 프로파일 방식과 저장할 파일 이름
+    def target(self, request):
+        mode = request.headers.get('X-Profile-Mode') or request.GET.get('_profile_mode') or settings.PROFILING_MODE
+        if mode not in PROFILE_MODES:
+            mode = 'cprofile'
+
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.path.strip('/').replace('/', '_') or 'root'}-{uuid.uuid4().hex[:8]}"
+        return mode, f"{name}.{'collapsed' if mode == 'sample' else 'prof'}"
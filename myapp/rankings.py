@@ -0,0 +1,53 @@
+"""
+랭킹 순서와 "내 주변" 구간 (quiz/ranking/, quiz/ranking/around-me/)
+
+순서는 (점수 내림차순, key 내림차순) — 같은 점수는 ID 가 큰 쪽이 앞 순위.
+(점수, key) 인덱스를 거꾸로 읽은 순서와 정확히 같아서 정렬(filesort/임시 B-tree) 없이 인덱스만 읽는다.
+내 주변 ±N 명은 OFFSET 없이 내 (점수, key) 에서 위/아래로 인덱스를 N 개씩만 읽는다 (keyset).
+조건은 "점수 >= 내 점수 AND (점수 > 내 점수 OR key > 내 key)" 꼴이라 점수 범위 하나로 인덱스를 탄다 (OR 로 나뉘지 않음).
+내 순위 숫자는 기존처럼 나보다 앞선 사용자 수 COUNT (인덱스 범위) + 1.
+"""
+from django.db.models import Q
+
+# 모드 → CustomUser 점수 필드
+RANKING_SCORE_FIELDS = {
+    'speed_1min': 'speed_score_1min',
+    'speed_3min': 'speed_score_3min',
+    'solve': 'solve_score',
+    'total': 'score',
+}
+
+
+# 랭킹 순서 (인덱스 (score, key) 의 역순)
+def ranking_order(score_field, key_field):
+    return (f'-{score_field}', f'-{key_field}')
+
+
+# 나보다 앞 순위인 행 조건: (점수, key) > (내 점수, 내 key)
+def ahead_of(score_field, key_field, score, key):
+    return Q(**{f'{score_field}__gte': score}) & (Q(**{f'{score_field}__gt': score}) | Q(**{f'{key_field}__gt': key}))
+
+
+def behind(score_field, key_field, score, key):
+    return Q(**{f'{score_field}__lte': score}) & (Q(**{f'{score_field}__lt': score}) | Q(**{f'{key_field}__lt': key}))
+
+
+# 순위 (score, key 가 queryset 안에서 몇 번째인지)
+def rank_of(queryset, score_field, key_field, score, key):
+    return queryset.filter(ahead_of(score_field, key_field, score, key)).count() + 1
+
+
+# 내 주변 구간 → (첫 행의 순위, 행 목록: 위 size 명 + 나 + 아래 size 명, 순위 순)
+# mine: fields 순서의 내 행 (queryset 안에 있어야 함)
+def around(queryset, score_field, key_field, fields, mine, size):
+    key, score = mine[fields.index(key_field)], mine[fields.index(score_field)]
+    above = list(
+        queryset.filter(ahead_of(score_field, key_field, score, key))
+        .order_by(score_field, key_field).values_list(*fields)[:size]
+    )
+    below = list(
+        queryset.filter(behind(score_field, key_field, score, key))
+        .order_by(*ranking_order(score_field, key_field)).values_list(*fields)[:size]
+    )
+    rank = rank_of(queryset, score_field, key_field, score, key)
+    return rank - len(above), [*reversed(above), tuple(mine), *below]
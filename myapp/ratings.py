@@ -0,0 +1,126 @@
+"""
+적응형 난이도 (Elo 레이팅)
+
+문제마다 난이도 레이팅(Question.rating), 사용자마다 장르별 실력 레이팅(UserGenreRating)을 두고
+채점된 답 하나마다 Elo 규칙으로 둘 다 갱신한다.
+  기대 정답률 E = 1 / (1 + 10^((문제 - 사용자) / 400))
+  사용자 += K_user · (결과 - E),  문제 -= K_question · (결과 - E)   (결과: 맞힘 1, 틀림 0)
+답 하나당 계산은 O(1) 이고 QuizResult 를 다시 집계하지 않는다.
+제출 API 가 enqueue('update_ratings') 로 넘기면 작업이 세션의 답을 순서대로 반영하고,
+바뀐 양만 F() 로 더해서 워커가 여러 개여도 동시에 들어온 갱신이 사라지지 않는다.
+
+적응형 덱은 사용자가 TARGET_ACCURACY 확률로 맞힐 레이팅 근처의 문제를 (genre, rating) 인덱스 범위 조회로 고른다.
+"""
+import math
+import random
+from collections import Counter, defaultdict
+
+from django.db.models import Case, F, FloatField, IntegerField, Value, When
+
+from .models import Question, UserGenreRating
+
+INITIAL_RATING = 1500.0
+SCALE = 400.0
+
+# 처음 PROVISIONAL_ATTEMPTS 번은 크게 움직이고 그 뒤로는 안정적으로
+PROVISIONAL_ATTEMPTS = 30
+USER_K = (40.0, 16.0)
+QUESTION_K = (32.0, 8.0)
+
+# 적응형 덱 목표 정답률, 후보 수 (덱 크기의 배수, 이 중에서 무작위로 고름)
+TARGET_ACCURACY = 0.7
+CANDIDATE_FACTOR = 3
+
+
+def expected_score(user_rating, question_rating):
+    return 1.0 / (1.0 + 10 ** ((question_rating - user_rating) / SCALE))
+
+
+def k_factor(attempts, factors):
+    provisional, settled = factors
+    return provisional if attempts < PROVISIONAL_ATTEMPTS else settled
+
+
+# 사용자가 target_accuracy 확률로 맞힐 문제 레이팅
+def target_rating(user_rating, target_accuracy=TARGET_ACCURACY):
+    return user_rating - SCALE * math.log10(target_accuracy / (1.0 - target_accuracy))
+
+
+# 채점 결과 반영
+# attempts: [[question_id, is_correct], ...] (제출 순서)
+def rate_answers(user_id, attempts):
+    questions = {
+        question_id: (genre_id, rating, rated)
+        for question_id, genre_id, rating, rated in Question.objects
+        .filter(question_id__in={question_id for question_id, _ in attempts}, genre__isnull=False)
+        .values_list('question_id', 'genre_id', 'rating', 'rating_attempts')
+    }
+    if not questions:
+        return
+
+    genre_ids = {genre_id for genre_id, _, _ in questions.values()}
+    UserGenreRating.objects.bulk_create(
+        [UserGenreRating(user_id=user_id, genre_id=genre_id) for genre_id in genre_ids],
+        ignore_conflicts=True,
+    )
+    users = {
+        genre_id: [rating, rated]
+        for genre_id, rating, rated in UserGenreRating.objects
+        .filter(user_id=user_id, genre_id__in=genre_ids)
+        .values_list('genre_id', 'rating', 'attempts')
+    }
+    initial = {genre_id: rating for genre_id, (rating, _) in users.items()}
+
+    question_deltas = defaultdict(float)
+    question_counts = Counter()
+    user_counts = Counter()
+    for question_id, is_correct in attempts:
+        if question_id not in questions:
+            continue
+        genre_id, rating, rated = questions[question_id]
+        user = users[genre_id]
+
+        surprise = (1.0 if is_correct else 0.0) - expected_score(user[0], rating + question_deltas[question_id])
+        user[0] += k_factor(user[1], USER_K) * surprise
+        user[1] += 1
+        question_deltas[question_id] -= k_factor(rated + question_counts[question_id], QUESTION_K) * surprise
+        question_counts[question_id] += 1
+        user_counts[genre_id] += 1
+
+    # 문제는 UPDATE 한 번 (문제별 변화량을 CASE 로)
+    Question.objects.filter(question_id__in=list(question_counts)).update(
+        rating=F('rating') + Case(
+            *[When(question_id=question_id, then=Value(delta)) for question_id, delta in question_deltas.items()],
+            default=Value(0.0), output_field=FloatField(),
+        ),
+        rating_attempts=F('rating_attempts') + Case(
+            *[When(question_id=question_id, then=Value(count)) for question_id, count in question_counts.items()],
+            default=Value(0), output_field=IntegerField(),
+        ),
+    )
+    for genre_id, count in user_counts.items():
+        UserGenreRating.objects.filter(user_id=user_id, genre_id=genre_id).update(
+            rating=F('rating') + (users[genre_id][0] - initial[genre_id]),
+            attempts=F('attempts') + count,
+        )
+
+
+def user_rating(user, genre_id):
+    rating = UserGenreRating.objects.filter(user=user, genre_id=genre_id).values_list('rating', flat=True).first()
+    return INITIAL_RATING if rating is None else rating
+
+
+# 적응형 덱 → (사용자 레이팅, 문제 ID 목록: 쉬운 문제부터)
+# 목표 레이팅 위/아래로 각각 인덱스 순서대로 읽어서 가까운 후보 중에서 무작위 추출 (정렬/전체 스캔 없음)
+def build_adaptive_deck(user, genre_id, size):
+    rating = user_rating(user, genre_id)
+    target = target_rating(rating)
+    limit = size * CANDIDATE_FACTOR
+
+    questions = Question.objects.filter(genre_id=genre_id)
+    above = questions.filter(rating__gte=target).order_by('rating').values_list('question_id', 'rating')[:limit]
+    below = questions.filter(rating__lt=target).order_by('-rating').values_list('question_id', 'rating')[:limit]
+    candidates = sorted([*above, *below], key=lambda row: abs(row[1] - target))[:limit]
+
+    picked = sorted(random.sample(candidates, min(size, len(candidates))), key=lambda row: row[1])
+    return rating, [question_id for question_id, _ in picked]
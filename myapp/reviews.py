@@ -0,0 +1,96 @@
+"""
+오답 복습 일정 (SM-2)
+
+틀린 문제마다 ReviewState(연속 정답 횟수, 간격, 난이도 계수 ease, 다음 복습 시각 due_at)를 두고
+채점할 때마다 갱신한다.
+  - 틀림: 연속 정답 0, 간격 1일, ease 감소 (최소 MIN_EASE)
+  - 맞힘: 간격 1일 → 6일 → 이전 간격 × ease (복습 일정이 있는 문제만, 처음 맞힌 문제는 일정이 생기지 않음)
+오늘 복습할 문제(wrong-note/due/)는 (user, due_at) 인덱스 범위 조회 한 번으로 고르고,
+풀이 기록(QuizResult)을 다시 읽지 않는다. 간격이 일 단위라서 "오늘"은 지금이 아니라 오늘 자정 전까지
+(어제 오후에 틀린 문제는 오늘 아침에도 복습 덱에 나옴).
+"""
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from .models import ReviewState
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+MAX_INTERVAL_DAYS = 365
+
+# SM-2 응답 품질 (0~5): 맞힘 4, 틀림 2
+CORRECT_QUALITY = 4
+WRONG_QUALITY = 2
+
+
+def next_ease(ease, quality):
+    return max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+
+# SM-2 한 단계 (state 를 고쳐 씀)
+def review(state, is_correct, now):
+    quality = CORRECT_QUALITY if is_correct else WRONG_QUALITY
+    if is_correct:
+        state.repetitions += 1
+        if state.repetitions == 1:
+            state.interval_days = 1
+        elif state.repetitions == 2:
+            state.interval_days = 6
+        else:
+            state.interval_days = min(round(state.interval_days * state.ease), MAX_INTERVAL_DAYS)
+    else:
+        state.repetitions = 0
+        state.interval_days = 1
+    state.ease = next_ease(state.ease, quality)
+    state.last_reviewed_at = now
+    state.due_at = now + timedelta(days=state.interval_days)
+    return state
+
+
+# 채점 결과를 복습 일정에 반영
+# graded: (question_id, is_correct) 목록. 같은 문제가 여러 번 나오면 마지막 결과 기준 (record_graded_answers 와 동일)
+def schedule_reviews(user, graded):
+    latest = {}
+    for question_id, is_correct in graded:
+        latest[question_id] = is_correct
+    if not latest:
+        return
+
+    now = timezone.now()
+    states = {state.question_id: state for state in ReviewState.objects.filter(user=user, question_id__in=list(latest))}
+
+    created, updated = [], []
+    for question_id, is_correct in latest.items():
+        state = states.get(question_id)
+        if state is not None:
+            updated.append(review(state, is_correct, now))
+        elif not is_correct:
+            created.append(review(ReviewState(user=user, question_id=question_id, ease=DEFAULT_EASE), False, now))
+
+    if updated:
+        ReviewState.objects.bulk_update(
+            updated, ['repetitions', 'interval_days', 'ease', 'due_at', 'last_reviewed_at'],
+        )
+    if created:
+        ReviewState.objects.bulk_create(created, ignore_conflicts=True)
+
+
+# 내일 0시 (이 시각 전에 복습 시각이 돌아오는 문제가 오늘 복습 대상, USE_TZ=False 이면 서버 시간 기준)
+def due_before(now=None):
+    now = now or timezone.now()
+    if timezone.is_aware(now):
+        return timezone.make_aware(datetime.combine(timezone.localdate(now) + timedelta(days=1), time.min))
+    return datetime.combine(now.date() + timedelta(days=1), time.min)
+
+
+# 오늘 복습할 문제 ID (복습 시각이 오래된 것부터)
+def due_question_ids(user, size, genre_id=None, now=None):
+    states = ReviewState.objects.filter(user=user, due_at__lt=due_before(now))
+    if genre_id:
+        states = states.filter(question__genre_id=genre_id)
+    return list(states.order_by('due_at').values_list('question_id', flat=True)[:size])
+
+
+def due_count(user, now=None):
+    return ReviewState.objects.filter(user=user, due_at__lt=due_before(now)).count()
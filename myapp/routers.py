@@ -0,0 +1,145 @@
+"""
+읽기 전용 복제본(read replica) DB 라우터
+
+settings.DATABASE_REPLICA_URLS 로 복제본을 등록하면 (replica_1, replica_2, ...)
+@replica_reads 가 붙은 읽기 뷰의 SELECT 만 복제본으로 보낸다.
+그 외 모든 쿼리(쓰기, 인증, 제출 등)는 default(primary)로 간다.
+
+read-your-writes: 로그인 사용자가 쓰기 요청(POST/PUT/PATCH/DELETE)에 성공하면
+ReplicaPinningMiddleware 가 REPLICA_LAG_TOLERANCE 초 동안 그 사용자를 primary 에 고정한다.
+(예: 퀴즈 제출 직후 최근 퀴즈 결과 조회는 복제 지연과 상관없이 primary 에서 읽음)
+워커 간에 고정 정보를 공유하려면 CACHES 를 공유 캐시(redis 등)로 설정할 것.
+"""
+import contextvars
+import functools
+import random
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import LazyObject, empty
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+REPLICA_PREFIX = 'replica_'
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+
+
+def replica_aliases():
+    return [alias for alias in connections if alias.startswith(REPLICA_PREFIX)]
+
+
+def pin_key(user_id):
+    return f'db:pin:{user_id}'
+
+
+def pin_to_primary(user):
+    cache.set(pin_key(user.pk), 1, getattr(settings, 'REPLICA_LAG_TOLERANCE', 5))
+
+
+def is_pinned(user):
+    return bool(user and user.is_authenticated and cache.get(pin_key(user.pk)))
+
+
+async def ais_pinned(user):
+    return bool(user and user.is_authenticated and await cache.aget(pin_key(user.pk)))
+
+
+# async 뷰의 요청 사용자 (JWT 로 인증되지 않았으면 세션 사용자를 async 로 조회)
+async def _arequest_user(request):
+    user = getattr(request, 'user', None)
+    if isinstance(user, LazyObject) and hasattr(request, 'auser'):
+        return await request.auser()
+    return user
+
+
+# 이 블록 안의 읽기 쿼리는 복제본으로 보냄
+@contextmanager
+def use_replica(enabled=True):
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+# 읽기 전용 뷰 데코레이터 (함수 뷰: @replica_reads, 클래스 뷰: @method_decorator(replica_reads, name='get'))
+# DRF 뷰에서는 인증이 끝난 뒤 실행되므로 request.user 로 primary 고정 여부를 판단할 수 있음
+# async 뷰에도 사용 가능 (컨텍스트 변수는 async ORM 이 실행되는 스레드로 전달됨)
+def replica_reads(view_func):
+    if iscoroutinefunction(view_func):
+        @functools.wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            # 복제본이 없으면 캐시 조회(스레드 왕복)도 생략
+            enabled = bool(replica_aliases()) and request.method in SAFE_METHODS and not await ais_pinned(await _arequest_user(request))
+            with use_replica(enabled):
+                return await view_func(request, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        enabled = bool(replica_aliases()) and request.method in SAFE_METHODS and not is_pinned(getattr(request, 'user', None))
+        with use_replica(enabled):
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get():
+            replicas = replica_aliases()
+            if replicas:
+                return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    # 복제본은 모두 primary 와 같은 데이터
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    # 스키마 변경은 primary 에만 (복제본은 복제로 따라옴)
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+# 쓰기 요청에 성공한 로그인 사용자를 잠시 primary 에 고정
+# DRF 가 인증한 사용자는 뷰 실행 뒤 request.user 에 반영되어 있음
+class ReplicaPinningMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        response = self.get_response(request)
+        if self.should_pin(request, response):
+            pin_to_primary(request.user)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.should_pin(request, response):
+            await cache.aset(pin_key(request.user.pk), 1, getattr(settings, 'REPLICA_LAG_TOLERANCE', 5))
+        return response
+
+    # async 요청에서는 뷰가 인증한 사용자만 봄 (세션 사용자를 sync 로 조회하지 않도록)
+    def should_pin(self, request, response):
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return False
+        user = request.__dict__.get('user')
+        if isinstance(user, LazyObject):
+            user = user if user._wrapped is not empty else None
+        return bool(user and user.is_authenticated)
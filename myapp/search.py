@@ -0,0 +1,175 @@
+"""
+문제/해설 전문 검색 (questions/search/)
+
+DB 별 전문 검색 인덱스 (마이그레이션 0023 에서 생성)
+  - MySQL: question_text, explanation 에 FULLTEXT 인덱스 (WITH PARSER ngram, 한국어 2글자 단위)
+           점수 = MATCH() AGAINST() 관련도
+  - SQLite(로컬/테스트): FTS5 가상 테이블 myapp_question_fts (tokenize='trigram', 외부 콘텐츠 = myapp_question)
+           점수 = -bm25(), 3글자 미만 검색어는 FTS 로 찾을 수 없어 lower() + instr() 로 거름 (전체 스캔)
+두 인덱스 모두 DB 가 직접 유지 (MySQL 은 인덱스, SQLite 는 트리거)
+→ bulk_create/원시 INSERT 로 문제를 넣는 import_questions, generate_dataset 도 따로 할 일이 없다.
+  - SQLite 는 필드 추가 같은 마이그레이션이 myapp_question 을 새로 만들면서 트리거가 함께 지워진다
+    → migrate 가 끝날 때마다 트리거를 확인해서 없으면 다시 만들고 FTS 를 재구축 (signals.py, rebuild_search_index)
+  - 그 외 DB(PostgreSQL 등)는 전문 검색 인덱스 없이 icontains 로 거름 (전체 스캔, 점수 0 → question_id 순)
+
+결과는 (점수 내림차순, question_id 오름차순) 으로 정렬하고, 마지막 항목의 (점수, question_id) 를
+커서로 돌려줘서 다음 페이지는 OFFSET 없이 그 뒤부터 읽는다 (keyset 페이지네이션).
+"""
+import base64
+import json
+
+from django.db import connections, router
+from django.db.models import FloatField, Q, Value
+
+from .models import Question
+
+FTS_TABLE = 'myapp_question_fts'
+MIN_TRIGRAM_LENGTH = 3
+MAX_TERMS = 10
+
+
+# FTS 를 원본 테이블과 맞춰 주는 SQLite 트리거 (마이그레이션 0023 과 같은 정의)
+SQLITE_TRIGGERS = {
+    'myapp_question_fts_ai': """CREATE TRIGGER myapp_question_fts_ai AFTER INSERT ON myapp_question BEGIN
+        INSERT INTO myapp_question_fts(rowid, question_text, explanation)
+        VALUES (new.question_id, new.question_text, new.explanation);
+    END""",
+    'myapp_question_fts_ad': """CREATE TRIGGER myapp_question_fts_ad AFTER DELETE ON myapp_question BEGIN
+        INSERT INTO myapp_question_fts(myapp_question_fts, rowid, question_text, explanation)
+        VALUES ('delete', old.question_id, old.question_text, old.explanation);
+    END""",
+    'myapp_question_fts_au': """CREATE TRIGGER myapp_question_fts_au AFTER UPDATE OF question_text, explanation ON myapp_question BEGIN
+        INSERT INTO myapp_question_fts(myapp_question_fts, rowid, question_text, explanation)
+        VALUES ('delete', old.question_id, old.question_text, old.explanation);
+        INSERT INTO myapp_question_fts(rowid, question_text, explanation)
+        VALUES (new.question_id, new.question_text, new.explanation);
+    END""",
+}
+
+
+# SQLite 에서 빠진 트리거 이름 (FTS 테이블이 없으면 None: 0023 이전 상태)
+def missing_search_triggers(connection):
+    if connection.vendor != 'sqlite':
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT type, name FROM sqlite_master WHERE name = %s OR type = 'trigger'", [FTS_TABLE])
+        existing = dict((name, kind) for kind, name in cursor.fetchall())
+    if FTS_TABLE not in existing:
+        return None
+    return [name for name in SQLITE_TRIGGERS if name not in existing]
+
+
+# 트리거를 다시 만들고 FTS 를 원본 테이블에서 재구축 (SQLite 만, MySQL FULLTEXT 는 DB 가 유지)
+def rebuild_search_index(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        for name, sql in SQLITE_TRIGGERS.items():
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(score, question_id):
+    raw = json.dumps([score, question_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        score, question_id = json.loads(raw)
+        return float(score), int(question_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+def search_terms(query):
+    return query.split()[:MAX_TERMS]
+
+
+def _mysql_search(terms, genre_id):
+    match = 'MATCH(question_text, explanation) AGAINST (%s IN NATURAL LANGUAGE MODE)'
+    text = ' '.join(terms)
+    sql = f'SELECT question_id, {match} AS score FROM myapp_question WHERE {match}'
+    params = [text, text]
+    if genre_id is not None:
+        sql += ' AND genre_id = %s'
+        params.append(genre_id)
+    return sql, params
+
+
+def _sqlite_search(terms, genre_id):
+    long_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_LENGTH]
+    short_terms = [term for term in terms if len(term) < MIN_TRIGRAM_LENGTH]
+    conditions, params = [], []
+
+    if long_terms:
+        # 검색어를 큰따옴표로 감싸서 FTS5 문법 문자(*, -, OR 등)를 그대로 검색 (공백 = AND)
+        sql = f'SELECT q.question_id, -bm25({FTS_TABLE}) AS score FROM {FTS_TABLE} f JOIN myapp_question q ON q.question_id = f.rowid'
+        conditions.append(f'{FTS_TABLE} MATCH %s')
+        params.append(' '.join('"{}"'.format(term.replace('"', '""')) for term in long_terms))
+    else:
+        sql = 'SELECT q.question_id, 0.0 AS score FROM myapp_question q'
+
+    for term in short_terms:
+        # 대소문자 구분 없이 (FTS5 trigram 과 MySQL ngram 과 같게, lower() 는 ASCII 만 바꿈)
+        conditions.append('(instr(lower(q.question_text), lower(%s)) > 0 OR instr(lower(q.explanation), lower(%s)) > 0)')
+        params.extend([term, term])
+    if genre_id is not None:
+        conditions.append('q.genre_id = %s')
+        params.append(genre_id)
+    return sql + ' WHERE ' + ' AND '.join(conditions), params
+
+
+# 전문 검색 인덱스가 없는 DB: 검색어마다 문제/해설 icontains (AND), 점수 0
+def _fallback_search(connection, terms, genre_id):
+    questions = Question.objects.using(connection.alias)
+    for term in terms:
+        questions = questions.filter(Q(question_text__icontains=term) | Q(explanation__icontains=term))
+    if genre_id is not None:
+        questions = questions.filter(genre_id=genre_id)
+    sql, params = (
+        questions.annotate(score=Value(0.0, output_field=FloatField()))
+        .values_list('question_id', 'score').order_by().query.sql_with_params()
+    )
+    return sql, list(params)
+
+
+# 검색 → ([(question_id, score), ...], 다음 페이지 커서 또는 None)
+def search_questions(query, genre_id=None, cursor=None, limit=20):
+    terms = search_terms(query)
+    if not terms:
+        return [], None
+
+    # 원시 SQL 이므로 라우터로 직접 DB 선택 (@replica_reads 뷰에서는 복제본)
+    connection = connections[router.db_for_read(Question)]
+    if connection.vendor == 'mysql':
+        inner, params = _mysql_search(terms, genre_id)
+    elif connection.vendor == 'sqlite':
+        inner, params = _sqlite_search(terms, genre_id)
+    else:
+        inner, params = _fallback_search(connection, terms, genre_id)
+
+    sql = f'SELECT question_id, score FROM ({inner}) ranked'
+    if cursor:
+        last_score, last_id = decode_cursor(cursor)
+        sql += ' WHERE score < %s OR (score = %s AND question_id > %s)'
+        params.extend([last_score, last_score, last_id])
+    sql += ' ORDER BY score DESC, question_id ASC LIMIT %s'
+    params.append(limit + 1)
+
+    with connection.cursor() as db_cursor:
+        db_cursor.execute(sql, params)
+        rows = [(question_id, float(score)) for question_id, score in db_cursor.fetchall()]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last_id, last_score = rows[limit - 1]
+        next_cursor = encode_cursor(last_score, last_id)
+    return rows[:limit], next_cursor
@@ -0,0 +1,163 @@
+"""
+이미 푼 문제 비트맵 (사용자 × 장르마다 BinaryField 하나)
+
+genre_questions 는 장르별 문제 ID 를 오름차순으로 들고 있는 인메모리 인덱스 (문제은행 버전 키로 재적재)
+문제의 비트 위치 = 장르 안에서의 순번 → 문제 1000개 장르면 사용자당 125바이트
+  - 새 문제는 ID 가 커서 뒤에 붙으므로 기존 순번이 그대로 유지된다
+  - 문제가 삭제되거나 장르가 바뀌면 순번이 밀리므로 그 장르의 세대(Genre.seen_epoch)를 올린다 (signals.py)
+    비트맵은 기록할 때의 세대를 같이 저장하고, 세대가 다르면 빈 비트맵으로 본다 (드문 일이라 다시 계산하지 않음)
+제출할 때 푼 문제의 비트를 켜고 (mark_seen), 덱은 행 하나만 읽어서 꺼진 비트 중에서 무작위로 고른다 (sample_deck).
+장르의 문제를 모두 풀면 비트맵을 이번 제출분만 남기고 비워서 다시 한 바퀴 돈다 (인덱스가 최신인지 확인한 뒤).
+"""
+import random
+from array import array
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+
+from django.db import transaction
+from django.db.models import F
+
+from .genres import _genre_id
+from .models import Genre, Question, SeenQuestions
+from .versioning import QUESTION_BANK, VersionedIndex, bump_version
+
+# by_genre: 장르 ID → 문제 ID 배열 (오름차순), genre_of: 문제 ID 위치에 장르 ID (0 = 없는 문제/장르 없음)
+# epochs: 장르 ID → 비트맵 세대
+GenreQuestions = namedtuple('GenreQuestions', ['by_genre', 'genre_of', 'epochs'])
+
+
+class GenreQuestionIndex(VersionedIndex):
+    version_key = QUESTION_BANK
+
+    def load(self):
+        rows = list(
+            Question.objects.filter(genre__isnull=False)
+            .order_by('genre_id', 'question_id')
+            .values_list('genre_id', 'question_id')
+        )
+        by_genre = defaultdict(lambda: array('I'))
+        genre_of = array('I', bytes(4 * (max((question_id for _, question_id in rows), default=0) + 1)))
+        for genre_id, question_id in rows:
+            by_genre[genre_id].append(question_id)
+            genre_of[question_id] = genre_id
+        epochs = dict(Genre.objects.values_list('genre_id', 'seen_epoch'))
+        return GenreQuestions(dict(by_genre), genre_of, epochs)
+
+
+genre_questions = GenreQuestionIndex()
+
+
+def _ordinal(question_ids, question_id):
+    position = bisect_left(question_ids, question_id)
+    return position if position < len(question_ids) and question_ids[position] == question_id else None
+
+
+def _is_set(bits, ordinal):
+    return ordinal >> 3 < len(bits) and bits[ordinal >> 3] >> (ordinal & 7) & 1
+
+
+# 비트맵(bytes)에서 꺼진 비트 우선으로 size 개 순번 고르기
+def _pick(total, bits, size, rng):
+    size = min(size, total)
+    bits = bits[:(total + 7) // 8]
+    unseen = total - int.from_bytes(bits, 'little').bit_count()
+
+    if unseen >= size and unseen * 2 >= total:
+        # 안 푼 문제가 절반 이상: 무작위로 뽑고 본 문제면 다시 (시도 횟수 기대값 2·size 이하)
+        picked = set()
+        while len(picked) < size:
+            ordinal = rng.randrange(total)
+            if not _is_set(bits, ordinal):
+                picked.add(ordinal)
+        return list(picked)
+
+    unseen_ordinals = [ordinal for ordinal in range(total) if not _is_set(bits, ordinal)]
+    if unseen >= size:
+        return rng.sample(unseen_ordinals, size)
+    seen_ordinals = [ordinal for ordinal in range(total) if _is_set(bits, ordinal)]
+    picked = unseen_ordinals + rng.sample(seen_ordinals, size - unseen)
+    rng.shuffle(picked)
+    return picked
+
+
+# seen: (bits, epoch) 또는 None, 세대가 지난 비트맵은 빈 것으로 봄
+def _deck(index, genre_id, seen, size, rng):
+    genre_id = _genre_id(genre_id)
+    question_ids = index.by_genre.get(genre_id)
+    if not question_ids:
+        return []
+    bits = seen[0] if seen and seen[1] == index.epochs.get(genre_id, 0) else b''
+    return [question_ids[ordinal] for ordinal in _pick(len(question_ids), bytes(bits or b''), size, rng)]
+
+
+def _seen_rows(user, genre_id):
+    if user is None or not user.is_authenticated or _genre_id(genre_id) is None:
+        return None
+    return SeenQuestions.objects.filter(user=user, genre_id=genre_id).values_list('bits', 'epoch')
+
+
+# 덱 문제 ID (안 푼 문제 우선, 무작위 순서), 비로그인 사용자는 그냥 무작위
+def sample_deck(user, genre_id, size, rng=random):
+    rows = _seen_rows(user, genre_id)
+    return _deck(genre_questions.get(), genre_id, rows.first() if rows is not None else None, size, rng)
+
+
+async def asample_deck(user, genre_id, size, rng=random):
+    index = await genre_questions.aget()
+    rows = _seen_rows(user, genre_id)
+    return _deck(index, genre_id, await rows.afirst() if rows is not None else None, size, rng)
+
+
+# 장르들의 비트맵 세대를 올림 (문제 삭제/장르 변경 시, 커밋 뒤 문제은행 버전을 올려 인덱스가 새 세대를 읽게 함)
+def invalidate_seen_bitmaps(genre_ids):
+    genre_ids = {genre_id for genre_id in genre_ids if genre_id is not None}
+    if not genre_ids:
+        return
+    Genre.objects.filter(genre_id__in=genre_ids).update(seen_epoch=F('seen_epoch') + 1)
+    transaction.on_commit(lambda: bump_version(QUESTION_BANK))
+
+
+# 인덱스를 최신으로 다시 확인한 뒤 장르의 문제 수 (그 사이 세대가 바뀌었으면 None)
+def _current_total(genre_id, epoch):
+    index = genre_questions.refresh()
+    if index.epochs.get(genre_id, 0) != epoch:
+        return None
+    return len(index.by_genre.get(genre_id, ()))
+
+
+# 제출한 문제를 푼 문제로 표시 (장르마다 행 하나 읽고 쓰기)
+# 이 프로세스의 인덱스는 최대 DATA_VERSION_CHECK_SECONDS 늦을 수 있으므로 (다른 프로세스가 새 문제의 비트를 이미 켰을 수 있음)
+# 저장된 비트맵이 더 길면 그대로 두고, 뒤쪽 비트를 지우거나 한 바퀴를 새로 시작하는 것은 인덱스를 다시 확인한 뒤에만 한다
+def mark_seen(user, question_ids):
+    index = genre_questions.get()
+    ordinals = defaultdict(set)
+    for question_id in question_ids:
+        genre_id = index.genre_of[question_id] if 0 < question_id < len(index.genre_of) else 0
+        if genre_id:
+            ordinal = _ordinal(index.by_genre[genre_id], question_id)
+            if ordinal is not None:
+                ordinals[genre_id].add(ordinal)
+
+    for genre_id, marked in ordinals.items():
+        total = len(index.by_genre[genre_id])
+        epoch = index.epochs.get(genre_id, 0)
+        new_bits = sum(1 << ordinal for ordinal in marked)
+        with transaction.atomic():
+            row, _ = SeenQuestions.objects.select_for_update().get_or_create(
+                user=user, genre_id=genre_id, defaults={'epoch': epoch},
+            )
+            # 세대가 바뀌었으면 이전 비트는 다른 문제를 가리키므로 버림
+            stored = (row.bits or b'') if row.epoch == epoch else b''
+            bits = int.from_bytes(stored, 'little') | new_bits
+            length = max((total + 7) // 8, len(stored))
+            if bits >> total or bits.bit_count() >= total:
+                current = _current_total(genre_id, epoch)
+                if current is not None:
+                    total = current
+                    bits &= (1 << total) - 1
+                    length = (total + 7) // 8
+                    if bits.bit_count() >= total:
+                        bits = new_bits
+            row.bits = bits.to_bytes(length, 'little')
+            row.epoch = epoch
+            row.save(update_fields=['bits', 'epoch', 'updated_at'])
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
-from .models import CustomUser, Genre, Question, QuizResult, QuizSession, QuestionStat
+from .genres import genre_registry
+from .interests import interest_fields
+from .models import CustomUser, Question, QuizResult, QuizSession, QuestionStat, WrongAnswer
 from django.contrib.auth import authenticate
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.auth.models import User
@@ -11,20 +13,36 @@ from django.contrib.auth.hashers import check_password
 
 User = get_user_model()
 
+# 장르 이름을 장르 레지스트리에서 찾는 필드 (source 는 장르 ID, 장르 테이블 조회/조인 없음)
+# 장르가 없으면 기존 source='...genre.genre_name' 과 마찬가지로 키를 생략
+class GenreNameField(serializers.ReadOnlyField):
+    def get_attribute(self, instance):
+        genre_name = genre_registry.name(super().get_attribute(instance))
+        if genre_name is None:
+            raise serializers.SkipField()
+        return genre_name
+
+
 class UserSerializer(serializers.ModelSerializer):
+    # 가입 시에는 장르 이름, 응답에는 장르 ID(문자열) — 저장은 UserInterest (myapp/interests.py)
+    interest_1 = serializers.CharField(max_length=100, required=False, allow_null=True, allow_blank=True, write_only=True)
+    interest_2 = serializers.CharField(max_length=100, required=False, allow_null=True, allow_blank=True, write_only=True)
+    interest_3 = serializers.CharField(max_length=100, required=False, allow_null=True, allow_blank=True, write_only=True)
+
     class Meta:
         model = CustomUser
         fields = ['username', 'email', 'password', 'interest_1', 'interest_2', 'interest_3']
         extra_kwargs = {'password': {'write_only': True}}
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data.update(interest_fields(instance))
+        return data
+
     def create(self, validated_data):
-        # genre_name → genre_id(str) 변환 함수
+        # 장르 이름 → 장르 ID (없는 이름이면 None → 관심 분야 없음, UserInterest 슬롯으로 저장)
         def get_genre_id_by_name(name):
-            try:
-                genre = Genre.objects.get(genre_name=name)
-                return str(genre.genre_id)  # DB에는 문자열로 저장됨
-            except Genre.DoesNotExist:
-                return None
+            return genre_registry.id_for(name)
 
         # 변환 적용
         interest_1 = get_genre_id_by_name(validated_data.get('interest_1'))
@@ -88,7 +106,7 @@ class ResetPasswordSerializer(serializers.Serializer):
         user.set_password(new_password)
         user.save()
 class QuestionSerializer(serializers.ModelSerializer):
-    genre_name = serializers.CharField(source='genre.genre_name', read_only=True)
+    genre_name = GenreNameField(source='genre_id')
     accuracy = serializers.SerializerMethodField()
     correct_answer = serializers.CharField(source='answer', read_only=True)
 
@@ -105,8 +123,9 @@ class QuestionSerializer(serializers.ModelSerializer):
 class QuizResultSerializer(serializers.ModelSerializer):
     question_text = serializers.CharField(source='question.question_text', read_only=True)
     explanation = serializers.CharField(source='question.explanation', read_only=True)
-    genre_name = serializers.CharField(source='question.genre.genre_name', read_only=True)
-    user_answer = serializers.CharField(read_only=True)
+    genre_name = GenreNameField(source='question.genre_id')
+    user_answer = serializers.CharField(source='user_answer_text', read_only=True)
+    correct_answer = serializers.CharField(source='correct_answer_text', read_only=True)
     class Meta:
         model = QuizResult
         fields = [
@@ -157,10 +176,7 @@ class QuizSessionSerializer(serializers.ModelSerializer):
         format='%Y-%m-%d %H:%M',
         read_only=True
     )
-    genre = serializers.CharField(
-        source='genre.genre_name',
-        read_only=True
-    )
+    genre = GenreNameField(source='genre_id')
     quiz_type = serializers.CharField(read_only=True)
     totalQuestions = serializers.IntegerField(
         source='total_questions',
@@ -203,7 +219,7 @@ class QuestionStatSerializer(serializers.ModelSerializer):
     option3 = serializers.CharField(source='question.option3', read_only=True)
     option4 = serializers.CharField(source='question.option4', read_only=True)
     explanation = serializers.CharField(source='question.explanation', read_only=True)
-    genre_name = serializers.CharField(source='question.genre.genre_name', read_only=True)
+    genre_name = GenreNameField(source='question.genre_id')
     correct_answer = serializers.CharField(source='question.answer', read_only=True)
     accuracy = serializers.SerializerMethodField()
 
@@ -217,4 +233,23 @@ class QuestionStatSerializer(serializers.ModelSerializer):
     def get_accuracy(self, obj):
         if obj.total_attempts == 0:
             return None
-        return round((obj.correct_attempts / obj.total_attempts) * 100, 1)
\ No newline at end of file
+        return round((obj.correct_attempts / obj.total_attempts) * 100, 1)
+
+class WrongAnswerSerializer(serializers.ModelSerializer):
+    question_id = serializers.IntegerField(source='question.question_id', read_only=True)
+    question_text = serializers.CharField(source='question.question_text', read_only=True)
+    option1 = serializers.CharField(source='question.option1', read_only=True)
+    option2 = serializers.CharField(source='question.option2', read_only=True)
+    option3 = serializers.CharField(source='question.option3', read_only=True)
+    option4 = serializers.CharField(source='question.option4', read_only=True)
+    correct_answer = serializers.CharField(source='question.answer', read_only=True)
+    explanation = serializers.CharField(source='question.explanation', read_only=True)
+    genre_name = GenreNameField(source='question.genre_id')
+    wrong_at = serializers.DateTimeField(source='updated_at', format='%Y-%m-%d %H:%M', read_only=True)
+
+    class Meta:
+        model = WrongAnswer
+        fields = [
+            'question_id', 'question_text', 'option1', 'option2', 'option3', 'option4',
+            'correct_answer', 'explanation', 'genre_name', 'wrong_at'
+        ]
@@ -0,0 +1,121 @@
+import logging
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from .db_pool import PooledConnectionMixin
+from .genres import refresh_question_counts
+from .instrumentation import install_query_observer
+from .metrics import db_connections_opened_total
+from .models import CustomUser, Genre, Question
+from .search import missing_search_triggers, rebuild_search_index
+from .seen import invalidate_seen_bitmaps
+from .versioning import GENRES, QUESTION_BANK, RANKING, bump_version, user_profile_key
+
+logger = logging.getLogger(__name__)
+
+
+# 문제 추가/수정/삭제 시 문제은행 버전 증가 → 각 워커의 정답 인덱스가 다시 적재됨
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def bump_question_bank_version(sender, **kwargs):
+    bump_version(QUESTION_BANK)
+
+
+# 문제의 장르가 바뀌는 경우 이전 장르의 문제 수도 다시 세도록 기억해 둠
+@receiver(pre_save, sender=Question)
+def remember_question_genre(sender, instance, **kwargs):
+    if instance._state.adding or instance.pk is None:
+        instance._previous_genre_id = None
+    else:
+        instance._previous_genre_id = Question.objects.filter(pk=instance.pk).values_list('genre_id', flat=True).first()
+
+
+# 문제 추가/수정/삭제 시 해당 장르의 문제 수 갱신 (genres/ 목록 버전도 증가)
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def update_genre_question_count(sender, instance, **kwargs):
+    genre_ids = {instance.genre_id, getattr(instance, '_previous_genre_id', None)}
+    refresh_question_counts(genre_ids - {None})
+
+
+# 문제 삭제/장르 변경 → 장르 안 순번이 밀리므로 푼 문제 비트맵 세대 증가 (새 문제 추가는 뒤에 붙어서 그대로)
+@receiver(post_delete, sender=Question)
+def invalidate_seen_on_delete(sender, instance, **kwargs):
+    invalidate_seen_bitmaps([instance.genre_id])
+
+
+@receiver(post_save, sender=Question)
+def invalidate_seen_on_genre_change(sender, instance, created, **kwargs):
+    previous_genre_id = getattr(instance, '_previous_genre_id', None)
+    if not created and previous_genre_id != instance.genre_id:
+        invalidate_seen_bitmaps([previous_genre_id, instance.genre_id])
+
+
+# 장르 추가/이름 변경/삭제 → genres/ 목록 버전 증가
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def bump_genre_catalog_version(sender, **kwargs):
+    bump_version(GENRES)
+
+
+# 요청별 쿼리 수/시간 측정 래퍼 설치 (RequestTimingMiddleware, loadtest)
+@receiver(connection_created)
+def install_instrumentation(sender, connection, **kwargs):
+    install_query_observer(connection)
+
+
+# 새 DB 커넥션 수 (풀 엔진은 풀에서 꺼낼 때마다 호출되므로 풀이 직접 셈)
+@receiver(connection_created)
+def count_new_connection(sender, connection, **kwargs):
+    if not isinstance(connection, PooledConnectionMixin):
+        db_connections_opened_total.inc(alias=connection.alias)
+
+
+# 랭킹 응답에 나오는 필드 (닉네임, 프로필 이미지, 모드별 점수)
+RANKING_FIELDS = ('username', 'profile_image', 'score', 'solve_score', 'speed_score_1min', 'speed_score_3min')
+
+
+# 저장 전 랭킹 필드 값을 기억해 둠 (update_fields 에 랭킹 필드가 없으면 조회하지 않음)
+@receiver(pre_save, sender=CustomUser)
+def remember_ranking_fields(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding or instance.pk is None:
+        instance._previous_ranking_values = None
+        return
+    fields = [field for field in RANKING_FIELDS if update_fields is None or field in update_fields]
+    instance._previous_ranking_values = (
+        CustomUser.objects.filter(pk=instance.pk).values(*fields).first() if fields else {}
+    )
+
+
+# 프로필(닉네임/관심 분야/프로필 이미지) 변경 → 프로필 ETag 갱신 (conditional.py)
+# 로그인 시각만 바뀐 저장은 응답에 영향이 없으므로 제외
+# 랭킹 ETag 는 가입/탈퇴나 랭킹 필드 값이 실제로 바뀐 경우만 갱신 (점수 누적은 tasks.update_user_scores 가 갱신)
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def bump_user_profile_version(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_version(user_profile_key(instance.pk))
+
+    # post_delete 에는 created 인자가 없음 → 탈퇴는 항상 갱신
+    previous = getattr(instance, '_previous_ranking_values', None) if 'created' in kwargs else None
+    if previous is None or any(
+        CustomUser._meta.get_field(field).get_prep_value(getattr(instance, field)) != value  # 파일 필드는 이름 문자열로 비교
+        for field, value in previous.items()
+    ):
+        bump_version(RANKING)
+
+
+# SQLite: myapp_question 을 새로 만드는 마이그레이션이 지운 전문 검색 트리거를 migrate 직후 복구 (search.py)
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    if sender.name != 'myapp':
+        return
+    connection = connections[using]
+    missing = missing_search_triggers(connection)
+    if missing:
+        logger.warning("전문 검색 트리거가 없어서 다시 만들고 인덱스를 재구축합니다: %s", ', '.join(missing))
+        rebuild_search_index(connection)
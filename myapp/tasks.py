@@ -0,0 +1,81 @@
+"""
+제출 후처리 작업 (myapp/jobs.py 의 큐에서 실행)
+행을 읽어서 고쳐 쓰지 않고 F()/Greatest 로 DB 에서 바로 갱신하므로 워커가 여러 개여도 값이 꼬이지 않는다.
+제출 한 번에 process_quiz_session 작업 하나만 넣는다. F() 누적은 두 번 실행되면 두 번 더해지므로
+같은 세션이 다시 실행되지 않는 것은 jobs.run_job 이 보장한다 (이미 끝난 작업이면 아무것도 하지 않음).
+나머지 개별 작업 이름은 배포 전에 쌓인 Job 행을 처리하기 위해 남겨둔다.
+"""
+from collections import Counter, defaultdict
+from datetime import date
+
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Greatest, Round
+
+from .jobs import job
+from .models import CustomUser, Question, QuestionStat
+from .leaderboards import record_score
+from .ratings import rate_answers
+from .versioning import RANKING, bump_version
+
+
+# 문제별 풀이/정답 수 누적
+# attempts: [[question_id, is_correct], ...]
+@job('record_question_stats')
+def record_question_stats(attempts):
+    totals = Counter(question_id for question_id, _ in attempts)
+    corrects = Counter(question_id for question_id, is_correct in attempts if is_correct)
+
+    # 작업 대기 중에 삭제된 문제는 제외
+    question_ids = set(Question.objects.filter(question_id__in=list(totals)).values_list('question_id', flat=True))
+    QuestionStat.objects.bulk_create(
+        [QuestionStat(question_id=question_id) for question_id in question_ids],
+        ignore_conflicts=True,
+    )
+
+    # 증가량이 같은 문제끼리 묶어서 UPDATE (보통 맞힘/틀림 두 번)
+    groups = defaultdict(list)
+    for question_id in question_ids:
+        groups[(totals[question_id], corrects[question_id])].append(question_id)
+    for (total, correct), ids in groups.items():
+        QuestionStat.objects.filter(question_id__in=ids).update(
+            total_attempts=F('total_attempts') + total,
+            correct_attempts=F('correct_attempts') + correct,
+        )
+
+
+# 누적 점수와 모드별 최고 점수 갱신
+@job('update_user_scores')
+def update_user_scores(user_id, score_delta, round_score=False, solve_score=None,
+                       speed_score_1min=None, speed_score_3min=None):
+    score = Coalesce(F('score'), Value(0.0)) + Value(float(score_delta))
+    updates = {'score': Round(score, 1) if round_score else score}
+
+    for field, value in (('solve_score', solve_score), ('speed_score_1min', speed_score_1min), ('speed_score_3min', speed_score_3min)):
+        if value is not None:
+            updates[field] = Greatest(Coalesce(F(field), Value(0)), Value(value))
+
+    CustomUser.objects.filter(pk=user_id).update(**updates)
+    bump_version(RANKING)
+
+
+# 문제 난이도/사용자 장르별 Elo 레이팅 갱신 (myapp/ratings.py)
+# attempts: [[question_id, is_correct], ...]
+@job('update_ratings')
+def update_ratings(user_id, attempts):
+    rate_answers(user_id, attempts)
+
+
+# 일간/주간/시즌 리더보드 점수 누적 (myapp/leaderboards.py, played_on: 세션 종료 날짜 ISO 문자열)
+@job('update_leaderboards')
+def update_leaderboards(user_id, score_delta, played_on):
+    record_score(user_id, score_delta, date.fromisoformat(played_on))
+
+
+# 제출 세션 하나의 후처리 전체 (문제 통계, 레이팅, 유저 점수, 리더보드)
+# 한 트랜잭션에서 실행되므로 중간에 실패하면 모두 되돌려지고 다시 처음부터 실행된다.
+@job('process_quiz_session')
+def process_quiz_session(session_id, user_id, attempts, score_delta, played_on, round_score=False, **best_scores):
+    record_question_stats(attempts)
+    update_ratings(user_id, attempts)
+    update_user_scores(user_id, score_delta, round_score=round_score, **best_scores)
+    update_leaderboards(user_id, score_delta, played_on)
@@ -1,3 +1,1222 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import async_views, db_pool, jobs, views
+from .answer_key import answer_key, grade_answers
+from .genres import genre_registry
+from .instrumentation import SerializeTimer
+from .metrics import Registry
+
+from .dedup import SignatureTable, find_duplicates, fingerprint_text, merge_duplicate_questions
+from . import leaderboards
+from .fast_serializers import serialize_question_deck, serialize_quiz_sessions, serialize_ranking_rows
+from .models import (
+    CustomUser, Genre, IdempotencyKey, Job, LeaderboardScore, LeaderboardSnapshot, Question, QuizResult, QuizSession, ReviewState,
+    SeenQuestions, UserGenreRating, WrongAnswer,
+)
+from .rankings import around, rank_of
+from .ratings import expected_score, rate_answers
+from .reviews import due_count, due_question_ids, schedule_reviews
+from .seen import genre_questions, mark_seen, sample_deck
+from .search import missing_search_triggers, rebuild_search_index, search_questions
+from .routers import ReplicaPinningMiddleware, ReplicaRouter, pin_to_primary, replica_reads, use_replica
+from .serializers import QuestionSerializer, QuizSessionSerializer
+from .wrong_notes import record_graded_answers
 
 # Create your tests here.
+
+
+# 경량 serializer 가 기존 DRF serializer 와 바이트 단위로 같은 JSON 을 만드는지 확인
+class FastSerializerParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.genre = Genre.objects.create(genre_name='과학')
+        cls.questions = [
+            Question.objects.create(
+                genre=cls.genre if i % 5 else None,
+                question_text=f'문제 {i}',
+                option1='지구', option2='Jupiter ', option3='토성', option4='화성',
+                answer='jupiter',
+                explanation=f'해설 {i}',
+            )
+            for i in range(12)
+        ]
+        cls.user = CustomUser.objects.create_user('tester', 'tester@example.com', 'pw12345678')
+        cls.other = CustomUser.objects.create_user(
+            'other', 'other@example.com', 'pw12345678', score=12.5, profile_image='profiles/other.png',
+        )
+
+        for quiz_type in ['test25', 'speed', 'wrong_note']:
+            session = QuizSession.objects.create(
+                user=cls.user, genre=cls.genre, quiz_type=quiz_type,
+                total_questions=6, correct_count=3, wrong_count=3, total_score=12,
+            )
+            for i, question in enumerate(cls.questions[:6]):
+                # 예전 기록(텍스트 저장)과 새 기록(보기 번호 저장)을 섞어서 생성
+                if i % 2:
+                    QuizResult.objects.create(
+                        session=session, question=question, user_answer='jupiter',
+                        correct_answer=question.answer, is_correct=True, score=4,
+                    )
+                else:
+                    QuizResult.objects.create(
+                        session=session, question=question, user_option=i % 4 + 1 if i else None,
+                        is_correct=False, score=0,
+                    )
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_question_deck(self):
+        questions = Question.objects.order_by('question_id')
+        expected = QuestionSerializer(questions, many=True).data
+        self.assertEqual(self.render(serialize_question_deck(questions)), self.render(expected))
+
+    def test_quiz_sessions(self):
+        sessions = QuizSession.objects.filter(user=self.user).order_by('-created_at', '-id')
+        expected = QuizSessionSerializer(sessions, many=True).data
+        self.assertEqual(self.render(serialize_quiz_sessions(sessions)), self.render(expected))
+
+    def test_ranking_rows(self):
+        users = CustomUser.objects.order_by('-score', 'id')
+        expected = [
+            {
+                'rank': rank,
+                'nickname': u.username,
+                'profile_image': u.profile_image.url if u.profile_image else None,
+                'score': u.score,
+            }
+            for rank, u in enumerate(users, start=1)
+        ]
+        rows = users.values_list('id', 'username', 'profile_image', 'score')
+        self.assertEqual(self.render(serialize_ranking_rows(rows)), self.render(expected))
+
+
+def make_questions(genre, count):
+    return [
+        Question.objects.create(
+            genre=genre, question_text=f'문제 {i}', option1='A', option2='B', option3='C', option4='D',
+            answer='B', explanation=f'해설 {i}',
+        )
+        for i in range(count)
+    ]
+
+
+# 오답 노트: 같은 문제를 다시 틀리면 행을 새로 만들지 않고 마지막으로 틀린 시간만 갱신
+class WrongNoteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.genre = Genre.objects.create(genre_name='역사')
+        cls.questions = make_questions(cls.genre, 3)
+        cls.user = CustomUser.objects.create_user('tester', 'tester@example.com', 'pw12345678')
+
+    def test_repeated_wrong_answer_updates_timestamp(self):
+        first, second, _ = self.questions
+        record_graded_answers(self.user, [(first.question_id, False)])
+        WrongAnswer.objects.update(updated_at=timezone.now() - timedelta(days=3))
+
+        record_graded_answers(self.user, [(first.question_id, False), (second.question_id, False)])
+
+        wrong = dict(WrongAnswer.objects.filter(user=self.user).values_list('question_id', 'updated_at'))
+        self.assertEqual(set(wrong), {first.question_id, second.question_id})
+        self.assertGreater(wrong[first.question_id], timezone.now() - timedelta(minutes=1))
+
+    def test_correct_answer_removes_entry(self):
+        first = self.questions[0]
+        record_graded_answers(self.user, [(first.question_id, False)])
+        record_graded_answers(self.user, [(first.question_id, False), (first.question_id, True)])
+        self.assertFalse(WrongAnswer.objects.filter(user=self.user).exists())
+
+    def test_non_numeric_genre_id_is_rejected(self):
+        record_graded_answers(self.user, [(self.questions[0].question_id, False)])
+        client = APIClient()
+        client.force_authenticate(self.user)
+        for path in ('/wrong-note/', '/wrong-note/deck/', '/wrong-note/due/'):
+            with self.subTest(path=path):
+                response = client.get(path, {'genre_id': 'abc'})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {"error": "genre_id는 숫자여야 합니다."})
+                self.assertEqual(client.get(path, {'genre_id': self.genre.pk}).status_code, 200)
+
+        self.assertEqual(len(client.get('/wrong-note/', {'genre_id': self.genre.pk}).json()), 1)
+        self.assertEqual(len(client.get('/wrong-note/deck/', {'genre_id': self.genre.pk + 1}).json()), 0)
+
+
+# 복제본 라우팅: 복제본 등록 여부는 replica_aliases 로 바꿔 가며 라우터의 선택만 확인 (실제 복제본 DB 없이)
+class ReplicaRouterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user('tester', 'tester@example.com', 'pw12345678')
+
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def replicas(self, aliases):
+        return mock.patch('myapp.routers.replica_aliases', return_value=aliases)
+
+    def routed_view(self, method='get', user=None):
+        @replica_reads
+        def view(request):
+            return HttpResponse(self.router.db_for_read(Question))
+
+        request = getattr(self.factory, method)('/')
+        request.user = user or self.user
+        return view(request).content.decode()
+
+    def test_reads_in_replica_views_go_to_replica(self):
+        with self.replicas(['replica_1']):
+            self.assertEqual(self.routed_view(), 'replica_1')
+            with use_replica():
+                self.assertEqual(self.router.db_for_write(Question), 'default')
+            self.assertEqual(self.router.db_for_read(Question), 'default')
+
+    def test_writes_in_replica_views_stay_on_primary(self):
+        with self.replicas(['replica_1']):
+            self.assertEqual(self.routed_view('post'), 'default')
+
+    def test_pinned_user_reads_from_primary(self):
+        with self.replicas(['replica_1']):
+            pin_to_primary(self.user)
+            self.assertEqual(self.routed_view(), 'default')
+
+    def test_successful_write_pins_user(self):
+        with self.replicas(['replica_1']):
+            for method, status in [('get', 200), ('post', 400), ('post', 201)]:
+                middleware = ReplicaPinningMiddleware(lambda request: HttpResponse(status=status))
+                request = getattr(self.factory, method)('/')
+                request.user = self.user
+                middleware(request)
+                self.assertEqual(self.routed_view(), 'replica_1' if status != 201 else 'default')
+
+    def test_without_replicas_everything_uses_primary(self):
+        with self.replicas([]):
+            self.assertEqual(self.routed_view(), 'default')
+            with use_replica():
+                self.assertEqual(self.router.db_for_read(Question), 'default')
+
+
+@jobs.job('test_fail', max_attempts=2)
+def failing_job(**payload):
+    raise RuntimeError('실패')
+
+
+# 커넥션 풀 믹스인: 실제 MySQL 대신 가짜 드라이버 커넥션으로 반납/폐기, 세션 초기화 생략, fork 후 새 풀 확인
+class FakeDriverConnection:
+    def __init__(self):
+        self.closed = False
+        self.rollbacks = 0
+        self.fail_rollback = False
+
+    def close(self):
+        self.closed = True
+
+    def rollback(self):
+        if self.fail_rollback:
+            raise RuntimeError('connection lost')
+        self.rollbacks += 1
+
+    def ping(self):
+        if self.closed:
+            raise RuntimeError('closed')
+
+
+# DatabaseWrapper 에서 믹스인이 쓰는 부분만 흉내 냄
+class FakeDatabaseWrapper:
+    def __init__(self, alias):
+        self.alias = alias
+        self.settings_dict = {'POOL': {'size': 2, 'timeout': 0.05}}
+        self.connection = None
+        self.in_atomic_block = False
+        self.errors_occurred = False
+        self.autocommit = True
+        self.session_inits = 0
+
+    def get_new_connection(self, conn_params):
+        return FakeDriverConnection()
+
+    def init_connection_state(self):
+        self.session_inits += 1
+
+    def check_database_version_supported(self):
+        pass
+
+    def get_autocommit(self):
+        return self.autocommit
+
+    def connect(self):
+        self.connection = self.get_new_connection({})
+        self.init_connection_state()
+
+    def close(self):
+        self._close()
+        self.connection = None
+
+
+class PooledFakeWrapper(db_pool.PooledConnectionMixin, FakeDatabaseWrapper):
+    pass
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    alias = 'pool-test'
+
+    def setUp(self):
+        self.addCleanup(db_pool._pools.pop, self.alias, None)
+
+    def wrapper(self):
+        return PooledFakeWrapper(self.alias)
+
+    def test_released_connection_is_reused_without_session_init(self):
+        first = self.wrapper()
+        first.connect()
+        conn = first.connection
+        first.close()
+        self.assertFalse(conn.closed)
+
+        second = self.wrapper()
+        second.connect()
+        self.assertIs(second.connection, conn)
+        self.assertEqual((first.session_inits, second.session_inits), (1, 0))
+
+    def test_connection_with_errors_or_open_transaction_is_discarded(self):
+        for attr in ('errors_occurred', 'in_atomic_block'):
+            with self.subTest(attr):
+                wrapper = self.wrapper()
+                wrapper.connect()
+                conn = wrapper.connection
+                setattr(wrapper, attr, True)
+                wrapper.close()
+                self.assertTrue(conn.closed)
+
+                other = self.wrapper()
+                other.connect()
+                self.assertIsNot(other.connection, conn)
+                self.assertEqual(other.session_inits, 1)
+                other.close()
+
+    def test_non_autocommit_connection_is_rolled_back_or_discarded(self):
+        wrapper = self.wrapper()
+        wrapper.connect()
+        conn = wrapper.connection
+        wrapper.autocommit = False
+        wrapper.close()
+        self.assertEqual((conn.rollbacks, conn.closed), (1, False))
+
+        wrapper.connect()
+        self.assertIs(wrapper.connection, conn)
+        conn.fail_rollback = True
+        wrapper.close()
+        self.assertTrue(conn.closed)
+
+    def test_pool_size_limit_times_out(self):
+        held = [self.wrapper() for _ in range(2)]
+        for wrapper in held:
+            wrapper.connect()
+        with self.assertRaises(db_pool.OperationalError):
+            self.wrapper().connect()
+        held[0].close()
+        self.wrapper().connect()
+
+    def test_forked_process_gets_new_pool(self):
+        parent = self.wrapper()
+        parent.connect()
+        conn = parent.connection
+        parent.close()
+
+        with mock.patch.object(db_pool.os, 'getpid', return_value=db_pool.os.getpid() + 1):
+            child = self.wrapper()
+            child.connect()
+        self.assertIsNot(child.connection, conn)
+        self.assertEqual(child.session_inits, 1)
+
+
+# 작업 큐: 가져가기(claim), 실패 시 지수 백오프 재시도, 재시도 종료 후 failed
+@override_settings(JOB_QUEUE_EAGER=False, JOB_RETRY_BASE_SECONDS=10, JOB_LOCK_TIMEOUT=300)
+class JobQueueTests(TestCase):
+    def test_claim_skips_future_and_reclaims_stale(self):
+        now = timezone.now()
+        ready = Job.objects.create(name='test_fail')
+        Job.objects.create(name='test_fail', run_at=now + timedelta(minutes=1))
+        stale = Job.objects.create(name='test_fail', status=Job.RUNNING, locked_at=now - timedelta(seconds=301))
+        Job.objects.create(name='test_fail', status=Job.RUNNING, locked_at=now)
+
+        claimed = jobs.claim('worker-1')
+        self.assertEqual({job.pk for job in claimed}, {ready.pk, stale.pk})
+        self.assertTrue(all(job.status == Job.RUNNING and job.locked_by == 'worker-1' for job in claimed))
+        self.assertEqual(jobs.claim('worker-2'), [])
+
+    def test_retry_backoff_then_failed(self):
+        self.assertEqual([jobs.retry_delay(n) for n in (1, 2, 3, 20)], [10, 20, 40, 3600])
+        job = jobs.enqueue('test_fail')
+
+        with self.assertLogs('myapp.jobs', 'WARNING'):
+            self.assertEqual(jobs.work_once('worker'), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertIn('RuntimeError', job.last_error)
+        self.assertAlmostEqual((job.run_at - timezone.now()).total_seconds(), 10, delta=2)
+        self.assertEqual(jobs.work_once('worker'), 0)  # 대기 시간 전에는 가져가지 않음
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        with self.assertLogs('myapp.jobs', 'ERROR'):
+            self.assertEqual(jobs.work_once('worker'), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+
+    def test_successful_job_is_deleted(self):
+        genre = Genre.objects.create(genre_name='과학')
+        question = make_questions(genre, 1)[0]
+        jobs.enqueue('record_question_stats', attempts=[[question.question_id, True]])
+        self.assertEqual(jobs.work_once('worker'), 1)
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(question.stats.total_attempts, 1)
+
+
+# 제출 중간에 실패하면 세션/결과가 남지 않음
+@override_settings(JOB_QUEUE_EAGER=False)
+class QuizSubmitAtomicTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.genre = Genre.objects.create(genre_name='과학')
+        cls.questions = make_questions(cls.genre, 3)
+        cls.user = CustomUser.objects.create_user('tester', 'tester@example.com', 'pw12345678')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def submit(self, answer='B'):
+        return self.client.post('/quiz/submit/', {
+            'genre_id': self.genre.pk, 'quiz_type': 'test25',
+            'quiz_results': [{'question_id': q.question_id, 'user_answer': answer} for q in self.questions],
+        }, format='json')
+
+    def test_submit_saves_session_and_enqueues_jobs(self):
+        self.assertEqual(self.submit().status_code, 201)
+        self.assertEqual(QuizResult.objects.filter(session__user=self.user).count(), 3)
+        job = Job.objects.get()
+        self.assertEqual(job.name, 'process_quiz_session')
+        self.assertEqual(job.payload['session_id'], QuizSession.objects.get(user=self.user).pk)
+        self.assertEqual(job.payload['attempts'], [])  # 보기 번호가 아닌 답은 선택하지 않은 것으로 처리
+
+    def test_reclaimed_session_job_applies_once(self):
+        self.submit(answer='2')
+        first = jobs.claim('worker-1')[0]
+        # worker-1 이 묶음 뒤쪽에서 기다리는 사이 JOB_LOCK_TIMEOUT 이 지나 worker-2 가 다시 가져감
+        Job.objects.update(locked_at=timezone.now() - timedelta(seconds=301))
+        second = jobs.claim('worker-2')[0]
+
+        self.assertEqual(jobs.run_job(second), 'done')
+        self.assertEqual(jobs.run_job(first), 'skipped')
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.score, 12)
+        self.assertEqual(set(LeaderboardScore.objects.filter(user=self.user).values_list('score', flat=True)), {12})
+        self.assertEqual(self.questions[0].stats.total_attempts, 1)
+        self.assertFalse(Job.objects.exists())
+
+    def test_failure_after_session_rolls_back(self):
+        with mock.patch('myapp.views.enqueue', side_effect=RuntimeError('queue down')):
+            with self.assertRaises(RuntimeError):
+                self.submit()
+        self.assertFalse(QuizSession.objects.filter(user=self.user).exists())
+        self.assertFalse(QuizResult.objects.exists())
+
+
+# 보기 번호 채점: 정답 인덱스, 인덱스가 오래된 경우 다시 확인, 정답이 보기에 없는 문제 거부
+@override_settings(JOB_QUEUE_EAGER=False, DATA_VERSION_CHECK_SECONDS=60)
+class GradingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.genre = Genre.objects.create(genre_name='과학')
+        cls.questions = make_questions(cls.genre, 3)
+        cls.user = CustomUser.objects.create_user('tester', 'tester@example.com', 'pw12345678')
+
+    def setUp(self):
+        # 다른 테스트에서 적재된 인덱스를 쓰지 않도록 처음 get() 에서 다시 적재
+        self.enterContext(mock.patch.object(answer_key, '_data', None))
+        self.enterContext(mock.patch.object(answer_key, '_version', None))
+
+    def test_grade_answers_by_option_number(self):
+        q1, q2, q3 = self.questions
+        graded = grade_answers([
+            {'question_id': q1.question_id, 'user_answer': '2'},
+            {'question_id': q2.question_id, 'user_answer': 1},
+            {'question_id': q3.question_id, 'user_answer': 'B'},
+            {'question_id': 'x', 'user_answer': '2'},
+        ])
+        self.assertEqual(graded, [
+            (q1.question_id, 2, True),
+            (q2.question_id, 1, False),
+            (q3.question_id, None, False),
+        ])
+
+    def test_missing_question_reloads_index_once(self):
+        answer_key.get()
+        # 다른 프로세스에서 추가된 문제처럼 이 프로세스의 인덱스는 아직 모름 (on_commit 무효화 없음)
+        added = make_questions(self.genre, 1)[0]
+        with mock.patch.object(answer_key, 'load', wraps=answer_key.load) as load:
+            graded = grade_answers([
+                {'question_id': added.question_id, 'user_answer': '2'},
+                {'question_id': added.question_id + 100, 'user_answer': '2'},
+                {'question_id': added.question_id + 101, 'user_answer': '2'},
+            ])
+        self.assertEqual(graded, [(added.question_id, 2, True)])
+        self.assertEqual(load.call_count, 1)
+
+    def test_submit_stores_selected_option(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        q1, q2, q3 = self.questions
+        response = client.post('/quiz/submit/', {
+            'genre_id': self.genre.pk, 'quiz_type': 'test25',
+            'quiz_results': [
+                {'question_id': q1.question_id, 'user_answer': '2'},
+                {'question_id': q2.question_id, 'user_answer': '2'},
+                {'question_id': q3.question_id, 'user_answer': '4'},
+            ],
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['summary']['정답 수'], 2)
+        self.assertEqual(response.json()['summary']['획득 점수'], 8)
+
+        results = QuizResult.objects.filter(session__user=self.user).order_by('question_id')
+        self.assertEqual(
+            [(r.user_option, r.is_correct, r.score) for r in results],
+            [(2, True, 4), (2, True, 4), (4, False, 0)],
+        )
+        self.assertEqual(QuizSession.objects.get(user=self.user).total_score, 8)
+
+    def test_clean_rejects_answer_not_in_options(self):
+        question = Question(
+            genre=self.genre, question_text='문제', option1='A', option2='B', option3='C', option4='D',
+            answer='E', explanation='',
+        )
+        with self.assertRaises(ValidationError) as error:
+            question.clean()
+        self.assertIn('answer', error.exception.message_dict)
+
+        question.answer = ' b '
+        question.clean()
+
+    def test_import_skips_answer_not_in_options(self):
+        rows = [
+            {
+                'genre_id': self.genre.pk, 'question_text': f'가져온 문제 {answer}',
+                'option1': '사과', 'option2': '배', 'option3': '감', 'option4': '귤',
+                'answer': answer, 'explanation': '',
+            }
+            for answer in ('배', '포도')
+        ]
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False)
+            f.flush()
+            out = StringIO()
+            call_command('import_questions', f.name, '--skip-dedup', stdout=out)
+
+        self.assertIn("[SKIP] 정답 '포도'", out.getvalue())
+        imported = Question.objects.get(question_text__startswith='가져온 문제')
+        self.assertEqual((imported.answer, imported.correct_option), ('배', 2))
+
+
+# Idempotency-Key: 같은 키 재시도는 저장된 응답, 다른 내용은 422, 처리 중이면 409
+@override_settings(JOB_QUEUE_EAGER=False, IDEMPOTENCY_WAIT_SECONDS=0)
+class IdempotentSubmitTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.genre = Genre.objects.create(genre_name='과학')
+        cls.questions = make_questions(cls.genre, 3)
+        cls.user = CustomUser.objects.create_user('tester', 'tester@example.com', 'pw12345678')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def submit(self, key, answer='B'):
+        return self.client.post('/quiz/submit/', {
+            'genre_id': self.genre.pk, 'quiz_type': 'test25',
+            'quiz_results': [{'question_id': q.question_id, 'user_answer': answer} for q in self.questions],
+        }, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_saved_response(self):
+        first = self.submit('key-1')
+        retry = self.submit('key-1')
+        self.assertEqual((first.status_code, retry.status_code), (201, 201))
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(QuizSession.objects.filter(user=self.user).count(), 1)
+
+    def test_same_key_with_different_body_is_rejected(self):
+        self.submit('key-1')
+        self.assertEqual(self.submit('key-1', answer='A').status_code, 422)
+        self.assertEqual(QuizSession.objects.filter(user=self.user).count(), 1)
+
+    def test_key_in_progress_returns_conflict(self):
+        self.submit('key-1')
+        IdempotencyKey.objects.filter(user=self.user, key='key-1').update(status=IdempotencyKey.PROCESSING)
+        response = self.submit('key-1')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_failed_request_releases_key(self):
+        with mock.patch('myapp.views.enqueue', side_effect=RuntimeError('queue down')):
+            with self.assertRaises(RuntimeError):
+                self.submit('key-1')
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self.submit('key-1').status_code, 201)
+
+
+# 문제 검색: SQLite 트리거 유지/복구, 전문 검색 인덱스가 없는 DB 는 icontains
+class QuestionSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.genre = Genre.objects.create(genre_name='과학')
+        cls.moon = Question.objects.create(
+            genre=cls.genre, question_text='달의 공전 주기는?', option1='A', option2='B', option3='C', option4='D',
+            answer='B', explanation='약 27일 Orbit',
+        )
+        cls.sun = Question.objects.create(
+            genre=cls.genre, question_text='태양의 표면 온도는?', option1='A', option2='B', option3='C', option4='D',
+            answer='B', explanation='약 5500도',
+        )
+
+    def found(self, query):
+        return [question_id for question_id, _ in search_questions(query)[0]]
+
+    def test_triggers_survive_migrations(self):
+        self.assertEqual(missing_search_triggers(connection), [])
+        self.assertEqual(self.found('공전 주기'), [self.moon.question_id])
+
+    def test_rebuild_restores_dropped_trigger(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER myapp_question_fts_ai')
+        self.assertEqual(missing_search_triggers(connection), ['myapp_question_fts_ai'])
+        added = make_questions(self.genre, 1)[0]
+        Question.objects.filter(pk=added.pk).update(question_text='혜성의 꼬리 방향은?')
+
+        self.assertTrue(rebuild_search_index(connection))
+        self.assertEqual(missing_search_triggers(connection), [])
+        self.assertEqual(self.found('혜성의 꼬리'), [added.question_id])
+
+    def test_short_terms_are_case_insensitive(self):
+        self.assertEqual(self.found('OR'), [self.moon.question_id])
+        self.assertEqual(self.found('or 달'), [self.moon.question_id])
+
+    def test_other_vendors_fall_back_to_icontains(self):
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            self.assertEqual(self.found('orbit 공전'), [self.moon.question_id])
+            self.assertEqual(self.found('약'), [self.moon.question_id, self.sun.question_id])
+
+
+# Elo: 답 하나마다 사용자 += K·(결과 - E), 문제 -= K·(결과 - E), 세션 안의 답은 순서대로 반영
+class EloRatingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.genre = Genre.objects.create(genre_name='과학')
+        cls.questions = make_questions(cls.genre, 2)
+        cls.user = CustomUser.objects.create_user('tester', 'tester@example.com', 'pw12345678')
+
+    def ratings(self):
+        user = UserGenreRating.objects.get(user=self.user, genre=self.genre)
+        questions = dict(Question.objects.values_list('question_id', 'rating'))
+        return user, [questions[q.question_id] for q in self.questions]
+
+    def test_correct_then_wrong(self):
+        first, second = self.questions
+        rate_answers(self.user.id, [[first.question_id, True], [second.question_id, False]])
+
+        user_after_first = 1500 + 40 * 0.5
+        surprise = -expected_score(user_after_first, 1500)
+        user, (first_rating, second_rating) = self.ratings()
+        self.assertAlmostEqual(user.rating, user_after_first + 40 * surprise)
+        self.assertEqual(user.attempts, 2)
+        self.assertAlmostEqual(first_rating, 1500 - 32 * 0.5)
+        self.assertAlmostEqual(second_rating, 1500 - 32 * surprise)
+
+    def test_repeated_question_uses_updated_rating(self):
+        first = self.questions[0]
+        rate_answers(self.user.id, [[first.question_id, True], [first.question_id, True]])
+
+        user, (first_rating, _) = self.ratings()
+        second_surprise = 1 - expected_score(1520, 1484)
+        self.assertAlmostEqual(user.rating, 1520 + 40 * second_surprise)
+        self.assertAlmostEqual(first_rating, 1484 - 32 * second_surprise)
+        self.assertEqual(Question.objects.get(pk=first.pk).rating_attempts, 2)
+
+
+# SM-2: 틀리면 1일, 맞히면 1일 → 6일 → 간격 × ease, 오늘 자정 전에 돌아오는 문제가 오늘 복습 대상
+class ReviewScheduleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.genre = Genre.objects.create(genre_name='과학')
+        cls.questions = make_questions(cls.genre, 3)
+        cls.user = CustomUser.objects.create_user('tester', 'tester@example.com', 'pw12345678')
+
+    def state(self, question):
+        return ReviewState.objects.get(user=self.user, question=question)
+
+    def test_intervals(self):
+        question = self.questions[0]
+        schedule_reviews(self.user, [(question.question_id, True)])
+        self.assertFalse(ReviewState.objects.exists())  # 처음 맞힌 문제는 일정 없음
+
+        schedule_reviews(self.user, [(question.question_id, False)])
+        intervals = [self.state(question).interval_days]
+        for _ in range(3):
+            schedule_reviews(self.user, [(question.question_id, True)])
+            intervals.append(self.state(question).interval_days)
+        state = self.state(question)
+        self.assertEqual(intervals[:3], [1, 1, 6])
+        self.assertEqual(intervals[3], round(6 * state.ease))
+        self.assertEqual(state.repetitions, 3)
+
+        schedule_reviews(self.user, [(question.question_id, False)])
+        state = self.state(question)
+        self.assertEqual((state.repetitions, state.interval_days), (0, 1))
+        self.assertLess(state.ease, 2.5)
+
+    def test_due_until_end_of_today(self):
+        noon = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0)
+        schedule_reviews(self.user, [(q.question_id, False) for q in self.questions])
+        later_today, tomorrow, overdue = self.questions
+        ReviewState.objects.filter(question=later_today).update(due_at=noon.replace(hour=23))
+        ReviewState.objects.filter(question=tomorrow).update(due_at=noon + timedelta(days=1))
+        ReviewState.objects.filter(question=overdue).update(due_at=noon - timedelta(days=2))
+
+        morning = noon.replace(hour=8)
+        self.assertEqual(due_question_ids(self.user, 10, now=morning), [overdue.question_id, later_today.question_id])
+        self.assertEqual(due_count(self.user, now=morning), 2)
+        self.assertEqual(due_question_ids(self.user, 10, genre_id=self.genre.pk, now=morning)[:1], [overdue.question_id])
+
+
+# 푼 문제 비트맵: 안 푼 문제 우선, 다 풀면 다시 한 바퀴, 문제 삭제/장르 변경 시 이전 세대 비트맵 무시
+class SeenQuestionsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.genre = Genre.objects.create(genre_name='과학')
+        cls.other = Genre.objects.create(genre_name='역사')
+        cls.questions = make_questions(cls.genre, 5)
+        cls.user = CustomUser.objects.create_user('tester', 'tester@example.com', 'pw12345678')
+
+    def setUp(self):
+        # 버전 확인 주기와 상관없이 매번 DB 에서 다시 적재
+        self.enterContext(mock.patch.object(genre_questions, 'get', genre_questions.load))
+        self.enterContext(mock.patch.object(genre_questions, 'refresh', genre_questions.load))
+
+    def ids(self, questions):
+        return {question.question_id for question in questions}
+
+    def deck(self, size):
+        return set(sample_deck(self.user, self.genre.pk, size))
+
+    def test_unseen_questions_first(self):
+        mark_seen(self.user, [q.question_id for q in self.questions[:3]])
+        self.assertEqual(self.deck(2), self.ids(self.questions[3:]))
+        deck = self.deck(4)
+        self.assertEqual(len(deck), 4)
+        self.assertLessEqual(self.ids(self.questions[3:]), deck)
+
+    def test_full_genre_starts_over(self):
+        mark_seen(self.user, [q.question_id for q in self.questions[:4]])
+        mark_seen(self.user, [self.questions[4].question_id])
+        self.assertEqual(self.deck(4), self.ids(self.questions[:4]))
+
+    def test_delete_discards_shifted_bitmap(self):
+        mark_seen(self.user, [q.question_id for q in self.questions[:3]])
+        self.questions[0].delete()
+        self.assertEqual(Genre.objects.get(pk=self.genre.pk).seen_epoch, 1)
+
+        # 이전 비트(순번 0~2)를 그대로 쓰면 남은 문제 중 엉뚱한 문제가 푼 문제로 남음
+        mark_seen(self.user, [self.questions[1].question_id])
+        self.assertEqual(self.deck(3), self.ids(self.questions[2:]))
+        self.assertEqual(SeenQuestions.objects.get(user=self.user, genre=self.genre).epoch, 1)
+
+    def test_stale_index_keeps_bits_of_newer_questions(self):
+        stale = genre_questions.load()
+        added = make_questions(self.genre, 2)
+        # 최신 인덱스를 가진 다른 프로세스가 새 문제를 푼 것으로 기록
+        mark_seen(self.user, [q.question_id for q in added])
+
+        with mock.patch.object(genre_questions, 'get', return_value=stale):
+            mark_seen(self.user, [self.questions[0].question_id])
+        self.assertEqual(self.deck(4), self.ids(self.questions[1:]))
+
+    def test_stale_index_does_not_start_over_early(self):
+        mark_seen(self.user, [q.question_id for q in self.questions[:4]])
+        stale = genre_questions.load()
+        added = make_questions(self.genre, 2)
+
+        # 오래된 인덱스로는 5문제를 다 푼 것처럼 보이지만 새 문제 2개가 남아 있음
+        with mock.patch.object(genre_questions, 'get', return_value=stale):
+            mark_seen(self.user, [self.questions[4].question_id])
+        self.assertEqual(self.deck(2), self.ids(added))
+
+    def test_genre_change_bumps_both_genres(self):
+        moved = self.questions[2]
+        moved.genre = self.other
+        moved.save()
+        self.assertEqual(
+            dict(Genre.objects.values_list('genre_id', 'seen_epoch')), {self.genre.pk: 1, self.other.pk: 1},
+        )
+        moved.question_text = '수정'
+        moved.save()
+        self.assertEqual(Genre.objects.get(pk=self.other.pk).seen_epoch, 1)
+
+
+# 중복 문제 병합: 사용자별 기록은 남길 문제로 옮기고, 푼 문제 비트맵은 무효화
+class MergeDuplicateQuestionsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.genre = Genre.objects.create(genre_name='과학')
+        cls.keep, cls.duplicate, cls.rest = make_questions(cls.genre, 3)
+        cls.user = CustomUser.objects.create_user('tester', 'tester@example.com', 'pw12345678')
+
+    def test_user_rows_follow_survivor(self):
+        record_graded_answers(self.user, [(self.duplicate.question_id, False)])
+        schedule_reviews(self.user, [(self.duplicate.question_id, False)])
+        with mock.patch.object(genre_questions, 'get', genre_questions.load):
+            mark_seen(self.user, [self.duplicate.question_id, self.rest.question_id])
+
+        self.assertEqual(merge_duplicate_questions(self.keep.question_id, [self.duplicate.question_id]), 1)
+
+        self.assertEqual(list(WrongAnswer.objects.values_list('question_id', flat=True)), [self.keep.question_id])
+        self.assertEqual(list(ReviewState.objects.values_list('question_id', flat=True)), [self.keep.question_id])
+        seen = SeenQuestions.objects.get(user=self.user, genre=self.genre)
+        self.assertNotEqual(seen.epoch, Genre.objects.get(pk=self.genre.pk).seen_epoch)
+
+    def test_results_keep_chosen_option_text(self):
+        # 같은 문제지만 보기 순서가 다르고, 보기 하나는 남길 문제에 없음
+        duplicate = Question.objects.create(
+            genre=self.genre, question_text='문제 0', option1='D', option2='B', option3='A', option4='E',
+            answer='B', explanation='해설',
+        )
+        session = QuizSession.objects.create(
+            user=self.user, genre=self.genre, quiz_type='test25',
+            total_questions=4, correct_count=1, wrong_count=3, total_score=4,
+        )
+        for option in (1, 2, 3, 4):
+            QuizResult.objects.create(
+                session=session, question=duplicate, user_option=option, is_correct=option == 2, score=4 if option == 2 else 0,
+            )
+
+        merge_duplicate_questions(self.keep.question_id, [duplicate.question_id])
+
+        results = QuizResult.objects.filter(session=session).select_related('question').order_by('id')
+        self.assertTrue(all(result.question_id == self.keep.question_id for result in results))
+        self.assertEqual([result.user_option for result in results], [4, 2, 1, None])
+        self.assertEqual([result.user_answer_text for result in results], ['d', 'b', 'a', 'e'])
+        self.assertEqual([result.is_correct for result in results], [False, True, False, False])
+
+
+# 유사 문제 탐지 (MinHash + LSH): 띄어쓰기/문장부호만 다른 문제는 찾고, 다른 문제나 정답이 다른 문제는 제외
+class FindDuplicatesTests(TestCase):
+    def test_near_duplicates(self):
+        texts = [
+            ('대한민국의 수도는 어디인가요?', '서울'),
+            ('다음 중 가장 큰 행성은 무엇인가요?', '목성'),
+            ('대한민국의 수도는 어디 인가요', '서울'),
+            ('대한민국의 수도는 어디인가요?', '부산'),
+            ('물의 화학식은 무엇인가요?', 'H2O'),
+        ]
+        table = SignatureTable()
+        for index, (question_text, answer) in enumerate(texts):
+            table.add(index, fingerprint_text(question_text, answer))
+
+        pairs = find_duplicates(table, threshold=0.8)
+        self.assertEqual([(i, j) for i, j, _ in pairs], [(0, 2)])
+        self.assertEqual(pairs[0][2], 1.0)
+
+
+# 기간별 리더보드: 기간 경계, 마감된 기간 얼리기(순위 변동 포함), 얼린 뒤 늦게 온 점수
+class LeaderboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [CustomUser.objects.create_user(f'user{i}', f'user{i}@example.com', 'pw12345678') for i in range(3)]
+
+    def test_windows(self):
+        day = date(2025, 2, 12)  # 수요일
+        self.assertEqual(leaderboards.window_start('weekly', day), date(2025, 2, 10))
+        self.assertEqual(leaderboards.window_end('weekly', date(2025, 2, 10)), date(2025, 2, 16))
+        self.assertEqual(leaderboards.window_start('season', day), date(2025, 1, 1))
+        self.assertEqual(leaderboards.window_end('season', date(2025, 10, 1)), date(2025, 12, 31))
+        self.assertEqual(leaderboards.previous_window('season', date(2025, 1, 1)), date(2024, 10, 1))
+
+    def test_rollover_freezes_closed_windows(self):
+        first, second, third = self.users
+        for user, score in [(first, 10), (second, 20), (third, 20)]:
+            leaderboards.record_score(user.id, score, date(2025, 2, 12))
+        for user, score in [(first, 30), (second, 5)]:
+            leaderboards.record_score(user.id, score, date(2025, 2, 19))
+
+        closed = leaderboards.close_windows(day=date(2025, 2, 19))
+        self.assertEqual(closed, [('daily', date(2025, 2, 12), 3), ('weekly', date(2025, 2, 10), 3)])
+        self.assertEqual(
+            list(LeaderboardSnapshot.objects.filter(period='weekly').order_by('rank').values_list('user_id', 'rank')),
+            [(third.id, 1), (second.id, 2), (first.id, 3)],  # 같은 점수는 user_id 가 큰 쪽이 앞
+        )
+        self.assertFalse(LeaderboardScore.objects.filter(period='weekly', window_start=date(2025, 2, 10)).exists())
+        self.assertEqual(leaderboards.close_windows(day=date(2025, 2, 19)), [])
+
+        leaderboards.close_windows(day=date(2025, 2, 26))
+        changes = dict(
+            LeaderboardSnapshot.objects.filter(period='weekly', window_start=date(2025, 2, 17)).values_list('user_id', 'rank_change')
+        )
+        self.assertEqual(changes, {first.id: 2, second.id: 0})
+
+    def test_late_score_skips_frozen_window(self):
+        user = self.users[0]
+        leaderboards.record_score(user.id, 10, date(2025, 2, 12))
+        leaderboards.freeze_window('daily', date(2025, 2, 12))
+
+        leaderboards.record_score(user.id, 5, date(2025, 2, 12))
+        self.assertFalse(LeaderboardScore.objects.filter(period='daily').exists())
+        self.assertEqual(LeaderboardSnapshot.objects.get(period='daily', user=user).score, 10)
+        weekly = LeaderboardScore.objects.get(period='weekly', user=user)
+        self.assertEqual((weekly.score, weekly.sessions), (15, 2))
+
+    def test_freeze_removes_rows_left_in_frozen_window(self):
+        user = self.users[0]
+        leaderboards.record_score(user.id, 10, date(2025, 2, 12))
+        leaderboards.freeze_window('daily', date(2025, 2, 12))
+        # 예전 버전 작업 등으로 얼린 뒤에 남은 누적 행
+        LeaderboardScore.objects.create(period='daily', window_start=date(2025, 2, 12), user=user, score=5, sessions=1)
+
+        self.assertEqual(leaderboards.close_windows(day=date(2025, 2, 13)), [('daily', date(2025, 2, 12), 0)])
+        self.assertFalse(LeaderboardScore.objects.filter(period='daily').exists())
+        self.assertEqual(leaderboards.close_windows(day=date(2025, 2, 13)), [])
+        self.assertEqual(LeaderboardSnapshot.objects.get(period='daily', user=user).score, 10)
+
+
+# 내 주변 랭킹: 전체 순위와 같은 구간, 정렬 없이 인덱스만 읽음 (SQLite 는 실행 계획으로 확인)
+class RankingAroundMeTests(TestCase):
+    FIELDS = ('id', 'username', 'profile_image', 'score')
+
+    @classmethod
+    def setUpTestData(cls):
+        scores = [50, 40, 40, 40, 30, 20, 20, 10]
+        cls.users = [
+            CustomUser.objects.create_user(f'user{i}', f'user{i}@example.com', 'pw12345678', score=score)
+            for i, score in enumerate(scores)
+        ]
+        for i, user in enumerate(cls.users):
+            leaderboards.record_score(user.id, scores[i], date(2025, 2, 12))
+
+    def ranked_ids(self):
+        return list(CustomUser.objects.order_by('-score', '-id').values_list('id', flat=True))
+
+    def mine(self, user):
+        return CustomUser.objects.filter(pk=user.pk).values_list(*self.FIELDS).get()
+
+    def test_window_matches_full_ranking(self):
+        ranked = self.ranked_ids()
+        for user in self.users:
+            start_rank, rows = around(CustomUser.objects.all(), 'score', 'id', self.FIELDS, self.mine(user), 2)
+            position = ranked.index(user.id)
+            self.assertEqual([row[0] for row in rows], ranked[max(0, position - 2):position + 3])
+            self.assertEqual(start_rank, max(0, position - 2) + 1)
+            self.assertEqual(rank_of(CustomUser.objects.all(), 'score', 'id', user.score, user.id), position + 1)
+
+    def test_ties_favour_higher_id(self):
+        tied = [user.id for user in self.users if user.score == 40]
+        ranked = self.ranked_ids()
+        self.assertEqual([ranked.index(user_id) for user_id in tied], [3, 2, 1])
+
+    def test_reads_index_without_sorting(self):
+        mine = self.mine(self.users[3])
+        weekly = leaderboards.live_scores('weekly', date(2025, 2, 10))
+        weekly_mine = weekly.filter(user=self.users[3]).values_list(*leaderboards.ENTRY_FIELDS).get()
+        with CaptureQueriesContext(connection) as queries:
+            around(CustomUser.objects.all(), 'score', 'id', self.FIELDS, mine, 2)
+            around(weekly, 'score', 'user_id', leaderboards.ENTRY_FIELDS, weekly_mine, 2)
+        self.assertEqual(len(queries), 6)  # 위 / 아래 / 순위 COUNT × 2
+        if connection.vendor != 'sqlite':
+            return
+        for query in queries:
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                plan = ' / '.join(row[-1] for row in cursor.fetchall())
+            self.assertNotIn('TEMP B-TREE', plan, query['sql'])
+            self.assertNotIn('MULTI-INDEX OR', plan, query['sql'])
+
+
+# 조건부 GET: ETag 발급, If-None-Match 일치 시 304, 랭킹 필드가 바뀔 때만 랭킹 ETag 변경
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user('tester', 'tester@example.com', 'pw12345678')
+        cls.other = CustomUser.objects.create_user('other', 'other@example.com', 'pw12345678')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def ranking_etag(self):
+        response = self.client.get('/quiz/ranking/', {'mode': 'total'})
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_matching_etag_returns_304(self):
+        response = self.client.get('/quiz/ranking/', {'mode': 'total'})
+        self.assertTrue(response['ETag'])
+        self.assertIn('private', response['Cache-Control'])
+
+        cached = self.client.get('/quiz/ranking/', {'mode': 'total'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b'')
+
+        other_mode = self.client.get('/quiz/ranking/', {'mode': 'solve'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(other_mode.status_code, 200)
+
+    def test_ranking_etag_changes_only_with_ranking_fields(self):
+        etag = self.ranking_etag()
+
+        self.other.last_login = timezone.now()
+        self.other.save(update_fields=['last_login'])
+        self.other.first_name = '길동'
+        self.other.save()
+        self.assertEqual(self.ranking_etag(), etag)
+
+        self.other.score = 10
+        self.other.save()
+        changed = self.ranking_etag()
+        self.assertNotEqual(changed, etag)
+
+        self.other.username = 'renamed'
+        self.other.save(update_fields=['username'])
+        self.assertNotEqual(self.ranking_etag(), changed)
+
+    def test_profile_etag_changes_on_save(self):
+        etag = self.client.get('/profile/')['ETag']
+        self.assertEqual(self.client.get('/profile/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.user.first_name = '길동'
+        self.user.save()
+        self.assertEqual(self.client.get('/profile/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+# async 조회 뷰가 sync 뷰와 같은 JSON / 같은 401 응답을 돌려주는지 (urls.py 는 설정에 따라 둘 중 하나만 연결하므로 직접 호출)
+class AsyncViewParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.genre = Genre.objects.create(genre_name='과학')
+        cls.user = CustomUser.objects.create_user('tester', 'tester@example.com', 'pw12345678', score=7.5)
+        CustomUser.objects.create_user('other', 'other@example.com', 'pw12345678', score=12)
+        for quiz_type, wrong_count in (('test25', 3), ('wrong_note', 0), ('speed', 1)):
+            QuizSession.objects.create(
+                user=cls.user, genre=cls.genre, quiz_type=quiz_type, total_questions=5,
+                correct_count=5 - wrong_count, wrong_count=wrong_count, total_score=(5 - wrong_count) * 4,
+            )
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def request(self, path, token=None, **params):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        return self.factory.get(path, params, **headers)
+
+    def call_both(self, sync_view, async_view, path, token=None, **params):
+        sync_response = sync_view(self.request(path, token, **params))
+        if hasattr(sync_response, 'render'):
+            sync_response.render()
+        async_response = async_to_sync(async_view)(self.request(path, token, **params))
+        return sync_response, async_response
+
+    def assertSameResponse(self, sync_response, async_response):
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(json.loads(async_response.content), json.loads(sync_response.content))
+
+    def test_same_json_as_sync_views(self):
+        token = str(AccessToken.for_user(self.user))
+        cases = [
+            (views.RankingView.as_view(), async_views.ranking, '/quiz/ranking/', {'mode': 'total'}),
+            (views.RankingView.as_view(), async_views.ranking, '/quiz/ranking/', {'mode': 'nope'}),
+            (views.get_quiz_sessions, async_views.quiz_sessions, '/quiz/sessions/', {}),
+        ]
+        for sync_view, async_view, path, params in cases:
+            with self.subTest(path=path, **params):
+                sync_response, async_response = self.call_both(sync_view, async_view, path, token, **params)
+                self.assertSameResponse(sync_response, async_response)
+                self.assertEqual(async_response.content, sync_response.content)
+
+    def test_same_401_for_missing_or_invalid_token(self):
+        for token in (None, 'not-a-jwt'):
+            for sync_view, async_view, path in (
+                (views.RankingView.as_view(), async_views.ranking, '/quiz/ranking/'),
+                (views.get_quiz_sessions, async_views.quiz_sessions, '/quiz/sessions/'),
+            ):
+                with self.subTest(path=path, token=token):
+                    sync_response, async_response = self.call_both(sync_view, async_view, path, token)
+                    self.assertEqual(sync_response.status_code, 401)
+                    self.assertSameResponse(sync_response, async_response)
+                    self.assertEqual(async_response['WWW-Authenticate'], sync_response['WWW-Authenticate'])
+
+
+# 관심 분야: 가입 API 응답 형식(interest_1~3 = 문자열 장르 ID)은 그대로, 저장은 UserInterest
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserInterestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.science = Genre.objects.create(genre_name='과학')
+        cls.history = Genre.objects.create(genre_name='역사')
+
+    def setUp(self):
+        self.enterContext(mock.patch.object(genre_registry, '_data', None))
+        self.enterContext(mock.patch.object(genre_registry, '_version', None))
+
+    def test_register_response_shape_and_no_genre_query(self):
+        genre_registry.get()
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().post('/register/', {
+                'username': 'newbie', 'email': 'newbie@example.com', 'password': 'pw12345678',
+                'interest_1': '역사', 'interest_2': '없는 장르', 'interest_3': '과학',
+            }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'message': 'Registration successful',
+            'data': {
+                'username': 'newbie', 'email': 'newbie@example.com',
+                'interest_1': str(self.history.pk), 'interest_2': None, 'interest_3': str(self.science.pk),
+            },
+        })
+        self.assertFalse([q for q in queries.captured_queries if 'FROM "myapp_genre"' in q['sql']])
+
+        user = CustomUser.objects.get(username='newbie')
+        self.assertEqual(
+            list(user.interests.order_by('slot').values_list('slot', 'genre_id')),
+            [(1, self.history.pk), (3, self.science.pk)],
+        )
+
+
+# 0022: 예전 문자열 interest_1~3 → UserInterest 슬롯 (숫자가 아니거나 없는 장르는 버림)
+class UserInterestMigrationTests(TransactionTestCase):
+    before = [('myapp', '0021_genre_question_count')]
+    after = [('myapp', '0022_userinterest')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_backfill_string_interests(self):
+        apps = self.migrate(self.before)
+        Genre = apps.get_model('myapp', 'Genre')
+        OldUser = apps.get_model('myapp', 'CustomUser')
+        science = Genre.objects.create(genre_name='과학')
+        history = Genre.objects.create(genre_name='역사')
+        user = OldUser.objects.create(
+            username='old', email='old@example.com', password='x',
+            interest_1=f' {history.pk} ', interest_2='과학', interest_3=str(science.pk),
+        )
+        empty = OldUser.objects.create(
+            username='empty', email='empty@example.com', password='x',
+            interest_1=None, interest_2='', interest_3='9999',
+        )
+
+        apps = self.migrate(self.after)
+        UserInterest = apps.get_model('myapp', 'UserInterest')
+        self.assertEqual(
+            list(UserInterest.objects.filter(user_id=user.pk).order_by('slot').values_list('slot', 'genre_id')),
+            [(1, history.pk), (3, science.pk)],
+        )
+        self.assertFalse(UserInterest.objects.filter(user_id=empty.pk).exists())
+
+
+# 요청 측정: Server-Timing 은 설정을 켜거나 스태프 요청에만, serialize 에는 DRF serializer .data 시간 포함
+class RequestTimingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user('tester', 'tester@example.com', 'pw12345678')
+        cls.staff = CustomUser.objects.create_user('staff', 'staff@example.com', 'pw12345678', is_staff=True)
+
+    def get_profile(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get('/profile/')
+
+    def test_server_timing_only_for_staff_by_default(self):
+        self.assertFalse(self.get_profile(self.user).has_header('Server-Timing'))
+        self.assertIn('serialize;dur=', self.get_profile(self.staff)['Server-Timing'])
+        with override_settings(SERVER_TIMING_HEADER=True):
+            self.assertIn('db;dur=', self.get_profile(self.user)['Server-Timing'])
+
+    def test_serializer_data_is_timed(self):
+        genre = Genre.objects.create(genre_name='과학')
+        questions = make_questions(genre, 2)
+
+        def slow_representation(instance):
+            time.sleep(0.01)
+            return {}
+
+        with mock.patch.object(QuestionSerializer, 'to_representation', side_effect=slow_representation):
+            QuestionSerializer(questions[0]).data  # 측정 중이 아니면 그대로
+            with SerializeTimer().track() as timer:
+                QuestionSerializer(questions[0]).data
+                QuestionSerializer(questions, many=True).data
+        self.assertGreaterEqual(timer.duration, 0.03)
+
+
+# /metrics: 토큰이 없으면 거부, 워커 파일 합산 (죽은 워커/같은 pid 를 물려받은 이전 워커 파일은 보관 파일로)
+class MetricsTests(TestCase):
+    def setUp(self):
+        self.directory = self.enterContext(tempfile.TemporaryDirectory())
+
+    def test_requires_token(self):
+        with override_settings(METRICS_TOKEN=None):
+            self.assertEqual(self.client.get('/metrics').status_code, 403)
+        with override_settings(METRICS_TOKEN='secret'):
+            self.assertEqual(self.client.get('/metrics').status_code, 403)
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+            response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'# TYPE http_requests_total counter', response.content)
+
+    def write_worker_file(self, pid, requests, connections):
+        with open(f'{self.directory}/metrics-{pid}.json', 'w', encoding='utf-8') as f:
+            json.dump({'pid': pid, 'metrics': {
+                'requests_total': {'type': 'counter', 'help': '', 'buckets': [], 'samples': {'[]': requests}},
+                'connections': {'type': 'gauge', 'help': '', 'buckets': [], 'samples': {'[]': connections}},
+            }}, f)
+
+    def test_dead_and_reused_pid_files_are_archived(self):
+        dead_pid = 2 ** 22 + 1  # pid_max 밖이라 살아 있을 수 없는 pid
+        self.write_worker_file(dead_pid, 5, 2)
+        self.write_worker_file(os.getpid(), 7, 3)  # 같은 pid 를 쓰던 이전 워커의 파일
+
+        with override_settings(METRICS_DIR=self.directory):
+            registry = Registry()
+            requests = registry.counter('requests_total', '')
+            registry.gauge('connections', '')
+            requests.inc()
+            registry.flush()
+            collected = registry.collect()
+
+        self.assertEqual(
+            {name for name in os.listdir(self.directory) if name.endswith('.json')},
+            {'metrics-archive.json', f'metrics-{os.getpid()}.json'},
+        )
+        self.assertEqual(collected['requests_total']['samples'], {'[]': 13})
+        self.assertEqual(collected['connections']['samples'], {})
@@ -0,0 +1,135 @@
+import logging
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .metrics import record_cache
+from .models import DataVersion
+
+logger = logging.getLogger(__name__)
+
+# 버전 키
+QUESTION_BANK = 'question_bank'
+RANKING = 'ranking'
+GENRES = 'genres'
+LEADERBOARD = 'leaderboard'
+
+
+# 사용자별 버전 키 (프로필 / 퀴즈 결과)
+def user_profile_key(user_id):
+    return f'user_profile:{user_id}'
+
+
+def user_results_key(user_id):
+    return f'user_results:{user_id}'
+
+
+# 현재 버전 조회 (없으면 0)
+def get_version(key):
+    version = DataVersion.objects.filter(key=key).values_list('version', flat=True).first()
+    return version or 0
+
+
+# 여러 키의 (버전, 마지막 변경 시각)을 한 번에 조회 (없는 키는 (0, None))
+def get_versions(keys):
+    found = {
+        key: (version, updated_at)
+        for key, version, updated_at in DataVersion.objects.filter(key__in=keys).values_list('key', 'version', 'updated_at')
+    }
+    return [found.get(key, (0, None)) for key in keys]
+
+
+# 버전 1 증가 (다른 프로세스의 인메모리 인덱스가 변경을 감지할 수 있게 함)
+def bump_version(key):
+    updated = DataVersion.objects.filter(key=key).update(
+        version=F('version') + 1,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        try:
+            with transaction.atomic():
+                DataVersion.objects.create(key=key, version=1)
+        except IntegrityError:
+            # 동시에 다른 요청이 먼저 만든 경우
+            DataVersion.objects.filter(key=key).update(
+                version=F('version') + 1,
+                updated_at=timezone.now(),
+            )
+
+    # 같은 프로세스의 인덱스는 커밋 직후 바로 다시 확인하도록 표시
+    def invalidate_local():
+        for index in VersionedIndex.instances:
+            if index.version_key == key:
+                index.invalidate()
+
+    transaction.on_commit(invalidate_local)
+
+
+# 버전 키가 바뀔 때만 다시 적재하는 프로세스 단위 인메모리 인덱스
+# 버전 확인은 DATA_VERSION_CHECK_SECONDS 마다 최대 한 번만 DB를 조회한다
+class VersionedIndex:
+    version_key = None
+    instances = []
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = None
+        self._version = None
+        self._checked_at = 0.0
+        VersionedIndex.instances.append(self)
+
+    @property
+    def check_interval(self):
+        return getattr(settings, 'DATA_VERSION_CHECK_SECONDS', 5)
+
+    def load(self):
+        raise NotImplementedError
+
+    def _is_fresh(self):
+        return self._data is not None and time.monotonic() - self._checked_at < self.check_interval
+
+    def get(self):
+        if self._is_fresh():
+            record_cache(type(self).__name__, hit=True)
+            return self._data
+
+        with self._lock:
+            if self._is_fresh():
+                record_cache(type(self).__name__, hit=True)
+                return self._data
+
+            version = get_version(self.version_key)
+            reload = self._data is None or version != self._version
+            if reload:
+                self._data = self.load()
+                self._version = version
+            self._checked_at = time.monotonic()
+        record_cache(type(self).__name__, hit=not reload)
+        return self._data
+
+    # async 뷰용 (버전 확인/재적재가 필요할 때만 스레드에서 DB 조회)
+    async def aget(self):
+        if self._is_fresh():
+            record_cache(type(self).__name__, hit=True)
+            return self._data
+        return await sync_to_async(self.get)()
+
+    def invalidate(self):
+        self._checked_at = 0.0
+
+    # 확인 주기를 기다리지 않고 지금 버전을 확인 (바뀌었으면 다시 적재)
+    def refresh(self):
+        self.invalidate()
+        return self.get()
+
+    # 워커 시작 시 미리 적재 (DB 연결 실패 시에는 첫 요청에서 적재)
+    def warm(self):
+        try:
+            self.get()
+        except DatabaseError:
+            logger.warning("%s 사전 적재 실패, 첫 요청에서 다시 시도합니다.", type(self).__name__, exc_info=True)
@@ -7,17 +7,38 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.permissions import AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser
 
+from django.db import transaction
 from django.db.models.functions import NullIf
 from django.db.models import F, FloatField, ExpressionWrapper, Case, Count, Sum, When, IntegerField, Q
 from django.utils import timezone
+from django.utils.crypto import constant_time_compare
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
-
-from .models import CustomUser, Question, Genre, QuizResult, QuizSession, QuestionStat
+from django.conf import settings
+from django.utils.decorators import method_decorator
+
+from .models import CustomUser, Question, QuizResult, QuizSession, WrongAnswer
+from .wrong_notes import record_graded_answers, build_wrong_note_deck
+from .answer_key import grade_answers
+from .jobs import enqueue
+from .idempotency import idempotent
+from .metrics import registry as metrics_registry
+from .routers import replica_reads
+from .genres import genre_catalog, genre_registry
+from .interests import interest_genre_ids, set_interests
+from .search import InvalidCursor, search_questions
+from .ratings import build_adaptive_deck
+from .reviews import due_count, due_question_ids, schedule_reviews
+from .seen import mark_seen, sample_deck
+from .leaderboards import ENTRY_FIELDS as LEADERBOARD_FIELDS, PERIODS as LEADERBOARD_PERIODS, leaderboard, live_scores, today, window_start
+from .rankings import RANKING_SCORE_FIELDS, around, rank_of
+from .conditional import around_me_state, conditional_view, daily_random, daily_facts_state, genre_catalog_state, leaderboard_state, profile_state, question_detail_state, ranking_state
+from .versioning import bump_version, user_results_key
+from .fast_serializers import serialize_question_ids, serialize_quiz_sessions, serialize_ranking_rows
 from .serializers import (
     UserSerializer,
     LoginSerializer,
@@ -25,9 +46,7 @@ from .serializers import (
     ResetPasswordSerializer,
     QuestionSerializer,
     QuizResultSerializer,
-    QuizSessionSerializer,
-    QuestionStatSerializer
-
+    WrongAnswerSerializer,
 )
 
 # keep-alive 명시
@@ -36,7 +55,15 @@ def index(request):
     response['Connection'] = 'keep-alive'
     return response
 
+# Prometheus 메트릭 (Bearer METRICS_TOKEN 필요, 토큰을 설정하지 않으면 항상 거부)
+def metrics(request):
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if not token or not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=403)
+    return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 import random
+from datetime import date
 
 User = get_user_model()
 
@@ -64,13 +91,7 @@ class LoginView(generics.GenericAPIView):
 
         refresh = RefreshToken.for_user(user)
 
-        interests = []
-        if user.interest_1:
-            interests.append(user.interest_1)
-        if user.interest_2:
-            interests.append(user.interest_2)
-        if user.interest_3:
-            interests.append(user.interest_3)
+        interests = [str(genre_id) for genre_id in interest_genre_ids(user)]
 
         return Response({
             'refresh': str(refresh),
@@ -117,6 +138,8 @@ class ResetPasswordView(generics.GenericAPIView):
 
 
 # ✅ 사용자 프로필
+@method_decorator(replica_reads, name='get')
+@method_decorator(conditional_view(profile_state), name='get')
 class UserProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -159,11 +182,8 @@ class UpdateInterestsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # 저장 (None도 허용됨)
-        user.interest_1 = interest_1
-        user.interest_2 = interest_2
-        user.interest_3 = interest_3
-        user.save()
+        # 저장 (None도 허용됨, 없는 장르는 무시)
+        set_interests(user, [interest_1, interest_2, interest_3])
 
         return Response(
             {"message": "관심 분야가 성공적으로 변경되었습니다."},
@@ -173,11 +193,9 @@ class UpdateInterestsView(APIView):
 # ✅ JWT 기반 해설 제공
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def get_random_explanations(request):
-    user = request.user
-    interests = [user.interest_1, user.interest_2, user.interest_3]
-    interests = [i for i in interests if i and i.isdigit()]
-    genre_ids = list(map(int, interests))
+    genre_ids = interest_genre_ids(request.user)
 
     questions = Question.objects.filter(genre_id__in=genre_ids)
     explanations = [q.explanation for q in random.sample(list(questions), min(3, len(questions)))]
@@ -185,84 +203,116 @@ def get_random_explanations(request):
 
 @csrf_exempt
 @require_GET
+@replica_reads
+@conditional_view(daily_facts_state)
 def get_daily_facts(request):
     email = request.GET.get('email')
 
     try:
         user = CustomUser.objects.get(email=email)
 
-        interests = [user.interest_1, user.interest_2, user.interest_3]
-        valid_genres = [int(i) for i in interests if i and i.isdigit()]
+        valid_genres = interest_genre_ids(user)
 
         if not valid_genres:
             return JsonResponse({'daily_facts': []}, status=200)
 
-        selected_genres = random.sample(valid_genres, min(3, len(valid_genres)))
+        rng = daily_random(user.id)
+        selected_genres = rng.sample(valid_genres, min(3, len(valid_genres)))
 
         daily_facts = []
         for genre_id in selected_genres:
-            try:
-                genre = Genre.objects.get(genre_id=genre_id)
-                questions = Question.objects.filter(genre=genre)
-                if questions.exists():
-                    question = random.choice(questions)
-                    daily_facts.append({
-                        'genre_name': genre.genre_name,
-                        'explanation': question.explanation
-                    })
-            except Genre.DoesNotExist:
+            genre_name = genre_registry.name(genre_id)
+            if genre_name is None:
                 continue
-
-        # ✅ 매 요청마다 새로운 상식 제공
+            questions = Question.objects.filter(genre_id=genre_id).order_by('question_id')
+            count = questions.count()
+            if count:
+                question = questions[rng.randrange(count)]
+                daily_facts.append({
+                    'genre_name': genre_name,
+                    'explanation': question.explanation
+                })
+
+        # ✅ 하루 동안 같은 상식 제공 (다음 날 새로운 상식, ETag 로 재전송 생략)
         return JsonResponse({'daily_facts': daily_facts}, safe=False, status=200)
 
     except CustomUser.DoesNotExist:
         return JsonResponse({'error': 'User not found'}, status=404)
 
 
+# 장르 목록 (장르별 문제 수 포함, 앱 시작 시 조회 → 바뀐 게 없으면 304)
+@method_decorator(conditional_view(genre_catalog_state), name='get')
+class GenreListView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response(genre_catalog())
+
+
 # 25문제
+@method_decorator(replica_reads, name='get')
 class Genre25QuestionView(APIView):
     def get(self, request):
         genre_id = request.query_params.get('genre_id')
         if not genre_id:
             return Response({"error": "genre_id is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        questions = Question.objects.filter(genre__genre_id=genre_id).order_by('?')[:25]
-        serializer = QuestionSerializer(questions, many=True)
-        return Response(serializer.data)
+        return Response(serialize_question_ids(sample_deck(request.user, genre_id, 25)))
 
 
 # 50문제
+@method_decorator(replica_reads, name='get')
 class Genre50QuestionView(APIView):
     def get(self, request):
         genre_id = request.query_params.get('genre_id')
         if not genre_id:
             return Response({"error": "genre_id is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        questions = Question.objects.filter(genre__genre_id=genre_id).order_by('?')[:50]
-        serializer = QuestionSerializer(questions, many=True)
-        return Response(serializer.data)
+        return Response(serialize_question_ids(sample_deck(request.user, genre_id, 50)))
 
 
 # 스피드퀴즈
+@method_decorator(replica_reads, name='get')
 class SpeedQuizView(APIView):
     def get(self, request):
         genre_id = request.query_params.get('genre_id')
         if not genre_id:
             return Response({"error": "genre_id is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        questions = Question.objects.filter(genre__genre_id=genre_id).order_by('?')[:100]
-        serializer = QuestionSerializer(questions, many=True)
-
         return Response({
             "time_options": [60, 180],  # 1분, 3분
-            "questions": serializer.data
+            "questions": serialize_question_ids(sample_deck(request.user, genre_id, 100))
         })
     
+# 적응형 덱 (장르별 내 레이팅으로 70% 정도 맞힐 난이도의 문제, 쉬운 문제부터)
+@method_decorator(replica_reads, name='get')
+class AdaptiveQuestionView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        genre_id = request.query_params.get('genre_id')
+        if not genre_id:
+            return Response({"error": "genre_id is required"}, status=status.HTTP_400_BAD_REQUEST)
+        if genre_registry.name(genre_id) is None:
+            return Response({"error": f"장르 ID {genre_id}에 해당하는 장르가 존재하지 않습니다."}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            size = int(request.query_params.get('size', 25))
+        except ValueError:
+            return Response({"error": "size는 숫자여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        size = max(1, min(size, 100))
+
+        rating, question_ids = build_adaptive_deck(request.user, int(genre_id), size)
+        return Response({
+            "rating": round(rating),
+            "questions": serialize_question_ids(question_ids),
+        })
+
 # 퀴즈 제출(퀴즈 결과까지 보여줌)
 class QuizSubmitView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
 
+    @idempotent
     def post(self, request, *args, **kwargs):
         user = request.user
         quiz_results = request.data.get('quiz_results')
@@ -275,105 +325,81 @@ class QuizSubmitView(generics.GenericAPIView):
                 "message": "필수 정보가 누락되었습니다. (quiz_results, genre_id, quiz_type)"
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            genre = Genre.objects.get(pk=genre_id)
-        except Genre.DoesNotExist:
+        # 장르 존재 확인 (인메모리 장르 레지스트리, DB 조회 없음)
+        if genre_registry.name(genre_id) is None:
             return Response({
                 "message": f"장르 ID {genre_id}에 해당하는 장르가 존재하지 않습니다."
             }, status=status.HTTP_404_NOT_FOUND)
 
-        total_score = 0
-        correct_count = 0
-        wrong_count = 0
-
-        # QuizSession 객체 생성 (start_time은 자동 설정됨)
-        quiz_session = QuizSession.objects.create(
-            user=user,
-            genre=genre,
-            quiz_type=quiz_type,
-            total_questions=len(quiz_results),
-            correct_count=0,
-            wrong_count=0,
-            total_score=0
-        )
-
-        # 퀴즈 결과 처리
+        # 답안 누락 확인
         for result in quiz_results:
-            question_id = result.get('question_id')
-            user_answer_raw = result.get('user_answer')
-
-            if user_answer_raw is None:
+            if result.get('user_answer') is None:
                 return Response({
-                    "message": f"문제 ID {question_id}의 사용자 답안이 없습니다."
+                    "message": f"문제 ID {result.get('question_id')}의 사용자 답안이 없습니다."
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            try:
-                question = Question.objects.get(question_id=question_id)
-
-                # 숫자형 인덱스를 보기 텍스트로 변환
-                options = {
-                    '1': question.option1,
-                    '2': question.option2,
-                    '3': question.option3,
-                    '4': question.option4,
-                }
-                user_answer = options.get(str(user_answer_raw), "").strip().lower()
-                correct_answer = str(question.answer).strip().lower()
-
-                is_correct = user_answer == correct_answer
-                score = 4 if is_correct else 0
-
-                if is_correct:
-                    correct_count += 1
-                else:
-                    wrong_count += 1
-
-                # 결과 저장 - 보기 선택한 경우에만 QuestionStat 업데이트
-                QuizResult.objects.create(
-                    session=quiz_session,
-                    question=question,
-                    user_answer=user_answer,
-                    correct_answer=question.answer,
-                    is_correct=is_correct,
-                    score=score
-                )
-
-                # 오직 보기 선택한 경우만 QuestionStat 반영
-                if user_answer and user_answer.strip():
-                    question_stat, created = QuestionStat.objects.get_or_create(question=question)
-                    question_stat.total_attempts += 1
-                    if is_correct:
-                        question_stat.correct_attempts += 1
-                    question_stat.save()
-
-                total_score += score
+        # 인메모리 정답 인덱스로 채점 (문제 조회 없음)
+        graded = grade_answers(quiz_results)
 
-            except Question.DoesNotExist:
-                continue  # 존재하지 않는 질문은 건너뜀
-
-        # 세션 정보 업데이트
-        quiz_session.correct_count = correct_count
-        quiz_session.wrong_count = wrong_count
-        quiz_session.total_score = total_score
-        quiz_session.end_time = timezone.now()  # 퀴즈 종료 시간 설정
-        quiz_session.save()
+        # 인덱스 갱신 전에 삭제된 문제는 건너뜀 (PK 인덱스만 조회)
+        existing = set(Question.objects.filter(question_id__in=[g.question_id for g in graded]).values_list('question_id', flat=True))
+        graded = [g for g in graded if g.question_id in existing]
 
-        if user.score is None:
-            user.score = 0
-        user.score += total_score
+        correct_count = sum(1 for g in graded if g.is_correct)
+        wrong_count = len(graded) - correct_count
+        total_score = correct_count * 4
 
+        best_scores = {}
         if quiz_type in ['test25', 'test50']:
-            user.solve_score = max(user.solve_score or 0, total_score)
+            best_scores['solve_score'] = total_score
 
         if quiz_type == 'speed':
             selected_time = str(request.data.get('selected_time'))
 
             if selected_time in ["1min", "1", "60"]:  # 1분 스피드 허용
-                user.speed_score_1min = max(user.speed_score_1min or 0, total_score)
+                best_scores['speed_score_1min'] = total_score
             elif selected_time in ["3min", "3", "180"]:  # 3분 스피드 허용
-                user.speed_score_3min = max(user.speed_score_3min or 0, total_score)
-                
-        user.save()
+                best_scores['speed_score_3min'] = total_score
+
+        # 세션/결과/오답 노트 저장과 작업 등록은 한 트랜잭션으로 (중간에 실패하면 반쯤 저장된 제출이 남지 않음)
+        with transaction.atomic():
+            # QuizSession 객체 생성 (start_time은 자동 설정됨)
+            quiz_session = QuizSession.objects.create(
+                user=user,
+                genre_id=int(genre_id),
+                quiz_type=quiz_type,
+                total_questions=len(quiz_results),
+                correct_count=correct_count,
+                wrong_count=wrong_count,
+                total_score=total_score,
+                end_time=timezone.now()  # 퀴즈 종료 시간 설정
+            )
+
+            QuizResult.objects.bulk_create([
+                QuizResult(
+                    session=quiz_session,
+                    question_id=g.question_id,
+                    user_option=g.selected,
+                    is_correct=g.is_correct,
+                    score=4 if g.is_correct else 0
+                )
+                for g in graded
+            ])
+
+            # 오답 노트/복습 일정 갱신 (틀린 문제 추가, 맞힌 문제 제거)
+            record_graded_answers(user, [(g.question_id, g.is_correct) for g in graded])
+            schedule_reviews(user, [(g.question_id, g.is_correct) for g in graded])
+
+            # 덱에서 다시 나오지 않도록 푼 문제로 표시
+            mark_seen(user, [g.question_id for g in graded])
+
+            # 문제 통계/레이팅/유저 점수는 백그라운드 작업으로 (오직 보기 선택한 경우만 QuestionStat/레이팅 반영)
+            attempts = [[g.question_id, g.is_correct] for g in graded if g.selected]
+            enqueue(
+                'process_quiz_session', session_id=quiz_session.id, user_id=user.id, attempts=attempts,
+                score_delta=total_score, played_on=quiz_session.end_time.date().isoformat(), **best_scores,
+            )
+            bump_version(user_results_key(user.id))
 
         return Response({
             "message": "퀴즈 결과가 성공적으로 저장되었습니다.",
@@ -422,9 +448,10 @@ class ResetProfileImageView(APIView):
 # 마이페이지 최근 퀴즈 내역
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def get_quiz_results(request):
     user = request.user
-    quiz_results = QuizResult.objects.filter(session__user=user).order_by('-submission_time')[:10]
+    quiz_results = QuizResult.objects.filter(session__user=user).select_related('question').order_by('-submission_time')[:10]
 
     serializer = QuizResultSerializer(quiz_results, many=True)
     return Response(serializer.data)
@@ -432,6 +459,7 @@ def get_quiz_results(request):
 # 최근 퀴즈 결과
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def get_quiz_sessions(request):
     user = request.user
 
@@ -444,18 +472,47 @@ def get_quiz_sessions(request):
         )
         # ── 오답노트에서 wrong_count=0인 세션만 제거
         .exclude(quiz_type='wrong_note', wrong_count=0)
-        .prefetch_related(
-            'quizresult_set__question',
-            'quizresult_set__question__genre'
-        )
-        .select_related('genre')
         .order_by('-created_at')[:20]
     )
 
-    serializer = QuizSessionSerializer(quiz_sessions, many=True)
-    return Response(serializer.data)
+    return Response(serialize_quiz_sessions(quiz_sessions))
+
+# 문제/해설 검색 (관련도 순, 커서 페이지네이션: 응답의 next_cursor 를 cursor 로 다시 보내면 다음 페이지)
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 50
+
+
+@method_decorator(replica_reads, name='get')
+class QuestionSearchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "q is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            genre_id = request.query_params.get('genre_id')
+            genre_id = int(genre_id) if genre_id else None
+            limit = int(request.query_params.get('limit', SEARCH_PAGE_SIZE))
+        except ValueError:
+            return Response({"error": "genre_id, limit 은 숫자여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, SEARCH_MAX_PAGE_SIZE))
+
+        try:
+            rows, next_cursor = search_questions(query, genre_id, request.query_params.get('cursor'), limit)
+        except InvalidCursor:
+            return Response({"error": "유효하지 않은 cursor 입니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        question_ids = [question_id for question_id, _ in rows]
+        return Response({
+            "results": serialize_question_ids(question_ids),
+            "next_cursor": next_cursor,
+        })
 
 # 문제 및 해설 상세 조회 뷰
+@method_decorator(replica_reads, name='get')
+@method_decorator(conditional_view(question_detail_state), name='get')
 class QuestionDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -471,7 +528,7 @@ class QuestionDetailView(APIView):
             ).first()
 
             # user_answer가 존재할 경우 가져오고, 없으면 None
-            user_answer = quiz_result.user_answer if quiz_result else None
+            user_answer = quiz_result.user_answer_text if quiz_result else None
 
             # 해당 퀴즈 결과의 세션 정보(quiz_type 포함) 조회
             quiz_session = quiz_result.session if quiz_result else None
@@ -500,6 +557,7 @@ class QuestionDetailView(APIView):
 class WrongNoteSubmitView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @idempotent
     def post(self, request):
         user = request.user
         quiz_results = request.data.get("quiz_results")
@@ -510,86 +568,59 @@ class WrongNoteSubmitView(APIView):
         if not quiz_results:
             return Response({"message": "quiz_results가 필요합니다."}, status=400)
 
-        if origin_session_id:
-            QuizSession.objects.filter(id=origin_session_id, user=user).delete()
-        else:
-            # 기존 오답노트 세션 전부 제거 (기존 로직 유지)
-            QuizSession.objects.filter(user=user, quiz_type=quiz_type).delete()
-
-        total_score = 0.0
-        correct_count = 0
-        wrong_count = 0
-        first_genre = None
-
-        # 2) 채점만 먼저 돌려서 통계 집계 & 첫 문제의 장르 저장
-        for item in quiz_results:
-            qid = item.get("question_id")
-            idx = item.get("user_answer")
-            try:
-                q = Question.objects.get(question_id=qid)
-                if first_genre is None:
-                    first_genre = q.genre
-                # 보기 텍스트 매핑
-                opts = {"1": q.option1, "2": q.option2, "3": q.option3, "4": q.option4}
-                ua = opts.get(str(idx), "").strip().lower()
-                ca = str(q.answer).strip().lower()
-                is_correct = (ua == ca)
-                score = 1 if is_correct else 0.0
-
-                total_score += score
-                correct_count += int(is_correct)
-                wrong_count += int(not is_correct)
-            except Question.DoesNotExist:
-                continue
-
-        # 3) 새 세션 생성 (장르와 quiz_type 모두 채워짐)
-        session = QuizSession.objects.create(
-            user=user,
-            genre=first_genre,
-            quiz_type=quiz_type,
-            total_questions=total_questions,
-            correct_count=correct_count,
-            wrong_count=wrong_count,
-            total_score=total_score,
-            end_time=timezone.now()
-        )
+        # 이전 세션 삭제부터 작업 등록까지 한 트랜잭션으로
+        with transaction.atomic():
+            if origin_session_id:
+                QuizSession.objects.filter(id=origin_session_id, user=user).delete()
+            else:
+                # 기존 오답노트 세션 전부 제거 (기존 로직 유지)
+                QuizSession.objects.filter(user=user, quiz_type=quiz_type).delete()
+
+            # 2) 인메모리 정답 인덱스로 채점 & 첫 문제의 장르 조회 (삭제된 문제는 건너뜀)
+            graded = grade_answers(quiz_results)
+            genre_ids = dict(Question.objects.filter(question_id__in=[g.question_id for g in graded]).values_list('question_id', 'genre_id'))
+            graded = [g for g in graded if g.question_id in genre_ids]
+
+            correct_count = sum(1 for g in graded if g.is_correct)
+            wrong_count = len(graded) - correct_count
+            total_score = float(correct_count)
+            first_genre_id = genre_ids[graded[0].question_id] if graded else None
+
+            # 3) 새 세션 생성 (장르와 quiz_type 모두 채워짐)
+            session = QuizSession.objects.create(
+                user=user,
+                genre_id=first_genre_id,
+                quiz_type=quiz_type,
+                total_questions=total_questions,
+                correct_count=correct_count,
+                wrong_count=wrong_count,
+                total_score=total_score,
+                end_time=timezone.now()
+            )
 
-        # 4) 개별 문제 기록 저장
-        for item in quiz_results:
-            qid = item.get("question_id")
-            idx = item.get("user_answer")
-            try:
-                q = Question.objects.get(question_id=qid)
-                opts = {"1": q.option1, "2": q.option2, "3": q.option3, "4": q.option4}
-                ua = opts.get(str(idx), "").strip().lower()
-                ca = str(q.answer)
-                is_correct = (ua == ca.strip().lower())
-                sc = 1 if is_correct else 0.0
-
-                QuizResult.objects.create(
+            # 4) 개별 문제 기록 저장
+            QuizResult.objects.bulk_create([
+                QuizResult(
                     session=session,
-                    question=q,
-                    user_answer=ua,
-                    correct_answer=q.answer,
-                    is_correct=is_correct,
-                    score=sc
+                    question_id=g.question_id,
+                    user_option=g.selected,
+                    is_correct=g.is_correct,
+                    score=1 if g.is_correct else 0.0
                 )
-
-                question_stat, created = QuestionStat.objects.get_or_create(question=q)
-                question_stat.total_attempts += 1
-                if is_correct:
-                    question_stat.correct_attempts += 1
-                question_stat.save()
-                
-            except Question.DoesNotExist:
-                continue
-
-        # 5) 유저 누적 점수 갱신 (0.2점 단위, 반올림 적용)
-        if user.score is None:
-            user.score = 0.0
-
-        user.score = round(user.score + total_score, 1)  # 🔥 부동소수점 정리
-        user.save()
+                for g in graded
+            ])
+
+            # 오답 노트 갱신 (다시 맞힌 문제는 오답 노트에서 제거), 복습 간격 조정
+            record_graded_answers(user, [(g.question_id, g.is_correct) for g in graded])
+            schedule_reviews(user, [(g.question_id, g.is_correct) for g in graded])
+
+            # 5) 문제 통계/레이팅/유저 누적 점수는 백그라운드 작업으로 (점수는 반올림 적용 🔥 부동소수점 정리)
+            attempts = [[g.question_id, g.is_correct] for g in graded]
+            enqueue(
+                'process_quiz_session', session_id=session.id, user_id=user.id, attempts=attempts,
+                score_delta=total_score, played_on=session.end_time.date().isoformat(), round_score=True,
+            )
+            bump_version(user_results_key(user.id))
 
         return Response({
             "message": "오답노트 채점 결과 저장 완료",
@@ -600,21 +631,82 @@ class WrongNoteSubmitView(APIView):
             }
         }, status=status.HTTP_201_CREATED)
     
+# 오답 노트 조회 (현재 틀린 문제 목록)
+@method_decorator(replica_reads, name='get')
+class WrongNoteListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        wrong_answers = (
+            WrongAnswer.objects
+            .filter(user=request.user)
+            .select_related('question')
+            .order_by('-updated_at')
+        )
+
+        try:
+            genre_id = int(request.query_params.get('genre_id') or 0) or None
+        except ValueError:
+            return Response({"error": "genre_id는 숫자여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        if genre_id:
+            wrong_answers = wrong_answers.filter(question__genre_id=genre_id)
+
+        serializer = WrongAnswerSerializer(wrong_answers, many=True)
+        return Response(serializer.data)
+
+# 오답 노트 덱 (현재 틀린 문제 중에서 무작위 출제)
+@method_decorator(replica_reads, name='get')
+class WrongNoteDeckView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            size = int(request.query_params.get('size', 25))
+        except ValueError:
+            return Response({"error": "size는 숫자여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        size = max(1, min(size, 100))
+
+        try:
+            genre_id = int(request.query_params.get('genre_id') or 0) or None
+        except ValueError:
+            return Response({"error": "genre_id는 숫자여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        questions = build_wrong_note_deck(request.user, size, genre_id)
+        serializer = QuestionSerializer(questions, many=True)
+        return Response(serializer.data)
+
+# 오늘 복습할 오답 덱 (복습 시각이 지난 문제, 오래 기다린 것부터)
+@method_decorator(replica_reads, name='get')
+class WrongNoteDueView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            size = int(request.query_params.get('size', 25))
+        except ValueError:
+            return Response({"error": "size는 숫자여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        size = max(1, min(size, 100))
+
+        try:
+            genre_id = int(request.query_params.get('genre_id') or 0) or None
+        except ValueError:
+            return Response({"error": "genre_id는 숫자여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        question_ids = due_question_ids(request.user, size, genre_id)
+        return Response({
+            "due_count": due_count(request.user),
+            "questions": serialize_question_ids(question_ids),
+        })
+
 # 랭킹
+@method_decorator(replica_reads, name='get')
+@method_decorator(conditional_view(ranking_state), name='get')
 class RankingView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         mode = request.query_params.get('mode', 'speed_1min')  # 기본값은 1분
 
-        print("💡 현재 mode:", mode)  # 디버깅
-        cache_key = f'ranking_{mode}'
-
-        # 캐시 사용 (문제 확인 후 주석 풀기)
-        # cached_data = cache.get(cache_key)
-        # if cached_data:
-        #     return Response(cached_data)
-
         user = request.user
         ranking_data = {
             'top_rankings': [],
@@ -642,40 +734,91 @@ class RankingView(APIView):
                 'score': u.score,
             }.get(field, 0)
 
-        users = CustomUser.objects.order_by(F(score_field).desc(nulls_last=True))[:100]
-
-        for rank, user_obj in enumerate(users, start=1):
-            score = get_user_score(user_obj, score_field)
-            ranking_data['top_rankings'].append({
-                'rank': rank,
-                'nickname': user_obj.username,
-                'profile_image': user_obj.profile_image.url if user_obj.profile_image else None,
-                'score': score
-            })
+        rows = list(
+            CustomUser.objects
+            .order_by(F(score_field).desc(nulls_last=True), '-id')
+            .values_list('id', 'username', 'profile_image', score_field)[:100]
+        )
+        ranking_data['top_rankings'] = serialize_ranking_rows(rows)
 
-            if user_obj.id == user.id:
-                ranking_data['my_ranking'] = ranking_data['top_rankings'][-1]
+        for (user_id, *_), entry in zip(rows, ranking_data['top_rankings']):
+            if user_id == user.id:
+                ranking_data['my_ranking'] = entry
 
         # 100위 밖 유저
         if not ranking_data['my_ranking']:
             my_score = get_user_score(user, score_field)
-            higher_count = CustomUser.objects.only(score_field).filter(
-                **{f"{score_field}__gt": my_score}
-            ).count()
-
             ranking_data['my_ranking'] = {
-                'rank': higher_count + 1,
+                'rank': rank_of(CustomUser.objects.all(), score_field, 'id', my_score, user.id),
                 'nickname': user.username,
                 'profile_image': user.profile_image.url if user.profile_image else None,
                 'score': my_score
             }
 
-        # 캐싱 적용 (필요 시 다시 활성화)
-        # cache.set(cache_key, ranking_data, 300)
         return Response(ranking_data)
     
+# 내 주변 랭킹 (mode 의 내 순위 위아래 size 명, mode: 랭킹 모드 또는 daily/weekly/season 진행 중인 리더보드)
+AROUND_ME_SIZE = 5
+AROUND_ME_MAX_SIZE = 50
+
+
+@method_decorator(replica_reads, name='get')
+@method_decorator(conditional_view(around_me_state), name='get')
+class RankingAroundMeView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        mode = request.query_params.get('mode', 'speed_1min')
+        try:
+            size = int(request.query_params.get('size', AROUND_ME_SIZE))
+        except ValueError:
+            return Response({"error": "size는 숫자여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        size = max(1, min(size, AROUND_ME_MAX_SIZE))
+
+        user = request.user
+        if mode in RANKING_SCORE_FIELDS:
+            score_field = RANKING_SCORE_FIELDS[mode]
+            queryset, key_field = CustomUser.objects.all(), 'id'
+            fields = ('id', 'username', 'profile_image', score_field)
+            mine = (user.id, user.username, user.profile_image.name or None, getattr(user, score_field))
+        elif mode in LEADERBOARD_PERIODS:
+            score_field, key_field, fields = 'score', 'user_id', LEADERBOARD_FIELDS
+            queryset = live_scores(mode, window_start(mode, today()))
+            mine = queryset.filter(user=user).values_list(*fields).first()
+            if mine is None:
+                return Response({'rankings': [], 'my_ranking': {}})
+        else:
+            return Response({'error': '유효하지 않은 mode입니다. (speed_1min, speed_3min, solve, total, daily, weekly, season 중 선택)'}, status=400)
+
+        start_rank, rows = around(queryset, score_field, key_field, fields, mine, size)
+        rankings = serialize_ranking_rows(rows, start_rank=start_rank)
+        return Response({
+            'rankings': rankings,
+            'my_ranking': next(entry for (row_key, *_), entry in zip(rows, rankings) if row_key == user.id),
+        })
+
+# 기간별 리더보드 (period: daily, weekly, season / date: 그 날짜가 속한 기간, 기본 오늘)
+@method_decorator(replica_reads, name='get')
+@method_decorator(conditional_view(leaderboard_state), name='get')
+class LeaderboardView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        period = request.query_params.get('period', 'weekly')
+        if period not in LEADERBOARD_PERIODS:
+            return Response({'error': '유효하지 않은 period입니다. (daily, weekly, season 중 선택)'}, status=400)
+
+        day = request.query_params.get('date')
+        try:
+            day = date.fromisoformat(day) if day else today()
+        except ValueError:
+            return Response({'error': 'date는 YYYY-MM-DD 형식이어야 합니다.'}, status=400)
+
+        return Response(leaderboard(period, day, request.user))
+
 # 정답률에 따른 문제 추천
 
+@method_decorator(replica_reads, name='get')
 class DailyRecommendationView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -683,15 +826,11 @@ class DailyRecommendationView(APIView):
         user = request.user
 
         # 관심 장르 추출
-        raw_ids = [user.interest_1, user.interest_2, user.interest_3]
-        try:
-            interest_ids = [int(i) for i in raw_ids if i]
-        except ValueError:
-            interest_ids = []
+        interest_ids = interest_genre_ids(user)
 
         # ✅ 보기 선택된 문제만 필터링
         user_results = QuizResult.objects.filter(
-            Q(user_answer__isnull=False) & ~Q(user_answer=""),
+            Q(user_option__isnull=False) | (Q(user_answer__isnull=False) & ~Q(user_answer="")),
             # session__user=user,
             session__genre__genre_id__in=interest_ids
         ).values('question').annotate(
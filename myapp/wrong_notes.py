@@ -0,0 +1,42 @@
+import random
+
+from django.utils import timezone
+
+from .models import Question, WrongAnswer
+
+
+# 채점 결과를 오답 노트에 반영 (틀리면 추가, 다시 맞히면 제거)
+# graded: (question_id, is_correct) 목록. 같은 문제가 여러 번 나오면 마지막 결과 기준
+def record_graded_answers(user, graded):
+    latest = {}
+    for question_id, is_correct in graded:
+        latest[question_id] = is_correct
+
+    solved_ids = [qid for qid, is_correct in latest.items() if is_correct]
+    wrong_ids = [qid for qid, is_correct in latest.items() if not is_correct]
+
+    if solved_ids:
+        WrongAnswer.objects.filter(user=user, question_id__in=solved_ids).delete()
+
+    if wrong_ids:
+        # 이미 있는 문제는 마지막으로 틀린 시간만 갱신하고 없는 문제만 추가
+        # (MySQL 은 unique_fields 를 지정한 update_conflicts 를 지원하지 않으므로 UPDATE + INSERT IGNORE)
+        WrongAnswer.objects.filter(user=user, question_id__in=wrong_ids).update(updated_at=timezone.now())
+        WrongAnswer.objects.bulk_create(
+            [WrongAnswer(user=user, question_id=qid) for qid in wrong_ids],
+            ignore_conflicts=True,
+        )
+
+
+# 오답 노트에서 문제 덱 구성 (인덱스로 문제 ID만 읽고 그 중에서 무작위 추출)
+def build_wrong_note_deck(user, size, genre_id=None):
+    wrong_answers = WrongAnswer.objects.filter(user=user)
+    if genre_id:
+        wrong_answers = wrong_answers.filter(question__genre_id=genre_id)
+
+    question_ids = list(wrong_answers.values_list('question_id', flat=True))
+    picked = random.sample(question_ids, min(size, len(question_ids)))
+
+    questions = Question.objects.filter(question_id__in=picked)
+    order = {qid: i for i, qid in enumerate(picked)}
+    return sorted(questions, key=lambda q: order[q.question_id])
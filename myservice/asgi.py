@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+
+실행 예 (조회 API 를 async 뷰로):
+  ASYNC_READ_VIEWS=1 DB_CONN_MAX_AGE=0 uvicorn myservice.asgi:application --workers 4
+  ASYNC_READ_VIEWS=1 DB_POOL_SIZE=10 gunicorn myservice.asgi:application -k uvicorn.workers.UvicornWorker -w 4
 """
 
 import os
@@ -14,3 +18,25 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myservice.settings')
 
 application = get_asgi_application()
+
+# 워커 시작 시 채점용 정답 인덱스, 장르 레지스트리, 덱용 장르별 문제 인덱스 미리 적재
+# uvicorn 은 이벤트 루프 안에서 앱을 import 하므로 (sync DB 호출 불가) 별도 스레드에서 적재
+import threading  # noqa: E402
+
+from django.db import connections  # noqa: E402
+
+from myapp.answer_key import answer_key  # noqa: E402
+from myapp.genres import genre_registry  # noqa: E402
+from myapp.seen import genre_questions  # noqa: E402
+
+
+def warm_indexes():
+    answer_key.warm()
+    genre_registry.warm()
+    genre_questions.warm()
+    connections.close_all()
+
+
+warm_thread = threading.Thread(target=warm_indexes)
+warm_thread.start()
+warm_thread.join()
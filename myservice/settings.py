@@ -2,6 +2,8 @@ import os
 from pathlib import Path
 from datetime import timedelta
 
+import dj_database_url
+
 AUTH_USER_MODEL = "myapp.CustomUser"
 
 AUTHENTICATION_BACKENDS = [
@@ -45,20 +47,62 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'myapp.middleware.RequestTimingMiddleware',  # 요청별 SQL/직렬화/전체 시간 측정 (가장 바깥에 둘 것)
+    'myapp.profiling.ProfilingMiddleware',  # 스태프 전용 요청 프로파일링 (PROFILING_DIR 이 있을 때만 동작)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'myapp.routers.ReplicaPinningMiddleware',  # 쓰기 직후 사용자를 잠시 primary 에 고정 (복제본이 있을 때만 동작)
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
 ]
 
+# ASGI(uvicorn) 배포에서 조회 API(덱, 데일리 상식, 랜덤 해설, 랭킹, 최근 퀴즈 결과)를 async 뷰로 제공
+# 예: ASYNC_READ_VIEWS=1 gunicorn myservice.asgi:application -k uvicorn.workers.UvicornWorker
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', '') in ('1', 'true', 'True')
+
+# 백그라운드 작업 큐 (myapp/jobs.py) - 배포 시 manage.py run_jobs 워커를 함께 실행할 것
+#   예: python manage.py run_jobs  (웹 서버와 별도 프로세스, systemd/supervisor 등으로 상시 실행)
+#   기본값(JOB_QUEUE_EAGER 꺼짐)에서 워커가 없으면 제출 후 점수/랭킹/리더보드/문제 통계가 전혀 갱신되지 않는다
+# JOB_QUEUE_EAGER=1 이면 워커 없이 커밋 직후 바로 실행 (로컬 개발/테스트용)
+JOB_QUEUE_EAGER = os.getenv('JOB_QUEUE_EAGER', '') in ('1', 'true', 'True')
+JOB_LOCK_TIMEOUT = 300  # running 상태로 이 시간(초)이 지나면 워커가 죽은 것으로 보고 다시 실행
+JOB_RETRY_BASE_SECONDS = 10  # 재시도 대기 시간 (10초, 20초, 40초, ...)
+
+# 제출 API 멱등성 키 (myapp/idempotency.py, 오래된 키는 manage.py purge_idempotency_keys 로 정리)
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60  # 이 시간(초)이 지난 키는 새 요청으로 처리
+IDEMPOTENCY_WAIT_SECONDS = 5  # 같은 키가 처리 중일 때 기다리는 최대 시간 (초), 넘으면 409
+IDEMPOTENCY_LOCK_TIMEOUT = 60  # 처리 중 상태로 이 시간(초)이 지나면 방치된 것으로 보고 다시 처리
+
+# 요청 성능 예산 (넘으면 myapp.performance 로거에 경고)
+REQUEST_QUERY_BUDGET = int(os.getenv('REQUEST_QUERY_BUDGET', 50))
+REQUEST_TIME_BUDGET_MS = int(os.getenv('REQUEST_TIME_BUDGET_MS', 500))
+# 모든 응답에 Server-Timing 헤더 추가 (기본은 스태프 요청에만, loadtest --base-url 로 쿼리 수를 볼 때 켤 것)
+SERVER_TIMING_HEADER = os.getenv('SERVER_TIMING_HEADER', '') in ('1', 'true', 'True')
+
+# /metrics (Prometheus) - 워커가 여러 개면 METRICS_DIR 로 공유 디렉터리 지정
+METRICS_DIR = os.getenv('METRICS_DIR')
+METRICS_FLUSH_SECONDS = 5
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # 스크레이퍼가 보낼 Bearer 토큰 (없으면 /metrics 는 항상 403)
+
+# 스태프 요청 프로파일링 (manage.py profiling_token <email> 로 토큰 발급)
+PROFILING_DIR = os.getenv('PROFILING_DIR')  # 없으면 프로파일링 비활성화
+PROFILING_MODE = 'cprofile'  # cprofile(.prof) 또는 sample(.collapsed)
+PROFILING_SAMPLE_INTERVAL = 0.001  # 샘플링 간격 (초)
+PROFILING_TOKEN_MAX_AGE = 3600  # 토큰 유효 시간 (초)
+
 CORS_ALLOWED_ORIGINS = [
     "http://192.168.0.101:3000",  # 예시: 안드로이드 앱의 로컬 개발 서버 주소
 ]
 
+from corsheaders.defaults import default_headers  # noqa: E402
+
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')  # 제출 API 멱등성 키
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed', 'Retry-After']
+
 ROOT_URLCONF = 'myservice.urls'
 
 TEMPLATES = [
@@ -97,6 +141,54 @@ DATABASES = {
     }
 }
 
+# DATABASE_URL 환경변수가 있으면 해당 DB 사용 (로컬 SQLite/MySQL 에서 부하 테스트할 때 등)
+# 예: DATABASE_URL=sqlite:///loadtest.sqlite3, DATABASE_URL=mysql://user:pw@127.0.0.1:3306/UlmanaAla
+if os.getenv('DATABASE_URL'):
+    DATABASES['default'] = dj_database_url.parse(os.getenv('DATABASE_URL'))
+
+# 읽기 전용 복제본 (쉼표로 구분, replica_1, replica_2, ... 로 등록)
+# @replica_reads 가 붙은 읽기 뷰의 SELECT 만 복제본으로 가고 나머지는 모두 default 로 감 (myapp/routers.py)
+# 로컬 테스트 예: DATABASE_URL=sqlite:///primary.sqlite3 DATABASE_REPLICA_URLS=sqlite:///replica.sqlite3
+for index, url in enumerate(filter(None, os.getenv('DATABASE_REPLICA_URLS', '').split(',')), start=1):
+    DATABASES[f'replica_{index}'] = {
+        **dj_database_url.parse(url.strip()),
+        'TEST': {'MIRROR': 'default'},  # 테스트에서는 default 를 그대로 사용
+    }
+
+DATABASE_ROUTERS = ['myapp.routers.ReplicaRouter']
+
+# 쓰기 요청 후 해당 사용자를 primary 에 고정하는 시간 (초) - 복제 지연 허용치보다 길게
+REPLICA_LAG_TOLERANCE = int(os.getenv('REPLICA_LAG_TOLERANCE', 5))
+
+# DB 커넥션 관리
+# - DB_CONN_MAX_AGE: 요청이 끝나도 커넥션을 이 시간(초) 동안 유지해서 재사용 (0 이면 요청마다 새로 연결)
+# - CONN_HEALTH_CHECKS: 재사용 전에 커넥션 상태 확인 (RDS 재시작/장애 조치로 끊긴 커넥션을 다시 연결)
+# - DB_POOL_SIZE: 지정하면 MySQL 에 프로세스 내 커넥션 풀 사용 (스레드/ASGI 워커용, myapp/db_pool.py)
+#   ASGI 에서 풀 없이 CONN_MAX_AGE 를 쓰면 스레드마다 커넥션이 남으므로 DB_CONN_MAX_AGE=0 또는 풀 사용
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 60))
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 0))
+for database in DATABASES.values():
+    if DB_POOL_SIZE and database['ENGINE'] == 'django.db.backends.mysql':
+        database['ENGINE'] = 'myapp.db_backends.mysql_pool'
+        database['POOL'] = {
+            'size': DB_POOL_SIZE,
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+            'recycle': int(os.getenv('DB_POOL_RECYCLE', 3600)),
+        }
+        database['CONN_MAX_AGE'] = 0  # 요청이 끝나면 풀에 반납
+    else:
+        database['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+    database['CONN_HEALTH_CHECKS'] = True
+
+# 캐시 (gunicorn 워커 간 primary 고정 정보 등을 공유하려면 공유 캐시 지정)
+# 예: CACHE_BACKEND=django.core.cache.backends.redis.RedisCache CACHE_LOCATION=redis://127.0.0.1:6379/0
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
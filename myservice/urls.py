@@ -1,15 +1,35 @@
 from django.urls import path
 from django.conf import settings
 from django.conf.urls.static import static
-from myapp import views
+from myapp import async_views, views
 from myapp.views import (
     RegisterView, LoginView, FindIdView, ResetPasswordView, UserProfileView, UploadProfileImageView, ResetProfileImageView, UpdateNicknameView, UpdateInterestsView, get_quiz_results,
     get_random_explanations, get_daily_facts, Genre25QuestionView, Genre50QuestionView,
-    SpeedQuizView, QuizSubmitView, get_quiz_sessions, QuestionDetailView, WrongNoteSubmitView, RankingView, DailyRecommendationView
+    SpeedQuizView, QuizSubmitView, get_quiz_sessions, QuestionDetailView, WrongNoteSubmitView, RankingView, DailyRecommendationView,
+    WrongNoteListView, WrongNoteDeckView
 )
 
+# ASGI 배포에서는 조회 API 를 async 뷰로 교체 (같은 URL/이름/응답, myapp/async_views.py)
+if settings.ASYNC_READ_VIEWS:
+    genre_25_view = async_views.genre_25_questions
+    genre_50_view = async_views.genre_50_questions
+    speed_quiz_view = async_views.speed_quiz
+    daily_facts_view = async_views.daily_facts
+    random_explanations_view = async_views.random_explanations
+    quiz_sessions_view = async_views.quiz_sessions
+    ranking_view = async_views.ranking
+else:
+    genre_25_view = Genre25QuestionView.as_view()
+    genre_50_view = Genre50QuestionView.as_view()
+    speed_quiz_view = SpeedQuizView.as_view()
+    daily_facts_view = views.get_daily_facts
+    random_explanations_view = get_random_explanations
+    quiz_sessions_view = get_quiz_sessions
+    ranking_view = RankingView.as_view()
+
 urlpatterns = [
     path('', views.index),
+    path('metrics', views.metrics, name='metrics'), # Prometheus 메트릭
     path('register/', views.RegisterView.as_view(), name='register'), # 회원가입
     path('login/', views.LoginView.as_view(), name='login'), # 로그인
     path('find-id/', views.FindIdView.as_view(), name='findid'), # 아이디 찾기
@@ -20,16 +40,24 @@ urlpatterns = [
     path('profile/update-nickname/', UpdateNicknameView.as_view(), name='update-nickname'),# ✅ 닉네임 변경 URL 추가
     path("profile/update-interests/", UpdateInterestsView.as_view(), name="update-interests"), # ✅ 관심 분야 변경 URL 추가
     path('quiz-results/', get_quiz_results, name='quiz_result'), # 마이페이지 최근 퀴즈 내역
-    path('questions/random_explanations/', get_random_explanations, name='random_explanations'), # 랜덤 뽑기
-    path('daily-facts/', views.get_daily_facts, name='daily-facts'), # 데일리 상식
-    path('questions/genre/25/', Genre25QuestionView.as_view(), name='genre_25_questions'), # 25문제
-    path('questions/genre/50/', Genre50QuestionView.as_view(), name='genre_50_questions'), # 50문제
-    path('questions/speed/', SpeedQuizView.as_view(), name='speed_quiz'), # 스피드 퀴즈
+    path('questions/random_explanations/', random_explanations_view, name='random_explanations'), # 랜덤 뽑기
+    path('daily-facts/', daily_facts_view, name='daily-facts'), # 데일리 상식
+    path('genres/', views.GenreListView.as_view(), name='genre-list'), # 장르 목록 (문제 수 포함)
+    path('questions/genre/25/', genre_25_view, name='genre_25_questions'), # 25문제
+    path('questions/genre/50/', genre_50_view, name='genre_50_questions'), # 50문제
+    path('questions/speed/', speed_quiz_view, name='speed_quiz'), # 스피드 퀴즈
+    path('questions/adaptive/', views.AdaptiveQuestionView.as_view(), name='adaptive_questions'), # 적응형 덱 (레이팅 기반)
     path('quiz/submit/', QuizSubmitView.as_view(), name='quiz_submit'), # 퀴즈 제출(퀴즈 결과)
-    path('quiz/sessions/', get_quiz_sessions, name='quiz_session'), # 최근 퀴즈 결과
+    path('quiz/sessions/', quiz_sessions_view, name='quiz_session'), # 최근 퀴즈 결과
+    path('questions/search/', views.QuestionSearchView.as_view(), name='question-search'), # 문제/해설 검색
     path('questions/<int:question_id>/details/', QuestionDetailView.as_view(), name='question-detail'), # 문제 및 해설
     path("wrong-note-submit/", WrongNoteSubmitView.as_view(), name="wrong-note-submit"), # 오답노트 퀴즈 제출
-    path('quiz/ranking/', RankingView.as_view(), name='ranking'), # 랭킹
+    path('wrong-note/', WrongNoteListView.as_view(), name='wrong-note'), # 오답노트 현재 틀린 문제 목록
+    path('wrong-note/deck/', WrongNoteDeckView.as_view(), name='wrong-note-deck'), # 오답노트 문제 덱
+    path('wrong-note/due/', views.WrongNoteDueView.as_view(), name='wrong-note-due'), # 오늘 복습할 오답 덱 (SM-2)
+    path('quiz/ranking/', ranking_view, name='ranking'), # 랭킹
+    path('quiz/ranking/around-me/', views.RankingAroundMeView.as_view(), name='ranking-around-me'), # 내 주변 랭킹
+    path('quiz/leaderboard/', views.LeaderboardView.as_view(), name='leaderboard'), # 일간/주간/시즌 리더보드
     path('recommend/daily/', DailyRecommendationView.as_view(), name='daily-recommendation'), # 정답률에 따른 문제 추천
 ]
 
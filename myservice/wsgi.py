@@ -14,3 +14,16 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myservice.settings')
 
 application = get_wsgi_application()
+
+# 워커 시작 시 채점용 정답 인덱스, 장르 레지스트리, 덱용 장르별 문제 인덱스 미리 적재
+# 적재에 쓴 DB 연결은 바로 닫음 (gunicorn --preload 면 마스터에서 import 되어 fork 된 워커들이 같은 소켓을 나눠 쓰게 됨)
+from django.db import connections  # noqa: E402
+
+from myapp.answer_key import answer_key  # noqa: E402
+from myapp.genres import genre_registry  # noqa: E402
+from myapp.seen import genre_questions  # noqa: E402
+
+answer_key.warm()
+genre_registry.warm()
+genre_questions.warm()
+connections.close_all()